@@ -0,0 +1,45 @@
+"""Helpers shared by the benchmark scripts; importing it puts ``src`` on ``sys.path``."""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from typing import Callable, Dict, Sequence
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+def frame_shape(megapixels: float) -> tuple[int, int]:
+    pixels = max(1, int(megapixels * 1_000_000))
+    height = max(1, int((pixels * 3 / 4) ** 0.5))
+    return height, max(1, pixels // height)
+
+
+def timed(fn: Callable[[], object]) -> tuple[object, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000.0
+
+
+def average_ms(fn: Callable[[], object], repeats: int) -> float:
+    """Mean wall time of ``repeats`` calls after one warm-up call."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) * 1000.0 / repeats
+
+
+def run(benchmarks: Dict[str, Callable[[], None]], argv: Sequence[str] | None = None) -> int:
+    """Run the named ``benchmarks`` (all of them when none are named) and return an exit code."""
+    names = list(argv if argv is not None else sys.argv[1:]) or list(benchmarks)
+    unknown = [name for name in names if name not in benchmarks]
+    if unknown:
+        print(f"unknown benchmark(s): {', '.join(unknown)}; choose from {', '.join(benchmarks)}")
+        return 2
+    for name in names:
+        benchmarks[name]()
+    return 0
@@ -0,0 +1,144 @@
+"""Histogram engine benchmark for :func:`tempusloom.core.histogram.compute_histogram`.
+
+Run with ``python benchmarks/bench_histogram.py`` from the repository root.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+from PIL import Image
+
+from _support import average_ms, run
+from tempusloom.core.histogram import compute_histogram
+
+# Both normalize float32 square roots; they differ only in the last bits.
+HISTOGRAM_TOLERANCE = 1e-6
+
+
+def _reference_histogram(
+    image: Image.Image | np.ndarray,
+    *,
+    bins: int = 128,
+    sample_max_dimension: int = 512,
+) -> Dict[str, List[float]]:
+    """Three ``np.histogram`` calls with float edges, as ``TLImage.histogram_from_image`` did before :func:`compute_histogram`."""
+    safe_dimension = max(1, int(sample_max_dimension))
+    if isinstance(image, np.ndarray):
+        arr = image if image.ndim == 3 else image[:, :, None]
+        step = -(-max(arr.shape[:2]) // safe_dimension)
+        arr = arr[::step, ::step]
+        if arr.shape[2] < 3:
+            arr = np.repeat(arr[:, :, :1], 3, axis=2)
+    else:
+        working = image.convert("RGB")
+        width, height = working.size
+        longest_edge = max(width, height)
+        if longest_edge > safe_dimension:
+            scale = safe_dimension / float(longest_edge)
+            working = working.resize(
+                (max(1, int(round(width * scale))), max(1, int(round(height * scale)))),
+                Image.Resampling.BILINEAR,
+            )
+        arr = np.asarray(working, dtype=np.uint8)
+
+    histograms: Dict[str, List[float]] = {}
+    max_value = 0.0
+    bin_edges = np.linspace(0, 256, num=bins + 1, dtype=np.float32)
+    for index, channel_name in enumerate(("red", "green", "blue")):
+        counts, _ = np.histogram(arr[:, :, index], bins=bin_edges)
+        softened = np.sqrt(counts.astype(np.float32))
+        max_value = max(max_value, float(softened.max()) if softened.size else 0.0)
+        histograms[channel_name] = softened.tolist()
+
+    normalizer = max(max_value, 1.0)
+    return {
+        channel_name: [min(1.0, max(0.0, value / normalizer)) for value in values]
+        for channel_name, values in histograms.items()
+    }
+
+
+def benchmark_histogram(
+    dimensions: Sequence[int] = (384, 1000, 4000),
+    sample_max_dimension: int = 480,
+    bin_counts: Sequence[int] = (64, 128, 256),
+    repeats: int = 20,
+    seed: int = 0,
+) -> List[Dict[str, object]]:
+    """Time :func:`compute_histogram` against the ``np.histogram`` reference on RGBA frames.
+
+    Frames are timed both as the arrays the render worker histograms and as
+    the PIL images the histogram process does, sampled to
+    ``sample_max_dimension``. Parity is asserted on the full frame, where
+    neither side resamples: the RGB curves of ``to_dict()`` for each of
+    ``bin_counts``, and the luma percentiles and clipping against
+    ``np.percentile`` and direct counts.
+    """
+    rng = np.random.default_rng(seed)
+    results: List[Dict[str, object]] = []
+    for dimension in dimensions:
+        height = dimension * 3 // 4
+        # A gradient with noise, clipped at both ends, so every statistic has something to count.
+        ramp = np.linspace(-40.0, 300.0, dimension, dtype=np.float32)[None, :, None]
+        noise = rng.normal(0.0, 24.0, (height, dimension, 3)).astype(np.float32)
+        frame = np.full((height, dimension, 4), 255, dtype=np.uint8)
+        frame[..., :3] = np.clip(ramp + noise, 0, 255).astype(np.uint8)
+        image = Image.fromarray(frame, mode="RGBA")
+
+        error = 0.0
+        full = max(height, dimension)
+        for bins in bin_counts:
+            reference = _reference_histogram(frame, bins=bins, sample_max_dimension=full)
+            current = compute_histogram(frame, bins=bins, sample_max_dimension=full).to_dict()
+            assert current.keys() == reference.keys(), f"histogram channels {sorted(current)} at {dimension}px"
+            for channel, values in reference.items():
+                error = max(error, float(np.abs(np.asarray(values) - np.asarray(current[channel])).max()))
+        assert error <= HISTOGRAM_TOLERANCE, f"histogram diverges by {error:.1e} at {dimension}px"
+
+        stats = compute_histogram(frame, sample_max_dimension=full)
+        rgb = frame[..., :3].astype(np.uint32)
+        luma = (rgb[..., 0] * 77 + rgb[..., 1] * 150 + rgb[..., 2] * 29 + 128) >> 8
+        expected = np.percentile(luma, stats.percentile_ranks, method="inverted_cdf")
+        assert np.array_equal(stats.percentiles[3], expected), f"luma percentiles diverge at {dimension}px"
+        assert np.allclose(stats.highlight_clipping[:3], (frame[..., :3] == 255).mean(axis=(0, 1)) * 100.0)
+        assert np.allclose(stats.shadow_clipping[3], (luma == 0).mean() * 100.0)
+
+        results.append(
+            {
+                "dimension": dimension,
+                "reference_array_ms": average_ms(
+                    lambda: _reference_histogram(frame, sample_max_dimension=sample_max_dimension), repeats
+                ),
+                "array_ms": average_ms(
+                    lambda: compute_histogram(frame, sample_max_dimension=sample_max_dimension), repeats
+                ),
+                "reference_image_ms": average_ms(
+                    lambda: _reference_histogram(image, sample_max_dimension=sample_max_dimension), repeats
+                ),
+                "image_ms": average_ms(
+                    lambda: compute_histogram(image, sample_max_dimension=sample_max_dimension), repeats
+                ),
+                "error": error,
+            }
+        )
+    return results
+
+
+def _print_histogram(results: List[Dict[str, object]]) -> None:
+    for row in results:
+        print(
+            f"histogram {row['dimension']:>5}px  "
+            f"array {row['reference_array_ms']:6.2f} → {row['array_ms']:5.2f} ms  "
+            f"PIL {row['reference_image_ms']:6.2f} → {row['image_ms']:5.2f} ms (err {row['error']:.1e})"
+        )
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    "histogram": lambda: _print_histogram(benchmark_histogram()),
+}
+
+
+if __name__ == "__main__":
+    sys.exit(run(BENCHMARKS))
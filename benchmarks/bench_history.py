@@ -0,0 +1,147 @@
+"""Undo history benchmark for :class:`tempusloom.core.history.EditHistory`.
+
+Run with ``python benchmarks/bench_history.py`` from the repository root.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from copy import deepcopy
+from typing import Callable, Dict, List
+
+import numpy as np
+from PIL import Image
+
+from _support import run, timed
+from tempusloom.core.history import EditHistory
+from tempusloom.core.tl_image import TLImage
+
+
+class _ReferenceHistory:
+    """Full-snapshot undo stack as ``TLImage`` kept it before :class:`EditHistory`."""
+
+    def __init__(self) -> None:
+        self.snapshots: List[Dict[str, object]] = []
+        self.index = -1
+
+    def commit(self, snapshot: Dict[str, object]) -> bool:
+        if self.index >= 0 and self.snapshots[self.index] == snapshot:
+            return False
+        del self.snapshots[self.index + 1:]
+        self.snapshots.append(snapshot)
+        self.index = len(self.snapshots) - 1
+        return True
+
+    def undo(self) -> Dict[str, object]:
+        self.index -= 1
+        return self.snapshots[self.index]
+
+    def redo(self) -> Dict[str, object]:
+        self.index += 1
+        return self.snapshots[self.index]
+
+
+# Slider edits cycled by the history benchmark: (section, field, scale of the random value).
+HISTORY_EDITS = (
+    ("basic", "exposure", 2.0),
+    ("tone", "contrast", 100.0),
+    ("tone", "highlights", 100.0),
+    ("hsl", "saturation", 100.0),
+    ("whiteBalance", "temperature", 100.0),
+    ("detail", "sharpen_amount", 100.0),
+)
+
+
+def benchmark_history(commits: int = 1000, seed: int = 0) -> Dict[str, float]:
+    """Commit ``commits`` slider edits to :class:`EditHistory` and to full snapshots, then undo and redo all.
+
+    The ``to_dict()`` states are taken up front, so commit time is the store's
+    own cost: equality check plus, for the history, the diff; the time spent in
+    ``to_dict()``, which ``TLImage.commit_history`` pays on top of either
+    store, is reported separately. Memory is what
+    each store holds once every commit is in, measured in a separate
+    ``tracemalloc`` pass. Asserts both stores return the same state at every
+    undo and redo step.
+    """
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.png")
+        Image.new("RGB", (64, 48), (128, 128, 128)).save(path)
+        tl_image = TLImage.open(path)
+        states = []
+        to_dict_ms = 0.0
+        for index in range(commits):
+            section, name, scale = HISTORY_EDITS[index % len(HISTORY_EDITS)]
+            tl_image.update_adjustment(section, {name: round(float(rng.uniform(-scale, scale)), 3)})
+            state, elapsed = timed(tl_image.to_dict)
+            states.append(state)
+            to_dict_ms += elapsed
+
+    def commit_time(commit: Callable[[Dict[str, object]], bool]) -> float:
+        copies = deepcopy(states)
+        start = time.perf_counter()
+        for state in copies:
+            commit(state)
+        return (time.perf_counter() - start) * 1000.0
+
+    def retained_bytes(commit: Callable[[Dict[str, object]], bool]) -> int:
+        tracemalloc.start()
+        for state in states:
+            commit(deepcopy(state))
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return size
+
+    reference_commit_ms = commit_time(_ReferenceHistory().commit)
+    timed_history = EditHistory()
+    history_commit_ms = commit_time(lambda state: timed_history.commit(state, "edit"))
+    reference = _ReferenceHistory()
+    reference_bytes = retained_bytes(reference.commit)
+    history = EditHistory()
+    history_bytes = retained_bytes(lambda state: history.commit(state, "edit"))
+
+    steps = len(reference.snapshots) - 1
+    reference_walk_ms = 0.0
+    history_walk_ms = 0.0
+    for step in range(2 * steps):
+        reference_step = reference.undo if step < steps else reference.redo
+        history_step = history.undo if step < steps else history.redo
+        expected, elapsed = timed(reference_step)
+        reference_walk_ms += elapsed
+        _, elapsed = timed(history_step)
+        history_walk_ms += elapsed
+        assert history.state == expected, f"history diverges from the snapshots at undo/redo step {step}"
+    for index in range(0, len(history), max(1, len(history) // 10)):
+        assert history.state_at(index) == reference.snapshots[index], f"keyframe rebuild diverges at entry {index}"
+    return {
+        "commits": float(len(history)),
+        "to_dict_ms": to_dict_ms,
+        "reference_commit_ms": reference_commit_ms,
+        "commit_ms": history_commit_ms,
+        "reference_bytes": float(reference_bytes),
+        "history_bytes": float(history_bytes),
+        "reference_walk_ms": reference_walk_ms,
+        "walk_ms": history_walk_ms,
+    }
+
+
+def _print_history(row: Dict[str, float]) -> None:
+    print(
+        f"history {row['commits']:.0f} commits  "
+        f"commit {row['reference_commit_ms']:7.1f} → {row['commit_ms']:7.1f} ms (to_dict {row['to_dict_ms']:.0f} ms)  "
+        f"memory {row['reference_bytes'] / 1e6:6.2f} → {row['history_bytes'] / 1e6:6.2f} MB  "
+        f"undo+redo all {row['reference_walk_ms']:7.1f} → {row['walk_ms']:7.1f} ms"
+    )
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    "history": lambda: _print_history(benchmark_history()),
+}
+
+
+if __name__ == "__main__":
+    sys.exit(run(BENCHMARKS))
@@ -0,0 +1,80 @@
+"""Preview hand-off benchmark for :mod:`tempusloom.ui.image_bridge`.
+
+Run with ``python benchmarks/bench_image_bridge.py`` from the repository root.
+Needs PyQt6; runs offscreen when no display platform is set.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+from PIL import Image
+
+from _support import average_ms, run
+
+QIMAGE_TOLERANCE = 0
+
+
+def benchmark_qimage_conversion(
+    dimensions: Sequence[int] = (1024, 2048),
+    repeats: int = 20,
+    seed: int = 0,
+) -> List[Dict[str, object]]:
+    """Time the preview hand-off to Qt: ``ImageQt`` + ``QPixmap.fromImage`` against the RGBA8888 wrap.
+
+    The array is taken from the rendered image on the render thread, so it is
+    timed separately from the GUI-thread upload. Asserts both pixmaps hold the
+    same pixels.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PIL.ImageQt import ImageQt
+    from PyQt6.QtGui import QGuiApplication, QImage, QPixmap
+
+    from tempusloom.ui.image_bridge import rgba8_array, rgba_pixmap
+
+    app = QGuiApplication.instance() or QGuiApplication([])
+
+    def pixels(pixmap: QPixmap) -> np.ndarray:
+        image = pixmap.toImage().convertToFormat(QImage.Format.Format_RGBA8888)
+        return np.frombuffer(image.constBits().asstring(image.sizeInBytes()), dtype=np.uint8).copy()
+
+    rng = np.random.default_rng(seed)
+    results: List[Dict[str, object]] = []
+    for dimension in dimensions:
+        pixels_rgba = rng.integers(0, 256, (dimension * 3 // 4, dimension, 4), dtype=np.uint8)
+        pixels_rgba[..., 3] = 255
+        image = Image.fromarray(pixels_rgba, mode="RGBA")
+        frame = rgba8_array(image)
+        error = int(np.abs(pixels(QPixmap.fromImage(ImageQt(image))).astype(np.int16) - pixels(rgba_pixmap(frame))).max())
+        assert error <= QIMAGE_TOLERANCE, f"RGBA8888 upload diverges by {error} at {dimension}px"
+        results.append(
+            {
+                "dimension": dimension,
+                "reference_ms": average_ms(lambda: QPixmap.fromImage(ImageQt(image)), repeats),
+                "array_ms": average_ms(lambda: rgba8_array(image), repeats),
+                "upload_ms": average_ms(lambda: rgba_pixmap(frame), repeats),
+                "error": error,
+            }
+        )
+    return results
+
+
+def _print_qimage(results: List[Dict[str, object]]) -> None:
+    for row in results:
+        print(
+            f"qimage {row['dimension']:>5}px  ImageQt+fromImage {row['reference_ms']:7.2f} ms (GUI) → "
+            f"array {row['array_ms']:6.2f} ms (render thread) + upload {row['upload_ms']:6.2f} ms (GUI) "
+            f"(err {row['error']})"
+        )
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    "qimage": lambda: _print_qimage(benchmark_qimage_conversion()),
+}
+
+
+if __name__ == "__main__":
+    sys.exit(run(BENCHMARKS))
@@ -0,0 +1,263 @@
+"""RGB↔HLS kernel and layer compositing benchmarks.
+
+Run with ``python benchmarks/bench_kernels.py [hls|composite ...]`` from the
+repository root. Each benchmark times the current kernel against a reference
+implementation on the same input and raises :class:`AssertionError` when the
+results diverge.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from PIL import Image
+
+from _support import frame_shape, run, timed
+from tempusloom.core.malayer import (
+    BlendMode,
+    Mask,
+    _blend_rgb,
+    _clamp,
+    _float_array_to_pil,
+    _hls_to_rgb_array,
+    _pil_to_float_array,
+    _rgb_to_hls_array,
+    composite_images,
+)
+
+HLS_TOLERANCE = 1e-5
+# The float reference truncates to uint8 where the integer paths round.
+COMPOSITE_TOLERANCE = 1
+
+
+def _reference_rgb_to_hls(array: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Mask-per-sector RGB→HLS conversion the pipeline used before the branch-free kernels."""
+    rgb = np.clip(array[:, :, :3], 0.0, 1.0)
+    red = rgb[:, :, 0]
+    green = rgb[:, :, 1]
+    blue = rgb[:, :, 2]
+
+    maximum = np.max(rgb, axis=2)
+    minimum = np.min(rgb, axis=2)
+    delta = maximum - minimum
+
+    lightness = (maximum + minimum) / 2.0
+    saturation = np.zeros_like(lightness)
+    hue = np.zeros_like(lightness)
+
+    chroma_mask = delta > 1e-6
+    if np.any(chroma_mask):
+        denominator = 1.0 - np.abs(2.0 * lightness - 1.0)
+        saturation[chroma_mask] = delta[chroma_mask] / np.maximum(denominator[chroma_mask], 1e-6)
+
+        red_mask = chroma_mask & (maximum == red)
+        green_mask = chroma_mask & (maximum == green)
+        blue_mask = chroma_mask & (maximum == blue)
+
+        hue[red_mask] = np.mod((green[red_mask] - blue[red_mask]) / np.maximum(delta[red_mask], 1e-6), 6.0)
+        hue[green_mask] = ((blue[green_mask] - red[green_mask]) / np.maximum(delta[green_mask], 1e-6)) + 2.0
+        hue[blue_mask] = ((red[blue_mask] - green[blue_mask]) / np.maximum(delta[blue_mask], 1e-6)) + 4.0
+        hue = np.mod(hue / 6.0, 1.0)
+
+    return hue.astype(np.float32), lightness.astype(np.float32), saturation.astype(np.float32)
+
+
+def _reference_hls_to_rgb(hue: np.ndarray, lightness: np.ndarray, saturation: np.ndarray) -> np.ndarray:
+    """Mask-per-sector HLS→RGB conversion the pipeline used before the branch-free kernels."""
+    hue = np.mod(hue, 1.0).astype(np.float32)
+    lightness = np.clip(lightness, 0.0, 1.0).astype(np.float32)
+    saturation = np.clip(saturation, 0.0, 1.0).astype(np.float32)
+
+    chroma = (1.0 - np.abs(2.0 * lightness - 1.0)) * saturation
+    hue_sector = hue * 6.0
+    secondary = chroma * (1.0 - np.abs(np.mod(hue_sector, 2.0) - 1.0))
+
+    red = np.zeros_like(hue, dtype=np.float32)
+    green = np.zeros_like(hue, dtype=np.float32)
+    blue = np.zeros_like(hue, dtype=np.float32)
+
+    masks = [
+        (hue_sector >= 0.0) & (hue_sector < 1.0),
+        (hue_sector >= 1.0) & (hue_sector < 2.0),
+        (hue_sector >= 2.0) & (hue_sector < 3.0),
+        (hue_sector >= 3.0) & (hue_sector < 4.0),
+        (hue_sector >= 4.0) & (hue_sector < 5.0),
+        (hue_sector >= 5.0) & (hue_sector <= 6.0),
+    ]
+
+    red[masks[0]] = chroma[masks[0]]
+    green[masks[0]] = secondary[masks[0]]
+
+    red[masks[1]] = secondary[masks[1]]
+    green[masks[1]] = chroma[masks[1]]
+
+    green[masks[2]] = chroma[masks[2]]
+    blue[masks[2]] = secondary[masks[2]]
+
+    green[masks[3]] = secondary[masks[3]]
+    blue[masks[3]] = chroma[masks[3]]
+
+    red[masks[4]] = secondary[masks[4]]
+    blue[masks[4]] = chroma[masks[4]]
+
+    red[masks[5]] = chroma[masks[5]]
+    blue[masks[5]] = secondary[masks[5]]
+
+    match = lightness - chroma / 2.0
+    rgb = np.stack((red + match, green + match, blue + match), axis=2)
+    return np.clip(rgb, 0.0, 1.0).astype(np.float32)
+
+
+def _reference_composite(base: Image.Image, layer: Image.Image, mode: BlendMode, opacity: float, mask: Optional[Mask]) -> Image.Image:
+    """Float-only compositing as ``composite_images`` did it before its fast paths."""
+    base_rgba = base.convert("RGBA")
+    layer_rgba = layer.convert("RGBA").resize(base_rgba.size, Image.Resampling.LANCZOS)
+    base_arr = _pil_to_float_array(base_rgba)
+    layer_arr = _pil_to_float_array(layer_rgba)
+    base_rgb = base_arr[..., :3]
+    layer_rgb = layer_arr[..., :3]
+    blended_rgb = _blend_rgb(base_rgb, layer_rgb, mode)
+
+    alpha = np.full((base_rgba.size[1], base_rgba.size[0], 1), _clamp(opacity, 0.0, 1.0), dtype=np.float32)
+    if mask is not None:
+        alpha *= np.asarray(mask.to_pil(base_rgba.size), dtype=np.float32)[..., None] / 255.0
+
+    out_rgb = base_rgb * (1.0 - alpha) + blended_rgb * alpha
+    out_alpha = np.maximum(base_arr[..., 3:], layer_arr[..., 3:])
+    return _float_array_to_pil(np.concatenate([out_rgb, out_alpha], axis=-1))
+
+
+def _random_rgb(megapixels: float, rng: np.random.Generator) -> np.ndarray:
+    """Random float32 RGB with gray rows and two-way ties, the cases the hue selects care about."""
+    height, width = frame_shape(megapixels)
+    rgb = rng.random((height, width, 3), dtype=np.float32)
+    rgb[::7] = rgb[::7, :, :1]
+    rgb[1::11, :, 1] = rgb[1::11, :, 0]
+    rgb[2::13, :, 2] = rgb[2::13, :, 1]
+    return rgb
+
+
+def benchmark_hls_kernels(
+    megapixels: Sequence[float] = (1, 12, 24),
+    seed: int = 0,
+) -> List[Dict[str, float]]:
+    """Time the RGB↔HLS kernels against the reference conversions and assert parity.
+
+    The new kernels write into preallocated buffers, as the HLS block does.
+    Hue is compared on the circle, so ``0.0`` and ``1.0 - ε`` count as equal.
+    """
+    rng = np.random.default_rng(seed)
+    results: List[Dict[str, float]] = []
+    for size in megapixels:
+        rgb = _random_rgb(size, rng)
+        hls_out = np.empty_like(rgb)
+        rgb_out = np.empty_like(rgb)
+
+        reference_hls, reference_forward_ms = timed(lambda: _reference_rgb_to_hls(rgb))
+        hls, forward_ms = timed(lambda: _rgb_to_hls_array(rgb, out=hls_out))
+        hue_error = np.abs(np.mod(hls[0] - reference_hls[0] + 0.5, 1.0) - 0.5)
+        forward_error = max(
+            float(hue_error.max()),
+            float(np.abs(hls[1] - reference_hls[1]).max()),
+            float(np.abs(hls[2] - reference_hls[2]).max()),
+        )
+        del reference_hls, hue_error
+
+        reference_rgb, reference_inverse_ms = timed(lambda: _reference_hls_to_rgb(*hls))
+        restored, inverse_ms = timed(lambda: _hls_to_rgb_array(*hls, out=rgb_out))
+        inverse_error = float(np.abs(restored - reference_rgb).max())
+        del reference_rgb
+
+        assert forward_error <= HLS_TOLERANCE, f"RGB→HLS diverges by {forward_error:g} at {size} MP"
+        assert inverse_error <= HLS_TOLERANCE, f"HLS→RGB diverges by {inverse_error:g} at {size} MP"
+        results.append(
+            {
+                "megapixels": float(size),
+                "reference_forward_ms": reference_forward_ms,
+                "forward_ms": forward_ms,
+                "forward_error": forward_error,
+                "reference_inverse_ms": reference_inverse_ms,
+                "inverse_ms": inverse_ms,
+                "inverse_error": inverse_error,
+            }
+        )
+    return results
+
+
+COMPOSITE_CASES: tuple[tuple[str, BlendMode, float, bool], ...] = (
+    ("normal opaque", BlendMode.NORMAL, 1.0, True),
+    ("normal translucent layer", BlendMode.NORMAL, 1.0, False),
+    ("normal 50%", BlendMode.NORMAL, 0.5, True),
+    ("multiply", BlendMode.MULTIPLY, 1.0, True),
+    ("screen 75%", BlendMode.SCREEN, 0.75, True),
+    ("overlay", BlendMode.OVERLAY, 1.0, True),
+)
+
+
+def benchmark_composite(
+    megapixels: Sequence[float] = (1, 12, 24),
+    seed: int = 0,
+) -> List[Dict[str, object]]:
+    """Time ``composite_images`` against the float reference for common layer setups.
+
+    Asserts that both agree within ``COMPOSITE_TOLERANCE`` per channel.
+    """
+    rng = np.random.default_rng(seed)
+    results: List[Dict[str, object]] = []
+    for size in megapixels:
+        height, width = frame_shape(size)
+        base = Image.fromarray(rng.integers(0, 256, (height, width, 4), dtype=np.uint8), mode="RGBA")
+        layer_pixels = rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+        translucent = Image.fromarray(layer_pixels, mode="RGBA")
+        layer_pixels[..., 3] = 255
+        opaque = Image.fromarray(layer_pixels, mode="RGBA")
+        del layer_pixels
+
+        for name, mode, opacity, is_opaque in COMPOSITE_CASES:
+            layer = opaque if is_opaque else translucent
+            reference, reference_ms = timed(lambda: _reference_composite(base, layer, mode, opacity, None))
+            result, composite_ms = timed(lambda: composite_images(base, layer, mode, opacity, None))
+            error = int(np.abs(np.asarray(result, dtype=np.int16) - np.asarray(reference, dtype=np.int16)).max())
+            del reference, result
+            assert error <= COMPOSITE_TOLERANCE, f"composite '{name}' diverges by {error} at {size} MP"
+            results.append(
+                {
+                    "megapixels": float(size),
+                    "case": name,
+                    "reference_ms": reference_ms,
+                    "composite_ms": composite_ms,
+                    "error": error,
+                }
+            )
+    return results
+
+
+def _print_hls(results: List[Dict[str, float]]) -> None:
+    for row in results:
+        print(
+            f"hls {row['megapixels']:>5.0f} MP  "
+            f"rgb→hls {row['reference_forward_ms']:8.1f} → {row['forward_ms']:7.1f} ms "
+            f"(err {row['forward_error']:.1e})  "
+            f"hls→rgb {row['reference_inverse_ms']:8.1f} → {row['inverse_ms']:7.1f} ms "
+            f"(err {row['inverse_error']:.1e})"
+        )
+
+
+def _print_composite(results: List[Dict[str, object]]) -> None:
+    for row in results:
+        print(
+            f"composite {row['megapixels']:>5.0f} MP  {row['case']:<24} "
+            f"{row['reference_ms']:8.1f} → {row['composite_ms']:7.1f} ms (err {row['error']})"
+        )
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    "hls": lambda: _print_hls(benchmark_hls_kernels()),
+    "composite": lambda: _print_composite(benchmark_composite()),
+}
+
+
+if __name__ == "__main__":
+    sys.exit(run(BENCHMARKS))
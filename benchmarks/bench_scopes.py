@@ -0,0 +1,87 @@
+"""Scopes benchmark for :func:`tempusloom.core.scopes.compute_scopes`.
+
+Run with ``python benchmarks/bench_scopes.py`` from the repository root.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from _support import average_ms, run
+from tempusloom.core.scopes import SCOPE_KINDS, compute_scopes
+
+
+def _reference_scope(rgb: np.ndarray, kind: str, columns: int, levels: int) -> np.ndarray:
+    """One scope as ``np.histogram2d`` over float coordinates, oriented like :func:`compute_scopes`."""
+    values = rgb.astype(np.float64)
+    x = np.broadcast_to(np.arange(rgb.shape[1], dtype=np.float64)[None, :], rgb.shape[:2])
+    x_edges = np.linspace(0, rgb.shape[1], columns + 1)
+    level_edges = np.linspace(0, 256, levels + 1)
+
+    def plot(level: np.ndarray, column: np.ndarray, edges: np.ndarray) -> np.ndarray:
+        counts, _, _ = np.histogram2d(level.ravel(), column.ravel(), bins=(level_edges, edges))
+        return counts[::-1].astype(np.uint16)
+
+    if kind == "waveform":
+        luma = np.floor(values @ np.array([77.0, 150.0, 29.0]) / 256.0 + 0.5)
+        return plot(luma, x, x_edges)
+    if kind == "parade":
+        return np.concatenate([plot(values[..., channel], x, x_edges) for channel in range(3)], axis=1)
+    cb = np.floor((values @ np.array([-43.0, -85.0, 128.0]) + 32895.0) / 256.0)
+    cr = np.floor((values @ np.array([128.0, -107.0, -21.0]) + 32895.0) / 256.0)
+    return plot(cr, cb, level_edges)
+
+
+def benchmark_scopes(
+    dimension: int = 480,
+    columns: int = 128,
+    levels: int = 128,
+    repeats: int = 20,
+    seed: int = 0,
+) -> List[Dict[str, object]]:
+    """Time each scope of :func:`compute_scopes` on a ``dimension`` proxy against ``np.histogram2d`` and assert they match."""
+    rng = np.random.default_rng(seed)
+    height = dimension * 3 // 4
+    ramp = np.linspace(0.0, 255.0, dimension, dtype=np.float32)[None, :, None]
+    frame = np.full((height, dimension, 4), 255, dtype=np.uint8)
+    frame[..., :3] = np.clip(ramp + rng.normal(0.0, 32.0, (height, dimension, 3)), 0, 255).astype(np.uint8)
+
+    results: List[Dict[str, object]] = []
+    for kind in SCOPE_KINDS:
+        scope = compute_scopes(frame, (kind,), sample_max_dimension=dimension, columns=columns, levels=levels)[kind]
+        reference = _reference_scope(frame[..., :3], kind, columns, levels)
+        assert np.array_equal(scope, reference), f"{kind} diverges from np.histogram2d"
+        results.append(
+            {
+                "kind": kind,
+                "dimension": dimension,
+                "shape": scope.shape,
+                "reference_ms": average_ms(lambda: _reference_scope(frame[..., :3], kind, columns, levels), repeats),
+                "scope_ms": average_ms(
+                    lambda: compute_scopes(frame, (kind,), sample_max_dimension=dimension, columns=columns, levels=levels),
+                    repeats,
+                ),
+            }
+        )
+    return results
+
+
+def _print_scopes(results: List[Dict[str, object]]) -> None:
+    for row in results:
+        height, width = row["shape"]
+        print(
+            f"scopes {row['dimension']:>5}px  {row['kind']:<12} {width:>3}x{height:<3} "
+            f"histogram2d {row['reference_ms']:7.2f} → bincount {row['scope_ms']:5.2f} ms"
+        )
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    "scopes": lambda: _print_scopes(benchmark_scopes()),
+}
+
+
+if __name__ == "__main__":
+    sys.exit(run(BENCHMARKS))
@@ -0,0 +1,32 @@
+"""Render-pipeline benchmarks.
+
+Run with ``python benchmarks/run.py [name ...]`` from the repository root; with
+no names every benchmark runs. Each one times the current code against a
+reference implementation on the same input and raises :class:`AssertionError`
+when the results diverge. The scripts import ``tempusloom`` from ``src`` and
+are not part of the installed package.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Callable, Dict
+
+from _support import run
+import bench_histogram
+import bench_history
+import bench_image_bridge
+import bench_kernels
+import bench_scopes
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    **bench_kernels.BENCHMARKS,
+    **bench_image_bridge.BENCHMARKS,
+    **bench_history.BENCHMARKS,
+    **bench_histogram.BENCHMARKS,
+    **bench_scopes.BENCHMARKS,
+}
+
+
+if __name__ == "__main__":
+    sys.exit(run(BENCHMARKS))
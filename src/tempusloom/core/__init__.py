@@ -1,5 +1,8 @@
 """TempusLoom core data models and rendering pipeline."""
 
+from .fingerprint import fingerprint
+from .histogram import HistogramStats, compute_histogram
+from .history import EditHistory
 from .malayer import (
     AdjustmentMalayer,
     AdjustmentParams,
@@ -19,10 +22,19 @@ from .malayer import (
     HSLParams,
     Malayer,
     Mask,
+    RenderBuffer,
+    RenderCancelled,
+    RenderRegion,
+    TileBox,
     ToneParams,
     WhiteBalanceParams,
     filter_malayers_by_tab,
+    render_cancellation,
 )
+from .pixel_store import SharedImageHandle, SharedPixelStore, SharedPixelView
+from .render_cache import RenderCache
+from .scopes import SCOPE_KINDS, compute_scopes
+from .tiled_render import TiledRenderer, render_tiled_image, render_tiled_to_path
 from .tl_image import TLImage
 
 __all__ = [
@@ -36,16 +48,34 @@ __all__ = [
     "CurveParams",
     "CurvePoint",
     "DetailParams",
+    "EditHistory",
     "FilterMalayer",
     "MaskMalayer",
     "GeometryParams",
     "HSLColorParams",
     "BasicAdjustParams",
     "HSLParams",
+    "HistogramStats",
     "Malayer",
     "Mask",
+    "RenderBuffer",
+    "RenderCache",
+    "RenderCancelled",
+    "RenderRegion",
+    "SCOPE_KINDS",
+    "SharedImageHandle",
+    "SharedPixelStore",
+    "SharedPixelView",
     "TLImage",
+    "TileBox",
+    "TiledRenderer",
     "ToneParams",
     "WhiteBalanceParams",
+    "compute_histogram",
+    "compute_scopes",
     "filter_malayers_by_tab",
+    "fingerprint",
+    "render_cancellation",
+    "render_tiled_image",
+    "render_tiled_to_path",
 ]
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from dataclasses import asdict, is_dataclass
+import hashlib
+from typing import Any
+
+
+def fingerprint(*values: Any) -> str:
+    """Stable digest of params dataclasses (or plain values) for use as a cache key.
+
+    Values are digested through their ``repr``, so two values with the same
+    digest have the same contents; dataclasses are expanded with ``asdict``
+    first, which makes their digest independent of object identity.
+    """
+    payload = [asdict(value) if is_dataclass(value) else value for value in values]
+    return hashlib.blake2b(repr(payload).encode("utf-8"), digest_size=16).hexdigest()
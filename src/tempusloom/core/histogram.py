@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+HISTOGRAM_CHANNELS = ("red", "green", "blue", "luma")
+DEFAULT_PERCENTILES = (1.0, 5.0, 50.0, 95.0, 99.0)
+# Rec. 601 luma weights in 1/256ths, summing to 256.
+LUMA_WEIGHTS = (77, 150, 29)
+# Offsets that put the four channels in disjoint ranges of a single bincount.
+_CHANNEL_OFFSETS = np.array([0, 256, 512, 768], dtype=np.uint16)
+
+
+@dataclass
+class HistogramStats:
+    """Histograms of the red, green, blue and luma channels of one image, with clipping and percentiles.
+
+    Every array has one row per entry of :data:`HISTOGRAM_CHANNELS`. Clipping
+    is the percentage of samples at 0 (shadows) and 255 (highlights);
+    percentiles are 8-bit levels, one column per entry of ``percentile_ranks``.
+    :meth:`to_dict` is the JSON-serializable RGB curves that
+    :meth:`TLImage.histogram_from_image` has always returned; the luma curve
+    and the statistics are only available here, as arrays.
+    """
+
+    counts: np.ndarray
+    levels: np.ndarray
+    samples: int
+    shadow_clipping: np.ndarray
+    highlight_clipping: np.ndarray
+    percentiles: np.ndarray
+    percentile_ranks: Tuple[float, ...]
+
+    def display_curves(self) -> np.ndarray:
+        """Square-root-softened ``counts`` scaled so the tallest RGB bin is ``1.0``, as the histogram widget draws them."""
+        softened = np.sqrt(self.counts.astype(np.float32))
+        peak = max(float(softened[:3].max()), 1.0) if softened.size else 1.0
+        return np.minimum(softened / peak, 1.0)
+
+    def to_dict(self) -> Dict[str, List[float]]:
+        """The red, green and blue :meth:`display_curves` as lists of floats, keyed by channel name."""
+        curves = self.display_curves()
+        return {channel: curves[index].tolist() for index, channel in enumerate(HISTOGRAM_CHANNELS[:3])}
+
+
+def sample_rgb(image: Image.Image | np.ndarray, sample_max_dimension: int) -> np.ndarray:
+    """``HxWx3`` uint8 view of ``image`` strided down to at most ``sample_max_dimension`` on its long edge.
+
+    The sampling shared by :func:`compute_histogram` and
+    :func:`~tempusloom.core.scopes.compute_scopes`.
+    """
+    if isinstance(image, Image.Image):
+        step = -(-max(image.size) // max(1, int(sample_max_dimension)))
+        if step > 1:
+            # Nearest-neighbour sampling picks one pixel per step x step block without copying the rest.
+            image = image.resize((-(-image.width // step), -(-image.height // step)), Image.Resampling.NEAREST)
+        if image.mode not in {"RGB", "RGBA"}:
+            image = image.convert("RGB")
+        image = np.asarray(image)
+    array = image if image.ndim == 3 else image[:, :, None]
+    step = -(-max(array.shape[:2]) // max(1, int(sample_max_dimension)))
+    array = array[::step, ::step]
+    if array.shape[2] < 3:
+        return np.repeat(array[:, :, :1], 3, axis=2)
+    return array[:, :, :3]
+
+
+def compute_histogram(
+    image: Image.Image | np.ndarray,
+    *,
+    bins: int = 128,
+    sample_max_dimension: int = 512,
+    percentile_ranks: Sequence[float] = DEFAULT_PERCENTILES,
+) -> HistogramStats:
+    """Histogram ``image`` with one ``np.bincount`` over a strided subsample.
+
+    ``image`` is a PIL image or an 8-bit ``HxW``, ``HxWx3`` or ``HxWx4`` array;
+    arrays are strided down to ``sample_max_dimension`` without a copy and
+    PIL images are sampled to the same size with a nearest-neighbour resize.
+    Bin ``i`` of ``bins`` (at most 256) holds the 8-bit values ``v`` with
+    ``v * bins // 256 == i``, the same split as ``np.histogram`` over
+    ``linspace(0, 256, bins + 1)``.
+    """
+    rgb = sample_rgb(image, sample_max_dimension)
+    samples = rgb.shape[0] * rgb.shape[1]
+    channels = np.empty((samples, 4), dtype=np.uint16)
+    channels[:, :3] = rgb.reshape(samples, 3)
+    red, green, blue = (channels[:, index] for index in range(3))
+    channels[:, 3] = (red * LUMA_WEIGHTS[0] + green * LUMA_WEIGHTS[1] + blue * LUMA_WEIGHTS[2] + 128) >> 8
+    channels += _CHANNEL_OFFSETS
+    levels = np.bincount(channels.ravel(), minlength=1024).reshape(4, 256)
+
+    bins = min(max(1, int(bins)), 256)
+    if bins == 256:
+        counts = levels.copy()
+    else:
+        starts = -(-np.arange(bins) * 256 // bins)
+        counts = np.add.reduceat(levels, starts, axis=1)
+
+    total = max(samples, 1)
+    ranks = tuple(float(rank) for rank in percentile_ranks)
+    cumulative = np.cumsum(levels, axis=1)
+    targets = np.asarray(ranks, dtype=np.float64) / 100.0 * samples
+    percentiles = (cumulative[:, :, None] < targets[None, None, :]).sum(axis=1).clip(0, 255).astype(np.uint8)
+    return HistogramStats(
+        counts=counts,
+        levels=levels,
+        samples=samples,
+        shadow_clipping=levels[:, 0] * (100.0 / total),
+        highlight_clipping=levels[:, 255] * (100.0 / total),
+        percentiles=percentiles,
+        percentile_ranks=ranks,
+    )
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from copy import deepcopy
 from queue import Empty
+from typing import Any, Dict, List, Optional
 
+from .history import Change, apply_changes
+from .pixel_store import SharedImageHandle, SharedPixelView
+from .scopes import compute_scopes
 from .tl_image import TLImage
 
 
@@ -12,42 +17,103 @@ def histogram_worker_main(
     render_dimension: int = 480,
     histogram_dimension: int = 480,
 ) -> None:
+    """Serve histograms for one resident image, kept up to date by edit-state deltas.
+
+    Requests are dicts:
+
+    - ``{"type": "open", "job_id", "snapshot", "pixels"}`` replaces the
+      resident image with ``TLImage.from_dict(snapshot)``; its source and
+      render caches then live as long as the image stays open. ``pixels`` is
+      an optional :class:`SharedImageHandle`: the source is read from that
+      shared memory instead of being decoded again.
+    - ``{"type": "update", "job_id", "changes"}`` carries the
+      :func:`~tempusloom.core.history.diff_states` changes from the state
+      of the previous request to the current one.
+    - ``{"type": "stop"}`` (or ``None``) ends the worker.
+
+    Either request may also name ``"scopes"``, a sequence of
+    :data:`~tempusloom.core.scopes.SCOPE_KINDS` to compute from the same
+    render.
+
+    Every queued request is applied, but only the newest one is rendered.
+    Results are ``{"job_id", "histogram", "scopes", "metadata"}``, where
+    ``scopes`` maps each requested kind to its uint16 density image, or
+    ``{"job_id", "error"}``; after an error the resident image is dropped,
+    so the sender has to open it again.
+    """
+    tl_image: Optional[TLImage] = None
+    state: Optional[Dict[str, Any]] = None
+    pixels: Optional[SharedPixelView] = None
     while True:
         task = request_queue.get()
-        if task is None or task.get("type") == "stop":
-            return
-
-        latest_task = task
+        pending = [task]
         while True:
             try:
-                candidate = request_queue.get_nowait()
+                pending.append(request_queue.get_nowait())
             except Empty:
                 break
-            if candidate is None or candidate.get("type") == "stop":
-                return
-            latest_task = candidate
-
-        job_id = int(latest_task.get("job_id", 0))
-        snapshot = latest_task.get("snapshot")
+        if any(item is None or item.get("type") == "stop" for item in pending):
+            tl_image = None
+            if pixels is not None:
+                pixels.close()
+            return
 
+        job_id = int(pending[-1].get("job_id", 0))
         try:
-            tl_image = TLImage.from_dict(snapshot)
+            changes: List[Change] = []
+            for item in pending:
+                if item.get("type") == "open":
+                    # The old image holds views into the old blocks; let it go before detaching them.
+                    tl_image = None
+                    pixels = _attach_pixels(pixels, item.get("pixels"))
+                    state = item["snapshot"]
+                    tl_image = TLImage.from_dict(deepcopy(state))
+                    if pixels is not None:
+                        tl_image.use_source_levels([pixels.image])
+                    changes = []
+                elif state is None:
+                    raise RuntimeError("Histogram worker received an update before any image was opened")
+                else:
+                    state = apply_changes(state, item["changes"])
+                    changes.extend(item["changes"])
+            if changes:
+                tl_image.apply_state_changes(state, changes)
+
             rendered = tl_image.render_image(preview=True, max_dimension=render_dimension)
             histogram = TLImage.histogram_from_image(
                 rendered,
                 sample_max_dimension=histogram_dimension,
             )
+            scope_kinds = pending[-1].get("scopes") or ()
+            scopes = compute_scopes(rendered, scope_kinds, sample_max_dimension=histogram_dimension) if scope_kinds else {}
             result_queue.put(
                 {
                     "job_id": job_id,
                     "histogram": histogram,
+                    "scopes": scopes,
                     "metadata": dict(tl_image.metadata),
                 }
             )
         except Exception as exc:
+            tl_image = None
+            state = None
             result_queue.put(
                 {
                     "job_id": job_id,
                     "error": str(exc),
                 }
             )
+
+
+def _attach_pixels(current: Optional[SharedPixelView], handle: Optional[SharedImageHandle]) -> Optional[SharedPixelView]:
+    """Keep ``current`` if it already maps ``handle``, else attach to it; ``None`` means decode from disk."""
+    if current is not None and handle is not None and current.handle == handle:
+        return current
+    if current is not None:
+        current.close()
+    if handle is None:
+        return None
+    try:
+        return SharedPixelView(handle)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fingerprint import fingerprint
+
+StatePath = Tuple[Any, ...]
+
+
+class _Missing:
+    """Marks a key that is absent on one side of a change."""
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+    def __reduce__(self) -> str:
+        # Unpickles as the module's singleton, so ``is MISSING`` holds across processes.
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+@dataclass
+class Change:
+    """One leaf of a state diff: the value at ``path`` before and after the commit."""
+
+    path: StatePath
+    old: Any
+    new: Any
+
+
+@dataclass
+class HistoryEntry:
+    description: str
+    digest: str
+    changes: List[Change] = field(default_factory=list)
+    keyframe: Optional[Dict[str, Any]] = None
+
+
+def diff_states(old: Any, new: Any, path: StatePath = ()) -> List[Change]:
+    """Leaf-level changes turning ``old`` into ``new``.
+
+    Dicts are compared key by key and lists of equal length item by item; any
+    other difference replaces the whole value at that path. Values that
+    compare equal are unchanged, as for ``old == new``, and equal dicts and
+    lists are skipped without walking them, so the cost follows the size of
+    the change rather than of the states. Values in the result are copies, so
+    they stay valid however the states change later.
+    """
+    changes: List[Change] = []
+    if old != new:
+        _diff_into(old, new, path, changes)
+    return changes
+
+
+def _diff_into(old: Any, new: Any, path: StatePath, changes: List[Change]) -> None:
+    """Append the changes between ``old`` and ``new``, which the caller found unequal."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        # Most keys compare equal, so find the others in one comprehension first.
+        for key in [key for key, value in new.items() if old.get(key, MISSING) != value]:
+            _diff_into(old.get(key, MISSING), new[key], path + (key,), changes)
+        if old.keys() != new.keys():
+            for key, value in old.items():
+                if key not in new:
+                    changes.append(Change(path + (key,), deepcopy(value), MISSING))
+        return
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        for index in [index for index, (old_item, new_item) in enumerate(zip(old, new)) if old_item != new_item]:
+            _diff_into(old[index], new[index], path + (index,), changes)
+        return
+    changes.append(Change(path, deepcopy(old), deepcopy(new)))
+
+
+def apply_changes(state: Dict[str, Any], changes: List[Change], *, reverse: bool = False) -> Dict[str, Any]:
+    """Apply ``changes`` to ``state`` in place (undoing them when ``reverse``) and return it."""
+    for change in reversed(changes) if reverse else changes:
+        value = change.old if reverse else change.new
+        if not change.path:
+            state = deepcopy(value)
+            continue
+        container = state
+        for key in change.path[:-1]:
+            container = container[key]
+        if value is MISSING:
+            del container[change.path[-1]]
+        else:
+            container[change.path[-1]] = deepcopy(value) if isinstance(value, (dict, list)) else value
+    return state
+
+
+class EditHistory:
+    """Undo stack of ``TLImage.to_dict`` states stored as diffs between neighbours.
+
+    Only the current state is kept in full. Every entry records the leaf
+    changes from the entry before it, so undo and redo cost as much as the
+    edit they step over; both return those changes so the caller can patch
+    its own objects instead of rebuilding them. Every ``keyframe_interval``
+    entries a full copy is kept as well so any entry can be rebuilt from a
+    nearby keyframe. A commit that changes nothing is a no-op.
+
+    Each entry's ``digest`` chains the previous entry's digest with its
+    changes, so it is computed at the cost of the diff; entries reached by the
+    same edits from the same start share a digest.
+    """
+
+    DEFAULT_KEYFRAME_INTERVAL = 50
+
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL) -> None:
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self._entries: List[HistoryEntry] = []
+        self._index = -1
+        self._state: Optional[Dict[str, Any]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def entries(self) -> List[HistoryEntry]:
+        return list(self._entries)
+
+    def reset(self, state: Dict[str, Any], description: str) -> None:
+        self._entries = []
+        self._index = -1
+        self._state = None
+        self.commit(state, description)
+
+    def commit(self, state: Dict[str, Any], description: str) -> bool:
+        """Record ``state`` after the current entry, dropping any redo entries.
+
+        The history takes ownership of ``state``; pass a fresh ``to_dict()``.
+        Returns ``False`` when it equals the current state.
+        """
+        if self._state is None:
+            self._entries = [HistoryEntry(description, fingerprint(state), keyframe=deepcopy(state))]
+            self._index = 0
+            self._state = state
+            return True
+        changes = diff_states(self._state, state)
+        if not changes:
+            return False
+        digest = fingerprint(self._entries[self._index].digest, [(change.path, change.new) for change in changes])
+        del self._entries[self._index + 1:]
+        index = len(self._entries)
+        keyframe = deepcopy(state) if index % self.keyframe_interval == 0 else None
+        self._entries.append(HistoryEntry(description, digest, changes, keyframe))
+        self._index = index
+        self._state = state
+        return True
+
+    def can_undo(self) -> bool:
+        return self._index > 0
+
+    def can_redo(self) -> bool:
+        return 0 <= self._index < len(self._entries) - 1
+
+    def undo(self) -> Optional[List[Change]]:
+        """Step back one entry; returns the changes that took the state there, or ``None`` at the start."""
+        if not self.can_undo():
+            return None
+        changes = self._entries[self._index].changes
+        self._state = apply_changes(self._state, changes, reverse=True)
+        self._index -= 1
+        return [Change(change.path, change.new, change.old) for change in reversed(changes)]
+
+    def redo(self) -> Optional[List[Change]]:
+        """Step forward one entry; returns the changes that took the state there, or ``None`` at the end."""
+        if not self.can_redo():
+            return None
+        self._index += 1
+        changes = self._entries[self._index].changes
+        self._state = apply_changes(self._state, changes)
+        return list(changes)
+
+    def state_at(self, index: int) -> Dict[str, Any]:
+        """Rebuild the state of entry ``index`` from the closest keyframe at or before it."""
+        if not 0 <= index < len(self._entries):
+            raise IndexError(f"History index out of range: {index}")
+        start = index
+        while self._entries[start].keyframe is None:
+            start -= 1
+        state = deepcopy(self._entries[start].keyframe)
+        for entry in self._entries[start + 1:index + 1]:
+            state = apply_changes(state, entry.changes)
+        return state
+
+    @property
+    def state(self) -> Optional[Dict[str, Any]]:
+        """The current state itself, updated in place by undo and redo; do not modify it."""
+        return self._state
+
+    def current_state(self) -> Optional[Dict[str, Any]]:
+        return deepcopy(self._state) if self._state is not None else None
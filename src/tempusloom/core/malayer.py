@@ -1,13 +1,21 @@
 ﻿from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import colorsys
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import asdict, dataclass, field, is_dataclass
 from enum import Enum
-from typing import Any, ClassVar, Dict, Iterable, List, Optional, Type
+import hashlib
+import os
+from typing import Any, Callable, ClassVar, Dict, Iterable, Iterator, List, Optional, Type
 import uuid
 
 import numpy as np
-from PIL import Image, ImageEnhance, ImageFilter, ImageOps
+from PIL import Image, ImageFilter, ImageOps
+
+from .fingerprint import fingerprint
+from .render_cache import RenderCache
 
 try:
     import cv2
@@ -39,80 +47,340 @@ def _smoothstep(edge0: float, edge1: float, value: np.ndarray) -> np.ndarray:
     return scaled * scaled * (3.0 - 2.0 * scaled)
 
 
-def _rgb_to_hls_array(array: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-    rgb = np.clip(array[:, :, :3], 0.0, 1.0)
-    red = rgb[:, :, 0]
-    green = rgb[:, :, 1]
-    blue = rgb[:, :, 2]
-
-    maximum = np.max(rgb, axis=2)
-    minimum = np.min(rgb, axis=2)
-    delta = maximum - minimum
-
-    lightness = (maximum + minimum) / 2.0
-    saturation = np.zeros_like(lightness)
-    hue = np.zeros_like(lightness)
-
-    chroma_mask = delta > 1e-6
-    if np.any(chroma_mask):
-        denominator = 1.0 - np.abs(2.0 * lightness - 1.0)
-        saturation[chroma_mask] = delta[chroma_mask] / np.maximum(denominator[chroma_mask], 1e-6)
-
-        red_mask = chroma_mask & (maximum == red)
-        green_mask = chroma_mask & (maximum == green)
-        blue_mask = chroma_mask & (maximum == blue)
-
-        hue[red_mask] = np.mod((green[red_mask] - blue[red_mask]) / np.maximum(delta[red_mask], 1e-6), 6.0)
-        hue[green_mask] = ((blue[green_mask] - red[green_mask]) / np.maximum(delta[green_mask], 1e-6)) + 2.0
-        hue[blue_mask] = ((red[blue_mask] - green[blue_mask]) / np.maximum(delta[blue_mask], 1e-6)) + 4.0
-        hue = np.mod(hue / 6.0, 1.0)
-
-    return hue.astype(np.float32), lightness.astype(np.float32), saturation.astype(np.float32)
-
-
-def _hls_to_rgb_array(hue: np.ndarray, lightness: np.ndarray, saturation: np.ndarray) -> np.ndarray:
-    hue = np.mod(hue, 1.0).astype(np.float32)
-    lightness = np.clip(lightness, 0.0, 1.0).astype(np.float32)
-    saturation = np.clip(saturation, 0.0, 1.0).astype(np.float32)
-
-    chroma = (1.0 - np.abs(2.0 * lightness - 1.0)) * saturation
-    hue_sector = hue * 6.0
-    secondary = chroma * (1.0 - np.abs(np.mod(hue_sector, 2.0) - 1.0))
-
-    red = np.zeros_like(hue, dtype=np.float32)
-    green = np.zeros_like(hue, dtype=np.float32)
-    blue = np.zeros_like(hue, dtype=np.float32)
-
-    masks = [
-        (hue_sector >= 0.0) & (hue_sector < 1.0),
-        (hue_sector >= 1.0) & (hue_sector < 2.0),
-        (hue_sector >= 2.0) & (hue_sector < 3.0),
-        (hue_sector >= 3.0) & (hue_sector < 4.0),
-        (hue_sector >= 4.0) & (hue_sector < 5.0),
-        (hue_sector >= 5.0) & (hue_sector <= 6.0),
-    ]
-
-    red[masks[0]] = chroma[masks[0]]
-    green[masks[0]] = secondary[masks[0]]
-
-    red[masks[1]] = secondary[masks[1]]
-    green[masks[1]] = chroma[masks[1]]
-
-    green[masks[2]] = chroma[masks[2]]
-    blue[masks[2]] = secondary[masks[2]]
-
-    green[masks[3]] = secondary[masks[3]]
-    blue[masks[3]] = chroma[masks[3]]
-
-    red[masks[4]] = secondary[masks[4]]
-    blue[masks[4]] = chroma[masks[4]]
+_LUMA_601 = np.asarray((0.299, 0.587, 0.114), dtype=np.float32)
+_DETAIL_KERNEL = np.asarray(((0.0, -1.0, 0.0), (-1.0, 10.0, -1.0), (0.0, -1.0, 0.0)), dtype=np.float32) / 6.0
+
+
+def _luma_601(rgb: np.ndarray) -> np.ndarray:
+    """Return the ITU-R 601 luma plane, matching PIL's ``convert("L")``."""
+    return np.matmul(rgb, _LUMA_601)
+
+
+def _mean_luma(rgb: np.ndarray) -> float:
+    return float(_luma_601(rgb).mean()) if rgb.size else 0.0
+
+
+def _enhance_contrast(rgb: np.ndarray, factor: float, *, mean: Optional[float] = None) -> None:
+    """Float equivalent of ``ImageEnhance.Contrast`` applied in place."""
+    if mean is None:
+        mean = _mean_luma(rgb)
+    rgb -= mean
+    rgb *= factor
+    rgb += mean
+    np.clip(rgb, 0.0, 1.0, out=rgb)
+
+
+def _enhance_color(rgb: np.ndarray, factor: float) -> None:
+    """Float equivalent of ``ImageEnhance.Color`` applied in place."""
+    gray = _luma_601(rgb)[..., None]
+    rgb -= gray
+    rgb *= factor
+    rgb += gray
+    np.clip(rgb, 0.0, 1.0, out=rgb)
+
+
+def _gaussian_blur_array(array: np.ndarray, sigma: float) -> np.ndarray:
+    if sigma <= 0:
+        return array.copy()
+    if cv2 is not None:
+        return cv2.GaussianBlur(array, (0, 0), sigmaX=sigma, sigmaY=sigma, borderType=cv2.BORDER_REPLICATE)
+
+    radius = max(1, int(np.ceil(sigma * 3.0)))
+    offsets = np.arange(-radius, radius + 1, dtype=np.float32)
+    kernel = np.exp(-0.5 * (offsets / np.float32(sigma)) ** 2)
+    return _separable_filter_array(array, kernel / kernel.sum())
+
+
+def _lowpass_kernel(factor: float) -> np.ndarray:
+    """Lanczos-3 low-pass cutting off at ``factor`` times the Nyquist frequency, for shrinking by ``factor``."""
+    radius = int(np.ceil(3.0 / factor))
+    offsets = np.arange(-radius, radius + 1, dtype=np.float64) * factor
+    kernel = np.sinc(offsets) * np.sinc(offsets / 3.0)
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+def _lowpass_array(array: np.ndarray, factor: float) -> np.ndarray:
+    """Band-limit ``array`` before it is sampled at ``factor`` times its pixel density, as a filtered resize does."""
+    if factor >= 1.0:
+        return array.copy()
+    kernel = _lowpass_kernel(factor)
+    if cv2 is not None:
+        return cv2.sepFilter2D(array, -1, kernel, kernel, borderType=cv2.BORDER_REPLICATE)
+    return _separable_filter_array(array, kernel)
+
+
+def _separable_filter_array(array: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """Convolve rows and columns of ``array`` with the odd-length ``kernel``, replicating the edges."""
+    radius = len(kernel) // 2
+    result = array
+    for axis in (0, 1):
+        pad_width = [(0, 0)] * array.ndim
+        pad_width[axis] = (radius, radius)
+        padded = np.pad(result, pad_width, mode="edge")
+        length = array.shape[axis]
+        accumulated = np.zeros_like(array, dtype=np.float32)
+        for index, weight in enumerate(kernel):
+            window = [slice(None)] * array.ndim
+            window[axis] = slice(index, index + length)
+            accumulated += padded[tuple(window)] * weight
+        result = accumulated
+    return result
+
+
+def _convolve_3x3(array: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    if cv2 is not None:
+        return cv2.filter2D(array, -1, kernel, borderType=cv2.BORDER_REPLICATE)
+    height, width = array.shape[:2]
+    pad_width = [(1, 1), (1, 1)] + [(0, 0)] * (array.ndim - 2)
+    padded = np.pad(array, pad_width, mode="edge")
+    result = np.zeros_like(array, dtype=np.float32)
+    for row in range(3):
+        for column in range(3):
+            weight = float(kernel[row, column])
+            if weight:
+                result += padded[row:row + height, column:column + width] * weight
+    return result
+
+
+def _array_digest(*arrays: np.ndarray) -> str:
+    """Content digest of pixel arrays, used when a buffer carries no ``source_key``."""
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(repr((array.shape, array.dtype.str)).encode("ascii"))
+        digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+def _identity_lattice(size: int) -> np.ndarray:
+    """Return every ``size``³ RGB lattice point laid out as a ``(size², size, 3)`` image."""
+    axis = np.linspace(0.0, 1.0, num=size, dtype=np.float32)
+    red, green, blue = np.meshgrid(axis, axis, axis, indexing="ij")
+    return np.stack((red, green, blue), axis=-1).reshape(size * size, size, 3)
+
+
+def _apply_lut3d(rgb: np.ndarray, lut: np.ndarray, *, rows: int = 64) -> np.ndarray:
+    """Look ``rgb`` up in an ``NxNxNx3`` lattice with tetrahedral interpolation.
+
+    Each lattice cell is split into six tetrahedra along its neutral diagonal. The
+    one containing a pixel is found by ordering its fractional coordinates, so only
+    four lattice corners are gathered per pixel instead of trilinear's eight. Rows
+    are processed in strips so the temporaries stay cache-sized.
+    """
+    size = lut.shape[0]
+    flat = lut.reshape(-1, 3)
+    red_step, green_step = size * size, size
+    diagonal = red_step + green_step + 1
+    scale = np.float32(size - 1)
+    out = np.empty(rgb.shape, dtype=np.float32)
+    for top in range(0, rgb.shape[0], max(1, rows)):
+        fraction = np.clip(rgb[top:top + rows], 0.0, 1.0)
+        fraction *= scale
+        base = fraction.astype(np.int32)
+        np.minimum(base, size - 2, out=base)
+        fraction -= base
+        red, green, blue = fraction[..., 0], fraction[..., 1], fraction[..., 2]
+        index = base[..., 0] * red_step
+        index += base[..., 1] * green_step
+        index += base[..., 2]
+
+        red_ge_green = red >= green
+        green_ge_blue = green >= blue
+        red_ge_blue = red >= blue
+        largest = np.maximum(np.maximum(red, green), blue)
+        smallest = np.minimum(np.minimum(red, green), blue)
+        middle = red + green
+        middle += blue
+        middle -= largest
+        middle -= smallest
+        first_step = np.where(red_ge_green & red_ge_blue, red_step, np.where(green_ge_blue, green_step, 1))
+        second_step = diagonal - np.where(~(red_ge_green | red_ge_blue), red_step, np.where(green_ge_blue, 1, green_step))
+
+        block = out[top:top + rows]
+        np.multiply(flat[index], (1.0 - largest)[..., None], out=block)
+        block += flat[index + first_step] * (largest - middle)[..., None]
+        block += flat[index + second_step] * (middle - smallest)[..., None]
+        index += diagonal
+        block += flat[index] * smallest[..., None]
+    return out
+
+
+def _remap_array(array: np.ndarray, map_x: np.ndarray, map_y: np.ndarray) -> np.ndarray:
+    """Sample ``array`` at ``(map_x, map_y)``; coordinates outside it read as zero."""
+    if cv2 is not None:
+        return cv2.remap(
+            array,
+            map_x,
+            map_y,
+            interpolation=cv2.INTER_CUBIC,
+            borderMode=cv2.BORDER_CONSTANT,
+            borderValue=0,
+        )
 
-    red[masks[5]] = chroma[masks[5]]
-    blue[masks[5]] = secondary[masks[5]]
+    height, width = array.shape[:2]
+    padded = np.pad(array, [(1, 2), (1, 2)] + [(0, 0)] * (array.ndim - 2))
+    x = np.clip(map_x, -1.0, width).astype(np.float32) + 1.0
+    y = np.clip(map_y, -1.0, height).astype(np.float32) + 1.0
+    x0 = np.floor(x).astype(np.intp)
+    y0 = np.floor(y).astype(np.intp)
+    fx = x - x0
+    fy = y - y0
+    if array.ndim == 3:
+        fx = fx[..., None]
+        fy = fy[..., None]
+    top = padded[y0, x0] * (1.0 - fx) + padded[y0, x0 + 1] * fx
+    bottom = padded[y0 + 1, x0] * (1.0 - fx) + padded[y0 + 1, x0 + 1] * fx
+    return (top * (1.0 - fy) + bottom * fy).astype(np.float32)
+
+
+def _gaussian_halo(sigma: float) -> int:
+    """Pixels of context a Gaussian of ``sigma`` reads on each side."""
+    return int(np.ceil(4.0 * sigma)) + 1 if sigma > 0 else 0
+
+
+def _rgb_to_hls_array(
+    array: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Convert RGB in ``[0, 1]`` to ``(hue, lightness, saturation)`` planes, hue in ``[0, 1)``.
+
+    The planes are views into one ``HxWx3`` float32 array, ``out`` when given.
+    Pixels with a chroma of at most ``1e-6`` get hue and saturation 0. OpenCV's
+    float HLS conversion is used when available; the NumPy path selects the hue
+    formula arithmetically instead of through per-sector masks.
+    """
+    height, width = array.shape[:2]
+    if out is None:
+        out = np.empty((height, width, 3), dtype=np.float32)
+    hue, lightness, saturation = out[..., 0], out[..., 1], out[..., 2]
+
+    if cv2 is not None:
+        cv2.cvtColor(np.clip(array[..., :3], 0.0, 1.0), cv2.COLOR_RGB2HLS, dst=out)
+        hue *= np.float32(1.0 / 360.0)
+        chroma = np.multiply(lightness, 2.0, dtype=np.float32)
+        chroma -= 1.0
+        np.abs(chroma, out=chroma)
+        np.subtract(1.0, chroma, out=chroma)
+        chroma *= saturation
+        achromatic = chroma <= 1e-6
+        hue[achromatic] = 0.0
+        saturation[achromatic] = 0.0
+        return hue, lightness, saturation
+
+    red = np.clip(array[..., 0], 0.0, 1.0)
+    green = np.clip(array[..., 1], 0.0, 1.0)
+    blue = np.clip(array[..., 2], 0.0, 1.0)
+    maximum = np.maximum(red, green)
+    np.maximum(maximum, blue, out=maximum)
+    delta = np.minimum(red, green)
+    np.minimum(delta, blue, out=delta)
+
+    np.add(maximum, delta, out=lightness)
+    lightness *= np.float32(0.5)
+    np.subtract(maximum, delta, out=delta)
+    chromatic = delta > 1e-6
+
+    denominator = np.multiply(lightness, 2.0, dtype=np.float32)
+    denominator -= 1.0
+    np.abs(denominator, out=denominator)
+    np.subtract(1.0, denominator, out=denominator)
+    np.maximum(denominator, 1e-6, out=denominator)
+    np.divide(delta, denominator, out=saturation)
+    saturation *= chromatic
+
+    red_is_max = maximum == red
+    green_is_max = maximum == green
+    green_is_max &= ~red_is_max
+    sector = np.where(red_is_max, green - blue, np.where(green_is_max, blue - red, red - green))
+    np.maximum(delta, 1e-6, out=delta)
+    sector /= delta
+    sector += np.float32(4.0)
+    sector -= red_is_max * np.float32(4.0)
+    sector -= green_is_max * np.float32(2.0)
+    sector *= np.float32(1.0 / 6.0)
+    np.mod(sector, 1.0, out=sector)
+    np.multiply(sector, chromatic, out=hue)
+    return hue, lightness, saturation
+
+
+def _hls_to_rgb_array(
+    hue: np.ndarray,
+    lightness: np.ndarray,
+    saturation: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Inverse of :func:`_rgb_to_hls_array`; writes into ``out`` (``HxWx3`` float32) when given."""
+    height, width = np.shape(hue)
+    if out is None:
+        out = np.empty((height, width, 3), dtype=np.float32)
+    lightness = np.clip(lightness, 0.0, 1.0).astype(np.float32, copy=False)
+    saturation = np.clip(saturation, 0.0, 1.0).astype(np.float32, copy=False)
+
+    if cv2 is not None:
+        degrees = np.mod(hue, 1.0).astype(np.float32, copy=False)
+        degrees *= np.float32(360.0)
+        cv2.cvtColor(cv2.merge((degrees, lightness, saturation)), cv2.COLOR_HLS2RGB, dst=out)
+        np.clip(out, 0.0, 1.0, out=out)
+        return out
 
-    match = lightness - chroma / 2.0
-    rgb = np.stack((red + match, green + match, blue + match), axis=2)
-    return np.clip(rgb, 0.0, 1.0).astype(np.float32)
+    # Branch-free form: channel = L - a * clamp(min(k - 3, 9 - k), -1, 1),
+    # k = (n + 12 * hue) mod 12 for n = 0, 8, 4 and a = S * min(L, 1 - L).
+    twelfths = np.mod(hue, 1.0).astype(np.float32, copy=False) * np.float32(12.0)
+    amplitude = np.minimum(lightness, 1.0 - lightness)
+    amplitude *= saturation
+    for channel, offset in enumerate((0.0, 8.0, 4.0)):
+        position = np.add(twelfths, np.float32(offset))
+        np.mod(position, 12.0, out=position)
+        ramp = np.subtract(9.0, position, dtype=np.float32)
+        position -= 3.0
+        np.minimum(position, ramp, out=ramp)
+        np.clip(ramp, -1.0, 1.0, out=ramp)
+        ramp *= amplitude
+        np.subtract(lightness, ramp, out=out[..., channel])
+    np.clip(out, 0.0, 1.0, out=out)
+    return out
+
+
+class _HLSDomain:
+    """A frame held as RGB or as HLS planes, converted only when a step needs the other form.
+
+    Consecutive hue/saturation/lightness edits share one RGB→HLS conversion and
+    one conversion back. :meth:`set_hls` canonicalizes the planes the way a real
+    round trip would (hue wrapped, lightness and saturation clipped, achromatic
+    pixels reset to hue 0), so chaining edits in HLS matches converting between
+    them.
+    """
+
+    def __init__(self, rgb: np.ndarray) -> None:
+        self._rgb: Optional[np.ndarray] = rgb
+        self._hls: Optional[tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def rgb(self) -> np.ndarray:
+        if self._rgb is None:
+            assert self._hls is not None
+            self._rgb = _hls_to_rgb_array(*self._hls)
+        return self._rgb
+
+    def hls(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._hls is None:
+            assert self._rgb is not None
+            self._hls = _rgb_to_hls_array(self._rgb)
+        return self._hls
+
+    def set_rgb(self, rgb: np.ndarray) -> None:
+        self._rgb = rgb
+        self._hls = None
+
+    def set_hls(self, hue: np.ndarray, lightness: np.ndarray, saturation: np.ndarray) -> None:
+        hue = np.mod(hue, 1.0).astype(np.float32, copy=False)
+        lightness = np.clip(lightness, 0.0, 1.0).astype(np.float32, copy=False)
+        saturation = np.clip(saturation, 0.0, 1.0).astype(np.float32, copy=False)
+        achromatic = (1.0 - np.abs(2.0 * lightness - 1.0)) * saturation <= 1e-6
+        if achromatic.any():
+            hue = np.where(achromatic, np.float32(0.0), hue)
+            saturation = np.where(achromatic, np.float32(0.0), saturation)
+        self._hls = (hue, lightness, saturation)
+        self._rgb = None
 
 
 class BlendMode(str, Enum):
@@ -294,21 +562,64 @@ class Mask:
     opacity: float = 1.0
     feather_radius: float = 0.0
 
+    # Shared by every mask in the process: decoded sources (as pyramids) and
+    # finished rasters, keyed on the file's path and mtime so edits on disk miss.
+    raster_cache: ClassVar[RenderCache] = RenderCache(128 * 1024 * 1024)
+    _PYRAMID_MIN_DIMENSION: ClassVar[int] = 64
+
     def to_pil(self, size: tuple[int, int]) -> Image.Image:
-        if self.image_path:
-            image = Image.open(self.image_path).convert("L")
-            if image.size != size:
-                image = image.resize(size, Image.Resampling.LANCZOS)
-        else:
-            image = Image.new("L", size, color=255)
+        return Image.fromarray(self.to_array(size))
+
+    def to_array(self, size: tuple[int, int]) -> np.ndarray:
+        """The mask rasterized at ``size`` as a read-only ``HxW`` uint8 array.
+
+        Rasters are cached in :attr:`raster_cache` on the source file, ``size``,
+        feather radius, inversion and opacity. The source is resized from the
+        smallest level of its pyramid that still covers ``size``, so preview-sized
+        rasters never touch the full-resolution image after the first decode.
+        """
+        size = (int(size[0]), int(size[1]))
+        source_key = self._source_key()
+        key = ("raster", source_key, size, float(self.feather_radius), bool(self.invert), float(self.opacity))
+        raster = self.raster_cache.get(key)
+        if raster is not None:
+            return raster
+
+        image = self._source_at(source_key, size)
         if self.feather_radius > 0:
             image = image.filter(ImageFilter.GaussianBlur(radius=self.feather_radius))
         if self.invert:
             image = ImageOps.invert(image)
+        raster = np.array(image, dtype=np.uint8)
         if self.opacity < 1.0:
-            alpha = np.asarray(image, dtype=np.float32) * _clamp(self.opacity, 0.0, 1.0)
-            image = Image.fromarray(alpha.astype(np.uint8), mode="L")
-        return image
+            raster = (raster.astype(np.float32) * _clamp(self.opacity, 0.0, 1.0)).astype(np.uint8)
+        raster.flags.writeable = False
+        self.raster_cache.put(key, raster, raster.nbytes)
+        return raster
+
+    def _source_key(self) -> Optional[tuple[str, int]]:
+        if not self.image_path:
+            return None
+        return os.path.abspath(self.image_path), os.stat(self.image_path).st_mtime_ns
+
+    def _source_at(self, source_key: Optional[tuple[str, int]], size: tuple[int, int]) -> Image.Image:
+        if source_key is None:
+            return Image.new("L", size, color=255)
+        levels = self.raster_cache.get(("pyramid", source_key))
+        if levels is None:
+            level = Image.open(source_key[0]).convert("L")
+            levels = [level]
+            while min(level.size) >= 2 * self._PYRAMID_MIN_DIMENSION:
+                level = level.reduce(2)
+                levels.append(level)
+            levels = tuple(levels)
+            self.raster_cache.put(("pyramid", source_key), levels, sum(level.width * level.height for level in levels))
+        width, height = size
+        image = next(
+            (level for level in reversed(levels) if level.width >= width and level.height >= height),
+            levels[0],
+        )
+        return image if image.size == size else image.resize(size, Image.Resampling.LANCZOS)
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -320,42 +631,364 @@ class Mask:
         return cls(**data)
 
 
+class RenderCancelled(Exception):
+    """Raised inside a render whose :func:`render_cancellation` check reports it is no longer wanted."""
+
+
+_cancel_check: ContextVar[Optional[Callable[[], bool]]] = ContextVar("tempusloom_render_cancel_check", default=None)
+
+
+@contextmanager
+def render_cancellation(is_cancelled: Callable[[], bool]) -> Iterator[None]:
+    """Make renders on this thread stop with :class:`RenderCancelled` once ``is_cancelled()`` is true.
+
+    The check runs between adjustment stages, layers and tiles, so an obsolete
+    render is abandoned at the next boundary instead of running to the end. The
+    tile scheduler's worker threads run in a copy of this context and see it too.
+    """
+    token = _cancel_check.set(is_cancelled)
+    try:
+        yield
+    finally:
+        _cancel_check.reset(token)
+
+
+def raise_if_cancelled() -> None:
+    check = _cancel_check.get()
+    if check is not None and check():
+        raise RenderCancelled()
+
+
+@dataclass(frozen=True)
+class TileBox:
+    """Half-open pixel rectangle ``[left, right) x [top, bottom)`` in full-frame coordinates."""
+
+    left: int
+    top: int
+    right: int
+    bottom: int
+
+    @classmethod
+    def from_size(cls, size: tuple[int, int]) -> "TileBox":
+        return cls(0, 0, int(size[0]), int(size[1]))
+
+    @property
+    def width(self) -> int:
+        return max(0, self.right - self.left)
+
+    @property
+    def height(self) -> int:
+        return max(0, self.bottom - self.top)
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.width, self.height
+
+    def is_empty(self) -> bool:
+        return self.width == 0 or self.height == 0
+
+    def as_tuple(self) -> tuple[int, int, int, int]:
+        return self.left, self.top, self.right, self.bottom
+
+    def expand(self, margin: int) -> "TileBox":
+        return TileBox(self.left - margin, self.top - margin, self.right + margin, self.bottom + margin)
+
+    def clip(self, size: tuple[int, int]) -> "TileBox":
+        return TileBox(
+            max(0, self.left),
+            max(0, self.top),
+            max(0, min(int(size[0]), self.right)),
+            max(0, min(int(size[1]), self.bottom)),
+        )
+
+    def union(self, other: "TileBox") -> "TileBox":
+        if other.is_empty():
+            return self
+        if self.is_empty():
+            return other
+        return TileBox(
+            min(self.left, other.left),
+            min(self.top, other.top),
+            max(self.right, other.right),
+            max(self.bottom, other.bottom),
+        )
+
+    def slices_within(self, outer: "TileBox") -> tuple[slice, slice]:
+        """Row and column slices selecting this box from an array covering ``outer``."""
+        return (
+            slice(self.top - outer.top, self.bottom - outer.top),
+            slice(self.left - outer.left, self.right - outer.left),
+        )
+
+
+@dataclass
+class RenderRegion:
+    """Placement of a buffer in the full frame while a layer renders one tile.
+
+    ``source`` is the area covered by the buffer handed to the layer and
+    ``target`` the area the layer has to return. ``statistics`` holds image-wide
+    values (mean luma for contrast, for example) measured once on a proxy of the
+    whole frame, so every tile pivots around the same numbers; a statistic that
+    is missing is computed from the buffer at hand and recorded.
+    """
+
+    full_size: tuple[int, int]
+    source: TileBox
+    target: TileBox
+    statistics: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def full_frame(cls, size: tuple[int, int]) -> "RenderRegion":
+        box = TileBox.from_size(size)
+        return cls(full_size=(int(size[0]), int(size[1])), source=box, target=box)
+
+    def statistic(self, name: str, compute: Callable[[], float]) -> float:
+        value = self.statistics.get(name)
+        if value is None:
+            value = float(compute())
+            self.statistics[name] = value
+        return value
+
+
+@dataclass
+class RenderBuffer:
+    """Float32 working image shared by every adjustment stage.
+
+    ``rgb`` is an ``HxWx3`` array and ``alpha`` a separate ``HxW`` plane, both in
+    ``[0, 1]``. Stages update the arrays in place where the operation allows it,
+    so an image is converted from PIL once on entry and back once on exit and is
+    never quantized to 8 bits between stages.
+
+    ``source_key`` optionally identifies the pixels the buffer was created from;
+    stage caches use it instead of hashing the arrays. It is cleared once a
+    stage has changed the pixels. ``region`` is set while the buffer is one tile
+    of a larger frame; without it the buffer is the whole frame.
+    """
+
+    rgb: np.ndarray
+    alpha: np.ndarray
+    source_key: Optional[str] = None
+    region: Optional[RenderRegion] = None
+
+    @classmethod
+    def from_pil(cls, image: Image.Image) -> "RenderBuffer":
+        rgba = np.asarray(image if image.mode == "RGBA" else image.convert("RGBA"), dtype=np.uint8)
+        rgb = rgba[..., :3].astype(np.float32)
+        rgb *= np.float32(1.0 / 255.0)
+        alpha = rgba[..., 3].astype(np.float32)
+        alpha *= np.float32(1.0 / 255.0)
+        return cls(rgb=rgb, alpha=alpha)
+
+    @classmethod
+    def from_rgba(cls, rgba: np.ndarray) -> "RenderBuffer":
+        return cls(
+            rgb=np.ascontiguousarray(rgba[..., :3], dtype=np.float32),
+            alpha=np.ascontiguousarray(rgba[..., 3], dtype=np.float32),
+        )
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return int(self.rgb.shape[1]), int(self.rgb.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.rgb.nbytes + self.alpha.nbytes)
+
+    @property
+    def full_size(self) -> tuple[int, int]:
+        return self.region.full_size if self.region is not None else self.size
+
+    @property
+    def box(self) -> TileBox:
+        """Area of the full frame this buffer currently covers."""
+        if self.region is None:
+            return TileBox.from_size(self.size)
+        left, top = self.region.source.left, self.region.source.top
+        width, height = self.size
+        return TileBox(left, top, left + width, top + height)
+
+    def statistic(self, name: str, compute: Callable[[], float]) -> float:
+        """Image-wide statistic from the render region, or ``compute()`` on this buffer."""
+        if self.region is None:
+            return float(compute())
+        return self.region.statistic(name, compute)
+
+    def rgba(self) -> np.ndarray:
+        return np.dstack((self.rgb, self.alpha))
+
+    def copy(self) -> "RenderBuffer":
+        return RenderBuffer(
+            rgb=self.rgb.copy(),
+            alpha=self.alpha.copy(),
+            source_key=self.source_key,
+            region=self.region,
+        )
+
+    def crop(self, box: TileBox) -> "RenderBuffer":
+        """Return a view of ``box`` (full-frame coordinates) without region information."""
+        rows, columns = box.slices_within(self.box)
+        return RenderBuffer(rgb=self.rgb[rows, columns], alpha=self.alpha[rows, columns])
+
+    def to_rgba8(self) -> np.ndarray:
+        height, width = self.rgb.shape[:2]
+        out = np.empty((height, width, 4), dtype=np.uint8)
+        out[..., :3] = np.clip(self.rgb, 0.0, 1.0) * 255.0 + 0.5
+        out[..., 3] = np.clip(self.alpha, 0.0, 1.0) * 255.0 + 0.5
+        return out
+
+    def to_pil(self) -> Image.Image:
+        return Image.fromarray(self.to_rgba8(), mode="RGBA")
+
+
+@dataclass(frozen=True)
+class _GeometryWarp:
+    """Compiled geometry for one output box: full-frame float32 sampling maps and their footprint.
+
+    ``shrink`` is the output-to-input pixel ratio below 1 when the warp scales
+    the image down; the input is then band-limited with :func:`_lowpass_array`
+    before sampling, and ``source`` includes the filter's footprint.
+    """
+
+    maps: Dict[str, tuple[np.ndarray, np.ndarray]]
+    source: TileBox
+    shrink: float = 1.0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(map_x.nbytes + map_y.nbytes for map_x, map_y in self.maps.values())
+
+
+def _blend_rgb(base_rgb: np.ndarray, layer_rgb: np.ndarray, mode: BlendMode) -> np.ndarray:
+    if mode == BlendMode.NORMAL:
+        return layer_rgb
+    if mode == BlendMode.DARKEN:
+        return np.minimum(base_rgb, layer_rgb)
+    if mode == BlendMode.LIGHTEN:
+        return np.maximum(base_rgb, layer_rgb)
+    if mode == BlendMode.MULTIPLY:
+        return base_rgb * layer_rgb
+    if mode == BlendMode.SCREEN:
+        return 1.0 - (1.0 - base_rgb) * (1.0 - layer_rgb)
+    if mode == BlendMode.OVERLAY:
+        return np.where(base_rgb <= 0.5, 2.0 * base_rgb * layer_rgb, 1.0 - 2.0 * (1.0 - base_rgb) * (1.0 - layer_rgb))
+    if mode == BlendMode.SOFT_LIGHT:
+        return (1.0 - 2.0 * layer_rgb) * base_rgb * base_rgb + 2.0 * layer_rgb * base_rgb
+    if mode == BlendMode.ADD:
+        return np.clip(base_rgb + layer_rgb, 0.0, 1.0)
+    raise ValueError(f"Unsupported blend mode: {mode}")
+
+
+_UINT8_BLEND_MODES = frozenset(
+    (BlendMode.NORMAL, BlendMode.DARKEN, BlendMode.LIGHTEN, BlendMode.MULTIPLY, BlendMode.SCREEN, BlendMode.ADD)
+)
+
+
+def _blend_rgb_uint8(base_rgb: np.ndarray, layer_rgb: np.ndarray, mode: BlendMode) -> np.ndarray:
+    """Integer version of :func:`_blend_rgb` for the modes in ``_UINT8_BLEND_MODES``, rounded to uint8."""
+    if mode == BlendMode.NORMAL:
+        return layer_rgb
+    if mode == BlendMode.DARKEN:
+        return np.minimum(base_rgb, layer_rgb)
+    if mode == BlendMode.LIGHTEN:
+        return np.maximum(base_rgb, layer_rgb)
+    if mode == BlendMode.ADD:
+        return np.minimum(base_rgb.astype(np.uint16) + layer_rgb, 255).astype(np.uint8)
+    if mode == BlendMode.MULTIPLY:
+        product = base_rgb.astype(np.uint16) * layer_rgb
+    elif mode == BlendMode.SCREEN:
+        product = (255 - base_rgb).astype(np.uint16) * (255 - layer_rgb)
+    else:
+        raise ValueError(f"Unsupported uint8 blend mode: {mode}")
+    product += 127
+    product //= 255
+    product = product.astype(np.uint8)
+    return 255 - product if mode == BlendMode.SCREEN else product
+
+
 def composite_images(base: Image.Image, layer: Image.Image, mode: BlendMode, opacity: float, mask: Optional[Mask]) -> Image.Image:
-    base_rgba = _ensure_rgba(base)
-    layer_rgba = _ensure_rgba(layer).resize(base_rgba.size, Image.Resampling.LANCZOS)
+    """Blend ``layer`` over ``base`` with ``mode``, ``opacity`` and ``mask``; alpha is the maximum of both.
+
+    An opaque, fully visible, unmasked NORMAL layer is returned without
+    blending (copied if it is ``layer`` itself, so the result never aliases an
+    argument), and the other modes except overlay and soft light are blended
+    in uint8 arithmetic. The layer is only resampled when its size differs
+    from the base.
+    """
+    base_rgba = base if base.mode == "RGBA" else base.convert("RGBA")
+    layer_rgba = layer if layer.mode == "RGBA" else layer.convert("RGBA")
+    if layer_rgba.size != base_rgba.size:
+        layer_rgba = layer_rgba.resize(base_rgba.size, Image.Resampling.LANCZOS)
+    mode = BlendMode(mode)
+    opacity = _clamp(float(opacity), 0.0, 1.0)
+
+    if mode in _UINT8_BLEND_MODES:
+        weight: Optional[np.ndarray] = None
+        if mask is not None:
+            weight = mask.to_array(base_rgba.size).astype(np.uint16)
+            weight *= int(round(opacity * 255))
+            weight += 127
+            weight //= 255
+            weight = weight[..., None]
+        elif opacity < 1.0:
+            weight = np.uint16(round(opacity * 255))
+
+        if mode == BlendMode.NORMAL and weight is None:
+            if layer_rgba.getextrema()[3][0] == 255:
+                return layer_rgba.copy() if layer_rgba is layer else layer_rgba
+            out = np.array(layer_rgba)
+            np.maximum(out[..., 3], np.asarray(base_rgba)[..., 3], out=out[..., 3])
+            return Image.fromarray(out, mode="RGBA")
+
+        base_arr = np.asarray(base_rgba)
+        layer_arr = np.asarray(layer_rgba)
+        out = np.empty_like(base_arr)
+        blended = _blend_rgb_uint8(base_arr[..., :3], layer_arr[..., :3], mode)
+        if weight is None:
+            out[..., :3] = blended
+        else:
+            mixed = base_arr[..., :3] * (255 - weight)
+            mixed += blended * weight
+            mixed += 127
+            mixed //= 255
+            out[..., :3] = mixed
+        np.maximum(base_arr[..., 3], layer_arr[..., 3], out=out[..., 3])
+        return Image.fromarray(out, mode="RGBA")
+
     base_arr = _pil_to_float_array(base_rgba)
     layer_arr = _pil_to_float_array(layer_rgba)
     base_rgb = base_arr[..., :3]
     layer_rgb = layer_arr[..., :3]
+    blended_rgb = _blend_rgb(base_rgb, layer_rgb, mode)
 
-    if mode == BlendMode.NORMAL:
-        blended_rgb = layer_rgb
-    elif mode == BlendMode.DARKEN:
-        blended_rgb = np.minimum(base_rgb, layer_rgb)
-    elif mode == BlendMode.LIGHTEN:
-        blended_rgb = np.maximum(base_rgb, layer_rgb)
-    elif mode == BlendMode.MULTIPLY:
-        blended_rgb = base_rgb * layer_rgb
-    elif mode == BlendMode.SCREEN:
-        blended_rgb = 1.0 - (1.0 - base_rgb) * (1.0 - layer_rgb)
-    elif mode == BlendMode.OVERLAY:
-        blended_rgb = np.where(base_rgb <= 0.5, 2.0 * base_rgb * layer_rgb, 1.0 - 2.0 * (1.0 - base_rgb) * (1.0 - layer_rgb))
-    elif mode == BlendMode.SOFT_LIGHT:
-        blended_rgb = (1.0 - 2.0 * layer_rgb) * base_rgb * base_rgb + 2.0 * layer_rgb * base_rgb
-    elif mode == BlendMode.ADD:
-        blended_rgb = np.clip(base_rgb + layer_rgb, 0.0, 1.0)
-    else:
-        raise ValueError(f"Unsupported blend mode: {mode}")
-
-    alpha = np.full((base_rgba.size[1], base_rgba.size[0], 1), _clamp(opacity, 0.0, 1.0), dtype=np.float32)
+    alpha = np.full((base_rgba.size[1], base_rgba.size[0], 1), opacity, dtype=np.float32)
     if mask is not None:
-        alpha *= np.asarray(mask.to_pil(base_rgba.size), dtype=np.float32)[..., None] / 255.0
+        alpha *= mask.to_array(base_rgba.size).astype(np.float32)[..., None] / 255.0
 
     out_rgb = base_rgb * (1.0 - alpha) + blended_rgb * alpha
     out_alpha = np.maximum(base_arr[..., 3:], layer_arr[..., 3:])
     return _float_array_to_pil(np.concatenate([out_rgb, out_alpha], axis=-1))
 
 
+def composite_buffers(
+    base: RenderBuffer,
+    layer: RenderBuffer,
+    mode: BlendMode,
+    opacity: float,
+    mask_alpha: Optional[np.ndarray] = None,
+) -> RenderBuffer:
+    """Float counterpart of :func:`composite_images` for equally sized buffers.
+
+    ``mask_alpha`` is the mask raster for the same area, scaled to ``[0, 1]``.
+    """
+    blended_rgb = _blend_rgb(base.rgb, layer.rgb, mode)
+    alpha = np.full(base.alpha.shape, _clamp(opacity, 0.0, 1.0), dtype=np.float32)
+    if mask_alpha is not None:
+        alpha *= mask_alpha
+    alpha = alpha[..., None]
+    out_rgb = base.rgb * (1.0 - alpha) + blended_rgb * alpha
+    return RenderBuffer(rgb=out_rgb.astype(np.float32, copy=False), alpha=np.maximum(base.alpha, layer.alpha))
+
+
 class Malayer(ABC):
     type_name: ClassVar[str] = "base"
     default_tab: ClassVar[EditorTab] = EditorTab.LAYERS
@@ -417,9 +1050,59 @@ class Malayer(ABC):
         processed = self.apply(_ensure_rgba(image), original_image=_ensure_rgba(original_image) if original_image else None)
         return composite_images(image, processed, self.blend_mode, self.opacity, self.mask)
 
+    def tile_halo(self) -> int:
+        """Pixels of context ``apply`` reads around each output pixel."""
+        return 0
+
+    def source_region(self, target: TileBox, full_size: tuple[int, int]) -> TileBox:
+        """Area of the layer input needed to render ``target``; always contains ``target``."""
+        return target.expand(self.tile_halo()).clip(full_size)
+
+    def apply_tile(self, buffer: RenderBuffer, region: RenderRegion) -> RenderBuffer:
+        """Process ``buffer`` (covering ``region.source``) and return ``region.target``.
+
+        The default goes through :meth:`apply`, which is exact for any layer whose
+        footprint is described by :meth:`tile_halo`.
+        """
+        processed = RenderBuffer.from_pil(self.apply(buffer.to_pil()))
+        processed.region = region
+        return processed.crop(region.target)
+
+    def render_tile(
+        self,
+        buffer: RenderBuffer,
+        region: RenderRegion,
+        *,
+        mask_alpha: Optional[np.ndarray] = None,
+    ) -> RenderBuffer:
+        """Tile counterpart of :meth:`render`; ``buffer`` covers ``region.source``."""
+        buffer.region = region
+        base = buffer.crop(region.target)
+        if not self.visible:
+            return base
+        processed = self.apply_tile(buffer.copy(), region)
+        return composite_buffers(base, processed, self.blend_mode, self.opacity, mask_alpha)
+
     def _serialize_payload(self) -> Dict[str, Any]:
         return {}
 
+    def render_fingerprint(self) -> str:
+        """Digest of everything that affects what :meth:`render` produces for a given input.
+
+        Identity and UI-only fields (id, name, lock, tab) are left out; the mask
+        file's mtime is included so rewriting it on disk changes the digest.
+        """
+        state = self.to_dict()
+        for key in ("id", "name", "locked", "tab_id", "supported_tabs"):
+            state.pop(key, None)
+        mask_source: Optional[tuple[str, int]] = None
+        if self.mask is not None:
+            try:
+                mask_source = self.mask._source_key()
+            except OSError:
+                mask_source = None
+        return fingerprint(state, mask_source)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
@@ -435,6 +1118,28 @@ class Malayer(ABC):
             "payload": self._serialize_payload(),
         }
 
+    def restore_state(self, data: Dict[str, Any], payload_keys: Optional[Iterable[str]] = None) -> None:
+        """Set this layer back to ``data``, an earlier :meth:`to_dict` of the same layer.
+
+        Unlike :meth:`from_dict` the object is kept, and with it any render
+        caches it holds. Only the payload entries in ``payload_keys`` are
+        restored, or all of them when it is ``None``.
+        """
+        self.name = data.get("name", self.name)
+        self.visible = data.get("visible", True)
+        self.locked = data.get("locked", False)
+        self.opacity = data.get("opacity", 1.0)
+        self.blend_mode = BlendMode(data.get("blend_mode", BlendMode.NORMAL.value))
+        self.tab_id = data.get("tab_id") or self.default_tab.value
+        mask = Mask.from_dict(data.get("mask"))
+        if mask != self.mask:
+            self.mask = mask
+        payload = data.get("payload") or {}
+        self._restore_payload(payload, payload if payload_keys is None else payload_keys)
+
+    def _restore_payload(self, payload: Dict[str, Any], keys: Iterable[str]) -> None:
+        return None
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Malayer":
         layer_cls = cls._registry.get(data["type"])
@@ -469,16 +1174,62 @@ class AdjustmentMalayer(TabMalayer):
         ("purple", 280.0, 20.0),
         ("magenta", 320.0, 20.0),
     )
+    _COLOR_LUT_STAGES: ClassVar[tuple[str, ...]] = ("white_balance", "calibration", "tone", "curves")
+    _COLOR_LUT_SIZE: ClassVar[int] = 65
+    _COLOR_LUT_SAMPLE_PIXELS: ClassVar[int] = 65536
+    _TONE_POINTWISE_FIELDS: ClassVar[tuple[str, ...]] = (
+        "exposure",
+        "brightness",
+        "contrast",
+        "highlights",
+        "shadows",
+        "whites",
+        "blacks",
+    )
+    _HLS_STAGES: ClassVar[tuple[str, ...]] = ("hsl", "color_editor", "color_grading")
+    _PIPELINE_STAGES: ClassVar[tuple[str, ...]] = (
+        "white_balance",
+        "calibration",
+        "tone",
+        "curves",
+        "hsl",
+        "color_editor",
+        "color_grading",
+        "detail",
+        "geometry",
+    )
+
+    # Shared by every adjustment layer in the process; keys carry the input identity and the params.
+    stage_cache: ClassVar[RenderCache] = RenderCache(256 * 1024 * 1024)
+    geometry_cache: ClassVar[RenderCache] = RenderCache(128 * 1024 * 1024)
+    # Plan steps whose output is kept: the end of the colour block (LUT or not) and the input to the warp.
+    _STAGE_CHECKPOINTS: ClassVar[tuple[str, ...]] = ("color_lut", "curves", "detail")
+    # Every GeometryParams field except the vignette, which is shaded after the warp.
+    _WARP_FIELDS: ClassVar[tuple[str, ...]] = (
+        "distortion",
+        "chromatic_aberration",
+        "vertical",
+        "horizontal",
+        "rotation",
+        "scale",
+        "offset_x",
+        "offset_y",
+    )
 
     def __init__(self, name: str = "Adjustment", *, params: Optional[AdjustmentParams] = None, **kwargs: Any) -> None:
         super().__init__(name, **kwargs)
         self.params = params or AdjustmentParams()
+        self.use_color_lut = True
+        self._color_lut_cache: Optional[tuple[str, np.ndarray]] = None
         self._sync_basic_to_pipeline()
 
     @classmethod
     def supported_section_names(cls) -> tuple[str, ...]:
         return tuple(section.value for section in AdjustmentSection)
 
+    def render_fingerprint(self) -> str:
+        return fingerprint(super().render_fingerprint(), self.use_color_lut)
+
     def _sync_basic_to_pipeline(self) -> None:
         self.params.tone.exposure = self.params.basic.exposure
         self.params.tone.contrast = self.params.basic.contrast
@@ -595,17 +1346,193 @@ class AdjustmentMalayer(TabMalayer):
             self._sync_basic_to_pipeline()
 
     def apply(self, image: Image.Image, original_image: Optional[Image.Image] = None) -> Image.Image:
-        result = _ensure_rgba(image)
-        result = self._apply_white_balance(result)
-        result = self._apply_calibration(result)
-        result = self._apply_tone(result)
-        result = self._apply_curves(result)
-        result = self._apply_hsl(result)
-        result = self._apply_color_editor(result)
-        result = self._apply_color_grading(result)
-        result = self._apply_detail(result)
-        result = self._apply_geometry(result)
-        return result
+        buffer = RenderBuffer.from_pil(image)
+        if self.stage_cache.fits(buffer.nbytes):
+            # Hashing the 8-bit source is four times cheaper than hashing the float buffer.
+            buffer.source_key = _array_digest(np.asarray(image))
+        return self.apply_buffer(buffer).to_pil()
+
+    def apply_buffer(self, buffer: RenderBuffer, *, use_cache: bool = True) -> RenderBuffer:
+        """Run every stage on ``buffer``; the arrays are modified in place where possible.
+
+        The output of each checkpoint stage (:attr:`_STAGE_CHECKPOINTS`) is kept in
+        :attr:`stage_cache` under a key chained from the input identity
+        (``buffer.source_key`` or a digest of its pixels) and the params of that
+        stage and every stage before it. A re-render resumes from the last
+        checkpoint whose key is still cached, so changing a late section such as
+        detail or geometry skips the colour work entirely; the stages in between
+        cost no copies.
+        """
+        plan = self._pipeline_plan()
+        use_cache = use_cache and self.stage_cache.fits(buffer.nbytes)
+        keys: list[str] = []
+        start = 0
+        if use_cache:
+            key = buffer.source_key or _array_digest(buffer.rgb, buffer.alpha)
+            key = fingerprint(key, self.use_color_lut, self._COLOR_LUT_SIZE)
+            for stage, _, sections in plan:
+                key = fingerprint(key, stage, *sections)
+                keys.append(key)
+            for index in range(len(plan) - 1, -1, -1):
+                if plan[index][0] not in self._STAGE_CHECKPOINTS:
+                    continue
+                cached = self.stage_cache.get(keys[index])
+                if cached is not None:
+                    buffer = cached.copy()
+                    start = index + 1
+                    break
+
+        region = buffer.region
+        for index in range(start, len(plan)):
+            raise_if_cancelled()
+            buffer = plan[index][1](buffer)
+            buffer.source_key = None
+            if buffer.region is None:
+                buffer.region = region
+            if use_cache and plan[index][0] in self._STAGE_CHECKPOINTS:
+                self.stage_cache.put(keys[index], buffer.copy(), buffer.nbytes)
+        return buffer
+
+    def apply_tile(self, buffer: RenderBuffer, region: RenderRegion) -> RenderBuffer:
+        buffer.region = region
+        return self.apply_buffer(buffer, use_cache=False)
+
+    def tile_halo(self) -> int:
+        """Context read by clarity, noise reduction and sharpening, which run back to back."""
+        tone = self.params.tone
+        detail = self.params.detail
+        halo = 0
+        if tone.clarity:
+            clarity_strength = _clamp(tone.clarity / 100.0, -1.0, 1.0)
+            halo += 1 if clarity_strength > 0 else _gaussian_halo(abs(clarity_strength) * 2.4)
+        if detail.luminance_noise > 0:
+            noise_strength = _clamp(float(detail.luminance_noise), 0.0, 100.0)
+            halo += max(
+                int(round((2.5 + noise_strength * 0.08) * 1.5)) + 1,
+                _gaussian_halo(noise_strength / 55.0),
+                _gaussian_halo(_clamp(noise_strength / 24.0, 0.0, 4.0)),
+            )
+        if detail.sharpen_amount > 0:
+            halo += _gaussian_halo(self._sharpen_settings()[0])
+        return halo
+
+    def source_region(self, target: TileBox, full_size: tuple[int, int]) -> TileBox:
+        if target == TileBox.from_size(full_size):
+            return target
+        warp = self._geometry_warp(full_size, target)
+        needed = target if warp is None else warp.source
+        if not needed.is_empty():
+            needed = needed.expand(self.tile_halo())
+        return needed.union(target).clip(full_size)
+
+    def _pipeline_plan(self) -> list[tuple[str, Callable[[RenderBuffer], RenderBuffer], tuple[Any, ...]]]:
+        """Return ``(name, stage, params sections)`` for each step ``apply_buffer`` runs."""
+        stages = self._PIPELINE_STAGES
+        plan: list[tuple[str, Callable[[RenderBuffer], RenderBuffer], tuple[Any, ...]]] = []
+        if self.use_color_lut:
+            sections = tuple(getattr(self.params, stage) for stage in self._COLOR_LUT_STAGES)
+            plan.append(("color_lut", self._apply_color_lut, sections))
+            stages = stages[len(self._COLOR_LUT_STAGES):]
+        for stage in stages:
+            if stage in self._HLS_STAGES:
+                # The HLS stages are adjacent and share one colour space round trip.
+                if stage == self._HLS_STAGES[0]:
+                    sections = tuple(getattr(self.params, name) for name in self._HLS_STAGES)
+                    plan.append(("hls", self._apply_hls_block, sections))
+                continue
+            plan.append((stage, getattr(self, f"_apply_{stage}"), (getattr(self.params, stage),)))
+        return plan
+
+    def compile_color_lut(
+        self,
+        buffer: Optional[RenderBuffer] = None,
+        *,
+        include_curves: bool = True,
+    ) -> Optional[np.ndarray]:
+        """Bake the pointwise colour stages into one ``NxNxNx3`` lattice indexed ``[r, g, b]``.
+
+        The lattice covers white balance, calibration, exposure/brightness/contrast,
+        the highlight/shadow/white/black regions and, when ``include_curves`` is set,
+        the RGB and per-channel curves. Contrast pivots on the mean luma of the image
+        it is applied to, so that mean is sampled from ``buffer`` (mid-grey without
+        one) and becomes part of the cache key together with a fingerprint of the
+        params sections involved. Returns ``None`` when every covered stage is neutral.
+        """
+        if self._color_stages_are_neutral(include_curves=include_curves):
+            return None
+
+        tone = self.params.tone
+        contrast_mean: Optional[float] = None
+        if tone.contrast:
+            if buffer is None:
+                contrast_mean = 0.5
+            else:
+                contrast_mean = round(buffer.statistic("contrast_mean", lambda: self._sample_contrast_mean(buffer)), 4)
+
+        size = self._COLOR_LUT_SIZE
+        key = fingerprint(
+            size,
+            self.params.white_balance,
+            self.params.calibration,
+            {name: getattr(tone, name) for name in self._TONE_POINTWISE_FIELDS},
+            self.params.curves if include_curves else None,
+            contrast_mean,
+        )
+        if self._color_lut_cache is not None and self._color_lut_cache[0] == key:
+            return self._color_lut_cache[1]
+
+        lattice = _identity_lattice(size)
+        sample = RenderBuffer(rgb=lattice, alpha=np.ones(lattice.shape[:2], dtype=np.float32))
+        sample = self._apply_white_balance(sample)
+        sample = self._apply_calibration(sample)
+        self._apply_tone_exposure(sample.rgb)
+        self._apply_tone_contrast(sample.rgb, mean=contrast_mean)
+        self._apply_tone_regions(sample.rgb)
+        if include_curves:
+            sample = self._apply_curves(sample)
+
+        lut = np.ascontiguousarray(sample.rgb.reshape(size, size, size, 3), dtype=np.float32)
+        self._color_lut_cache = (key, lut)
+        return lut
+
+    def _apply_color_lut(self, buffer: RenderBuffer) -> RenderBuffer:
+        # Clarity and dehaze are spatial, so curves can only join the lattice when
+        # neither sits between tone and curves.
+        fold_curves = not (self.params.tone.clarity or self.params.tone.dehaze)
+        lut = self.compile_color_lut(buffer, include_curves=fold_curves)
+        if lut is not None:
+            buffer.rgb = _apply_lut3d(buffer.rgb, lut)
+        buffer = self._apply_tone_local(buffer)
+        if not fold_curves:
+            buffer = self._apply_curves(buffer)
+        return buffer
+
+    def _color_stages_are_neutral(self, *, include_curves: bool) -> bool:
+        white_balance = self.params.white_balance
+        if abs(float(white_balance.temperature) - 6500.0) > 1e-6 or abs(float(white_balance.tint)) > 1e-6:
+            return False
+        if self._build_calibration_matrix(self.params.calibration) is not None:
+            return False
+        if any(getattr(self.params.tone, name) for name in self._TONE_POINTWISE_FIELDS):
+            return False
+        if include_curves:
+            curves = self.params.curves
+            for points in (curves.rgb_curve, curves.red_curve, curves.green_curve, curves.blue_curve):
+                if any(abs(point.x - point.y) > 1e-6 for point in self._normalize_curve_points(points)):
+                    return False
+        return True
+
+    def _sample_contrast_mean(self, buffer: RenderBuffer) -> float:
+        height, width = buffer.rgb.shape[:2]
+        step = max(1, int(np.sqrt((height * width) / float(self._COLOR_LUT_SAMPLE_PIXELS))))
+        sample = RenderBuffer(
+            rgb=buffer.rgb[::step, ::step].copy(),
+            alpha=buffer.alpha[::step, ::step].copy(),
+        )
+        sample = self._apply_white_balance(sample)
+        sample = self._apply_calibration(sample)
+        self._apply_tone_exposure(sample.rgb)
+        return float(_luma_601(sample.rgb).mean()) if sample.rgb.size else 0.5
 
     @staticmethod
     def _normalize_curve_points(points: Any) -> List[CurvePoint]:
@@ -728,10 +1655,9 @@ class AdjustmentMalayer(TabMalayer):
         frac = indices - lo
         return lut[lo] * (1.0 - frac) + lut[hi] * frac
 
-    def _apply_curves(self, image: Image.Image) -> Image.Image:
+    def _apply_curves(self, buffer: RenderBuffer) -> RenderBuffer:
         curves = self.params.curves
-        alpha = image.getchannel("A")
-        rgb = np.asarray(image.convert("RGB"), dtype=np.float32) / 255.0
+        rgb = buffer.rgb
 
         rgb_lut = self._curve_to_lut(curves.rgb_curve)
         red_lut = self._curve_to_lut(curves.red_curve)
@@ -743,12 +1669,10 @@ class AdjustmentMalayer(TabMalayer):
         rgb[..., 0] = self._apply_lut(rgb[..., 0], red_lut)
         rgb[..., 1] = self._apply_lut(rgb[..., 1], green_lut)
         rgb[..., 2] = self._apply_lut(rgb[..., 2], blue_lut)
+        np.clip(rgb, 0.0, 1.0, out=rgb)
+        return buffer
 
-        result = Image.fromarray((np.clip(rgb, 0.0, 1.0) * 255).astype(np.uint8), mode="RGB").convert("RGBA")
-        result.putalpha(alpha)
-        return result
-
-    def _apply_white_balance(self, image: Image.Image) -> Image.Image:
+    def _apply_white_balance(self, buffer: RenderBuffer) -> RenderBuffer:
         """Apply a lightweight white-balance approximation in RGB space.
 
         Algorithm overview
@@ -758,7 +1682,7 @@ class AdjustmentMalayer(TabMalayer):
         chromatic adaptation matrices, or Planckian-locus fitting. Instead, it uses a
         practical approximation based on per-channel gain scaling:
 
-        1. Convert the image to ``RGB`` and keep alpha aside.
+        1. Work on the float ``RGB`` plane of the render buffer; alpha is untouched.
         2. Compute a normalized temperature offset relative to neutral daylight:
 
            ``temp_shift = (temperature - 6500) / 6500``
@@ -787,7 +1711,7 @@ class AdjustmentMalayer(TabMalayer):
            - cooling does the opposite
            - tint adjusts the green channel to simulate the green↔magenta axis
 
-        5. Clamp the RGB result to ``[0, 255]`` and restore the original alpha.
+        5. Clamp the RGB result to ``[0, 1]``.
 
         Why this works
         --------------
@@ -803,15 +1727,17 @@ class AdjustmentMalayer(TabMalayer):
           behavior rather than scientific correctness.
         - Extreme values may clip highlights/shadows because this is a gain-based edit.
         """
-        rgb = np.asarray(image.convert("RGB"), dtype=np.float32)
         temp_shift = (self.params.white_balance.temperature - 6500.0) / 6500.0
         tint_shift = self.params.white_balance.tint / 150.0
-        rgb[..., 0] *= 1.0 + temp_shift * 0.12
-        rgb[..., 2] *= 1.0 - temp_shift * 0.12
-        rgb[..., 1] *= 1.0 + tint_shift * 0.08
-        out = Image.fromarray(np.clip(rgb, 0, 255).astype(np.uint8), mode="RGB").convert("RGBA")
-        out.putalpha(image.getchannel("A"))
-        return out
+        if abs(temp_shift) < 1e-9 and abs(tint_shift) < 1e-9:
+            return buffer
+        gains = np.asarray(
+            (1.0 + temp_shift * 0.12, 1.0 + tint_shift * 0.08, 1.0 - temp_shift * 0.12),
+            dtype=np.float32,
+        )
+        buffer.rgb *= gains
+        np.clip(buffer.rgb, 0.0, 1.0, out=buffer.rgb)
+        return buffer
 
     @staticmethod
     def _build_calibration_matrix(calibration: CalibrationParams) -> Optional[np.ndarray]:
@@ -860,7 +1786,7 @@ class AdjustmentMalayer(TabMalayer):
         calibrated_primaries = [white + (chroma - mean_chroma) for chroma in adjusted_chromas]
         return np.stack(calibrated_primaries, axis=1).astype(np.float32)
 
-    def _apply_calibration(self, image: Image.Image) -> Image.Image:
+    def _apply_calibration(self, buffer: RenderBuffer) -> RenderBuffer:
         """Approximate camera-primary calibration with a white-preserving 3×3 matrix.
 
         The panel controls adjust the red/green/blue primaries in a chromatic plane:
@@ -874,97 +1800,149 @@ class AdjustmentMalayer(TabMalayer):
         """
         matrix = self._build_calibration_matrix(self.params.calibration)
         if matrix is None:
-            return image
+            return buffer
 
-        rgba = _pil_to_float_array(image)
-        rgb = np.clip(rgba[..., :3], 0.0, 1.0)
+        rgb = np.clip(buffer.rgb, 0.0, 1.0)
         linear_rgb = np.power(rgb, 2.2).astype(np.float32)
         calibrated = np.matmul(linear_rgb, matrix.T)
-        rgba[..., :3] = np.power(np.clip(calibrated, 0.0, 1.0), 1.0 / 2.2).astype(np.float32)
-        return _float_array_to_pil(rgba)
+        buffer.rgb = np.power(np.clip(calibrated, 0.0, 1.0), 1.0 / 2.2).astype(np.float32)
+        return buffer
+
+    def _apply_tone(self, buffer: RenderBuffer) -> RenderBuffer:
+        self._apply_tone_exposure(buffer.rgb)
+        if self.params.tone.contrast:
+            self._apply_tone_contrast(buffer.rgb, mean=buffer.statistic("contrast_mean", lambda: _mean_luma(buffer.rgb)))
+        self._apply_tone_regions(buffer.rgb)
+        return self._apply_tone_local(buffer)
 
-    def _apply_tone(self, image: Image.Image) -> Image.Image:
+    def _apply_tone_exposure(self, rgb: np.ndarray) -> None:
         tone = self.params.tone
-        result = image
         if tone.exposure:
-            result = ImageEnhance.Brightness(result).enhance(float(2 ** _clamp(tone.exposure, -5.0, 5.0)))
+            rgb *= np.float32(2 ** _clamp(tone.exposure, -5.0, 5.0))
+            np.clip(rgb, 0.0, 1.0, out=rgb)
         if tone.brightness:
-            result = ImageEnhance.Brightness(result).enhance(max(0.0, 1.0 + tone.brightness / 200.0))
+            rgb *= np.float32(max(0.0, 1.0 + tone.brightness / 200.0))
+            np.clip(rgb, 0.0, 1.0, out=rgb)
+
+    def _apply_tone_contrast(self, rgb: np.ndarray, *, mean: Optional[float] = None) -> None:
+        tone = self.params.tone
         if tone.contrast:
-            result = ImageEnhance.Contrast(result).enhance(max(0.0, 1.0 + tone.contrast / 100.0))
-
-        alpha = result.getchannel("A")
-        rgb = np.asarray(result.convert("RGB"), dtype=np.float32) / 255.0
-        luminance = (
-            rgb[..., 0:1] * 0.2126
-            + rgb[..., 1:2] * 0.7152
-            + rgb[..., 2:3] * 0.0722
-        )
+            _enhance_contrast(rgb, max(0.0, 1.0 + tone.contrast / 100.0), mean=mean)
 
-        def apply_tonal_region(mask: np.ndarray, amount: float, strength: float) -> None:
-            nonlocal rgb
-            if not amount:
-                return
-            scaled = _clamp(amount / 100.0, -1.0, 1.0) * strength
-            if scaled >= 0:
-                rgb = rgb + (1.0 - rgb) * mask * scaled
-            else:
-                rgb = rgb * (1.0 + mask * scaled)
-
-        if tone.highlights:
-            apply_tonal_region(_smoothstep(0.45, 1.0, luminance), tone.highlights, 0.45)
-        if tone.shadows:
-            apply_tonal_region(1.0 - _smoothstep(0.0, 0.55, luminance), tone.shadows, 0.55)
-        if tone.whites:
-            apply_tonal_region(_smoothstep(0.72, 1.0, luminance), tone.whites, 0.35)
-        if tone.blacks:
-            apply_tonal_region(1.0 - _smoothstep(0.0, 0.28, luminance), tone.blacks, 0.40)
-
-        result = Image.fromarray((np.clip(rgb, 0.0, 1.0) * 255).astype(np.uint8), mode="RGB").convert("RGBA")
-        result.putalpha(alpha)
+    def _apply_tone_regions(self, rgb: np.ndarray) -> None:
+        tone = self.params.tone
+        if tone.highlights or tone.shadows or tone.whites or tone.blacks:
+            luminance = (
+                rgb[..., 0:1] * 0.2126
+                + rgb[..., 1:2] * 0.7152
+                + rgb[..., 2:3] * 0.0722
+            )
+
+            def apply_tonal_region(mask: np.ndarray, amount: float, strength: float) -> None:
+                nonlocal rgb
+                if not amount:
+                    return
+                scaled = np.float32(_clamp(amount / 100.0, -1.0, 1.0) * strength)
+                if scaled >= 0:
+                    rgb += (1.0 - rgb) * (mask * scaled)
+                else:
+                    rgb *= 1.0 + mask * scaled
+
+            if tone.highlights:
+                apply_tonal_region(_smoothstep(0.45, 1.0, luminance), tone.highlights, 0.45)
+            if tone.shadows:
+                apply_tonal_region(1.0 - _smoothstep(0.0, 0.55, luminance), tone.shadows, 0.55)
+            if tone.whites:
+                apply_tonal_region(_smoothstep(0.72, 1.0, luminance), tone.whites, 0.35)
+            if tone.blacks:
+                apply_tonal_region(1.0 - _smoothstep(0.0, 0.28, luminance), tone.blacks, 0.40)
+            np.clip(rgb, 0.0, 1.0, out=rgb)
+
+    def _apply_tone_local(self, buffer: RenderBuffer) -> RenderBuffer:
+        tone = self.params.tone
+        rgb = buffer.rgb
         if tone.clarity:
             clarity_strength = _clamp(tone.clarity / 100.0, -1.0, 1.0)
             if clarity_strength > 0:
-                detail = result.filter(ImageFilter.DETAIL)
-                result = composite_images(result, detail, BlendMode.OVERLAY, clarity_strength * 0.6, None)
+                detail = np.clip(_convolve_3x3(rgb, _DETAIL_KERNEL), 0.0, 1.0)
+                opacity = np.float32(clarity_strength * 0.6)
+                blended = _blend_rgb(rgb, detail, BlendMode.OVERLAY)
             else:
-                softened = result.filter(ImageFilter.GaussianBlur(radius=abs(clarity_strength) * 2.4))
-                result = composite_images(result, softened, BlendMode.NORMAL, abs(clarity_strength) * 0.5, None)
+                opacity = np.float32(abs(clarity_strength) * 0.5)
+                blended = _gaussian_blur_array(rgb, abs(clarity_strength) * 2.4)
+            rgb *= 1.0 - opacity
+            rgb += blended * opacity
+            np.clip(rgb, 0.0, 1.0, out=rgb)
         if tone.dehaze:
             dehaze_strength = _clamp(tone.dehaze / 100.0, -1.0, 1.0)
             if dehaze_strength > 0:
-                result = ImageEnhance.Contrast(result).enhance(1.0 + dehaze_strength * 0.55)
-                result = ImageEnhance.Color(result).enhance(1.0 + dehaze_strength * 0.18)
+                _enhance_contrast(
+                    rgb,
+                    1.0 + dehaze_strength * 0.55,
+                    mean=buffer.statistic("dehaze_mean", lambda: _mean_luma(rgb)),
+                )
+                _enhance_color(rgb, 1.0 + dehaze_strength * 0.18)
             else:
                 fog_strength = abs(dehaze_strength)
-                fog_layer = Image.new("RGBA", result.size, (236, 240, 245, int(round(255 * fog_strength * 0.22))))
-                result = Image.alpha_composite(result, fog_layer)
-                result = ImageEnhance.Contrast(result).enhance(max(0.0, 1.0 - fog_strength * 0.22))
-        return result
-
-    def _apply_hsl(self, image: Image.Image) -> Image.Image:
+                fog_alpha = np.float32(round(255 * fog_strength * 0.22) / 255.0)
+                fog_color = np.asarray((236.0, 240.0, 245.0), dtype=np.float32) / 255.0
+                source_weight = buffer.alpha * (1.0 - fog_alpha)
+                out_alpha = source_weight + fog_alpha
+                rgb *= source_weight[..., None]
+                rgb += fog_color * fog_alpha
+                rgb /= np.maximum(out_alpha, 1e-6)[..., None]
+                buffer.alpha = out_alpha
+                _enhance_contrast(
+                    rgb,
+                    max(0.0, 1.0 - fog_strength * 0.22),
+                    mean=buffer.statistic("fog_mean", lambda: _mean_luma(rgb)),
+                )
+        return buffer
+
+    def _apply_hsl(self, buffer: RenderBuffer) -> RenderBuffer:
+        domain = _HLSDomain(buffer.rgb)
+        self._hsl_in_domain(domain)
+        buffer.rgb = domain.rgb()
+        return buffer
+
+    def _apply_color_editor(self, buffer: RenderBuffer) -> RenderBuffer:
+        domain = _HLSDomain(buffer.rgb)
+        self._color_editor_in_domain(domain)
+        buffer.rgb = domain.rgb()
+        return buffer
+
+    def _apply_color_grading(self, buffer: RenderBuffer) -> RenderBuffer:
+        domain = _HLSDomain(buffer.rgb)
+        self._color_grading_in_domain(domain)
+        buffer.rgb = domain.rgb()
+        return buffer
+
+    def _apply_hls_block(self, buffer: RenderBuffer) -> RenderBuffer:
+        """Run HSL, colour editor and colour grading on one shared :class:`_HLSDomain`."""
+        domain = _HLSDomain(buffer.rgb)
+        self._hsl_in_domain(domain)
+        self._color_editor_in_domain(domain)
+        self._color_grading_in_domain(domain)
+        buffer.rgb = domain.rgb()
+        return buffer
+
+    def _hsl_in_domain(self, domain: "_HLSDomain") -> None:
         hsl = self.params.hsl
-        result = image
-        if hsl.saturation:
-            result = ImageEnhance.Color(result).enhance(max(0.0, 1.0 + hsl.saturation / 100.0))
-
-        arr = np.asarray(result.convert("RGB"), dtype=np.float32) / 255.0
-        if hsl.vibrance:
-            mean = arr.mean(axis=2, keepdims=True)
-            saturation = arr.max(axis=2, keepdims=True) - arr.min(axis=2, keepdims=True)
-            boost = (1.0 - saturation) * (hsl.vibrance / 100.0) * 0.5
-            arr = arr + (arr - mean) * boost
+        if hsl.saturation or hsl.vibrance:
+            arr = domain.rgb()
+            if hsl.saturation:
+                _enhance_color(arr, max(0.0, 1.0 + hsl.saturation / 100.0))
+            if hsl.vibrance:
+                mean = arr.mean(axis=2, keepdims=True)
+                saturation = arr.max(axis=2, keepdims=True) - arr.min(axis=2, keepdims=True)
+                boost = (1.0 - saturation) * np.float32(hsl.vibrance / 100.0 * 0.5)
+                arr += (arr - mean) * boost
+                np.clip(arr, 0.0, 1.0, out=arr)
+            domain.set_rgb(arr)
         if hsl.hue:
-            arr = self._apply_global_hue(arr, hsl.hue)
-        arr = self._apply_selective_hsl(arr)
-
-        result = Image.fromarray((np.clip(arr, 0.0, 1.0) * 255).astype(np.uint8), mode="RGB").convert("RGBA")
-        result.putalpha(image.getchannel("A"))
-        return result
-
-    def _apply_global_hue(self, arr: np.ndarray, hue_shift: float) -> np.ndarray:
-        hue, lightness, saturation = _rgb_to_hls_array(arr)
-        return _hls_to_rgb_array(hue + hue_shift / 360.0, lightness, saturation)
+            hue, lightness, saturation = domain.hls()
+            domain.set_hls(hue + np.float32(hsl.hue / 360.0), lightness, saturation)
+        self._apply_selective_hsl(domain)
 
     @staticmethod
     def _build_hsl_band_mask(hue: np.ndarray, center: float, half_width: float) -> np.ndarray:
@@ -973,7 +1951,7 @@ class AdjustmentMalayer(TabMalayer):
         inner_band = outer_band * 0.55
         return np.clip(1.0 - _smoothstep(inner_band, outer_band, distance), 0.0, 1.0)
 
-    def _apply_selective_hsl(self, arr: np.ndarray) -> np.ndarray:
+    def _apply_selective_hsl(self, domain: "_HLSDomain") -> None:
         adjustments: list[tuple[HSLColorParams, float, float]] = []
         for color_name, center_degrees, half_width_degrees in self._HSL_COLOR_BANDS:
             color_params = self._coerce_hsl_color_params(getattr(self.params.hsl, color_name, None))
@@ -984,9 +1962,9 @@ class AdjustmentMalayer(TabMalayer):
                 adjustments.append((color_params, center_degrees / 360.0, half_width_degrees / 360.0))
 
         if not adjustments:
-            return arr
+            return
 
-        hue, lightness, saturation = _rgb_to_hls_array(arr)
+        hue, lightness, saturation = domain.hls()
         hue_delta = np.zeros_like(hue)
         saturation_scale = np.ones_like(saturation)
         lightness_delta = np.zeros_like(lightness)
@@ -997,9 +1975,9 @@ class AdjustmentMalayer(TabMalayer):
             saturation_scale *= np.clip(1.0 + (float(color_params.saturation) / 100.0) * influence, 0.0, 4.0)
             lightness_delta += (float(color_params.luminance) / 200.0) * influence
 
-        return _hls_to_rgb_array(hue + hue_delta, lightness + lightness_delta, saturation * saturation_scale)
+        domain.set_hls(hue + hue_delta, lightness + lightness_delta, saturation * saturation_scale)
 
-    def _apply_color_editor(self, image: Image.Image) -> Image.Image:
+    def _color_editor_in_domain(self, domain: "_HLSDomain") -> None:
         color_editor = self.params.color_editor
         if not any(
             abs(float(value)) > 1e-6
@@ -1009,10 +1987,9 @@ class AdjustmentMalayer(TabMalayer):
                 color_editor.luminance_shift,
             )
         ):
-            return image
+            return
 
-        rgb = np.asarray(image.convert("RGB"), dtype=np.float32) / 255.0
-        hue, lightness, saturation = _rgb_to_hls_array(rgb)
+        hue, lightness, saturation = domain.hls()
 
         target_hue = (float(color_editor.hue) % 360.0) / 360.0
         target_saturation = _clamp(float(color_editor.saturation) / 100.0, 0.0, 1.0)
@@ -1039,16 +2016,13 @@ class AdjustmentMalayer(TabMalayer):
             color_weight = hue_weight * 0.72 + saturation_weight * 0.28
         influence = np.clip(color_weight * lightness_weight, 0.0, 1.0)
 
-        shifted_hue = hue + (float(color_editor.hue_shift) / 360.0) * influence
-        shifted_saturation = saturation + (float(color_editor.saturation_shift) / 100.0) * influence
-        shifted_lightness = lightness + (float(color_editor.luminance_shift) / 200.0) * influence
-
-        adjusted_rgb = _hls_to_rgb_array(shifted_hue, shifted_lightness, shifted_saturation)
-        result = Image.fromarray((adjusted_rgb * 255.0).astype(np.uint8), mode="RGB").convert("RGBA")
-        result.putalpha(image.getchannel("A"))
-        return result
+        domain.set_hls(
+            hue + (float(color_editor.hue_shift) / 360.0) * influence,
+            lightness + (float(color_editor.luminance_shift) / 200.0) * influence,
+            saturation + (float(color_editor.saturation_shift) / 100.0) * influence,
+        )
 
-    def _apply_color_grading(self, image: Image.Image) -> Image.Image:
+    def _color_grading_in_domain(self, domain: "_HLSDomain") -> None:
         color_grading = self.params.color_grading
         grading_values = (
             color_grading.shadows_hue,
@@ -1062,56 +2036,48 @@ class AdjustmentMalayer(TabMalayer):
             color_grading.highlights_luminance,
         )
         if not any(abs(float(value)) > 1e-6 for value in grading_values):
-            return image
-
-        rgba = _pil_to_float_array(image)
-        rgb = rgba[..., :3]
-        hue, lightness, saturation = _rgb_to_hls_array(rgb)
+            return
 
+        lightness = domain.hls()[1]
         shadows_mask = 1.0 - _smoothstep(0.18, 0.52, lightness)
         highlights_mask = _smoothstep(0.48, 0.82, lightness)
         midtones_mask = np.clip((1.0 - shadows_mask) * (1.0 - highlights_mask), 0.0, 1.0)
-
-        tinted_rgb = rgb.copy()
-        lightness_delta = np.zeros_like(lightness, dtype=np.float32)
-
         region_masks = {
             "shadows": shadows_mask.astype(np.float32),
             "midtones": midtones_mask.astype(np.float32),
             "highlights": highlights_mask.astype(np.float32),
         }
 
+        # Tinting is a blend in RGB, so it is the one step here that leaves the HLS domain.
+        tinted_rgb: Optional[np.ndarray] = None
+        lightness_delta = np.zeros_like(lightness, dtype=np.float32)
         for region, mask in region_masks.items():
             region_saturation = _clamp(float(getattr(color_grading, f"{region}_saturation")) / 100.0, 0.0, 1.0)
             if region_saturation > 1e-6:
-                tint_hue = np.full_like(lightness, (float(getattr(color_grading, f"{region}_hue")) % 360.0) / 360.0)
-                tint_lightness = np.full_like(lightness, 0.5)
-                tint_saturation = np.full_like(lightness, 1.0)
-                tint_rgb = _hls_to_rgb_array(tint_hue, tint_lightness, tint_saturation)
+                tint_hue = (float(getattr(color_grading, f"{region}_hue")) % 360.0) / 360.0
+                tint_rgb = np.asarray(colorsys.hls_to_rgb(tint_hue, 0.5, 1.0), dtype=np.float32)
                 blend_amount = (mask * np.float32(region_saturation * 0.55))[..., None]
-                tinted_rgb = tinted_rgb * (1.0 - blend_amount) + tint_rgb * blend_amount
+                if tinted_rgb is None:
+                    tinted_rgb = domain.rgb().copy()
+                tinted_rgb *= 1.0 - blend_amount
+                tinted_rgb += tint_rgb * blend_amount
 
             region_luminance = _clamp(float(getattr(color_grading, f"{region}_luminance")) / 100.0, -1.0, 1.0)
             if abs(region_luminance) > 1e-6:
                 lightness_delta += mask * np.float32(region_luminance * 0.18)
 
-        graded_hue, graded_lightness, graded_saturation = _rgb_to_hls_array(tinted_rgb)
-        graded_lightness = np.clip(graded_lightness + lightness_delta, 0.0, 1.0)
-        graded_rgb = _hls_to_rgb_array(graded_hue, graded_lightness, graded_saturation)
+        if tinted_rgb is not None:
+            domain.set_rgb(tinted_rgb)
+        if lightness_delta.any():
+            hue, graded_lightness, saturation = domain.hls()
+            domain.set_hls(hue, graded_lightness + lightness_delta, saturation)
 
-        result = rgba.copy()
-        result[..., :3] = graded_rgb
-        return _float_array_to_pil(result)
-
-    def _apply_detail(self, image: Image.Image) -> Image.Image:
+    def _apply_detail(self, buffer: RenderBuffer) -> RenderBuffer:
         detail = self.params.detail
-        result = image
         if detail.luminance_noise > 0:
             noise_strength = _clamp(float(detail.luminance_noise), 0.0, 100.0)
-            alpha = result.getchannel("A")
             if cv2 is not None:
-                rgb = np.asarray(result.convert("RGB"), dtype=np.uint8)
-                ycrcb = cv2.cvtColor(rgb, cv2.COLOR_RGB2YCrCb)
+                ycrcb = cv2.cvtColor(np.clip(buffer.rgb, 0.0, 1.0), cv2.COLOR_RGB2YCrCb)
                 y_channel, cr_channel, cb_channel = cv2.split(ycrcb)
 
                 sigma_color = 12.0 + noise_strength * 0.85
@@ -1119,7 +2085,7 @@ class AdjustmentMalayer(TabMalayer):
                 y_filtered = cv2.bilateralFilter(
                     y_channel,
                     d=0,
-                    sigmaColor=sigma_color,
+                    sigmaColor=sigma_color / 255.0,
                     sigmaSpace=sigma_space,
                 )
 
@@ -1128,192 +2094,307 @@ class AdjustmentMalayer(TabMalayer):
                     cr_channel = cv2.GaussianBlur(cr_channel, (0, 0), sigmaX=chroma_blur)
                     cb_channel = cv2.GaussianBlur(cb_channel, (0, 0), sigmaX=chroma_blur)
 
-                denoised_rgb = cv2.cvtColor(
+                buffer.rgb = cv2.cvtColor(
                     cv2.merge((y_filtered, cr_channel, cb_channel)),
                     cv2.COLOR_YCrCb2RGB,
                 )
-                result = Image.fromarray(denoised_rgb, mode="RGB").convert("RGBA")
-                result.putalpha(alpha)
             else:
-                ycbcr = result.convert("YCbCr")
-                y_channel, cb_channel, cr_channel = ycbcr.split()
-                y_channel = y_channel.filter(
-                    ImageFilter.GaussianBlur(radius=_clamp(noise_strength / 24.0, 0.0, 4.0))
-                )
+                # Luma/chroma split: blurring the colour differences is the same
+                # linear operation as blurring Cb/Cr in YCbCr space.
+                luma = _luma_601(buffer.rgb)
+                chroma = buffer.rgb - luma[..., None]
+                luma = _gaussian_blur_array(luma, _clamp(noise_strength / 24.0, 0.0, 4.0))
                 chroma_radius = _clamp(noise_strength / 48.0, 0.0, 2.0)
                 if chroma_radius > 0:
-                    cb_channel = cb_channel.filter(ImageFilter.GaussianBlur(radius=chroma_radius))
-                    cr_channel = cr_channel.filter(ImageFilter.GaussianBlur(radius=chroma_radius))
-                result = Image.merge("YCbCr", (y_channel, cb_channel, cr_channel)).convert("RGBA")
-                result.putalpha(alpha)
+                    chroma = _gaussian_blur_array(chroma, chroma_radius)
+                buffer.rgb = chroma + luma[..., None]
+            np.clip(buffer.rgb, 0.0, 1.0, out=buffer.rgb)
         if detail.sharpen_amount > 0:
-            sharpen_strength = _clamp(float(detail.sharpen_amount), 0.0, 100.0)
-            radius = float(detail.sharpen_radius) if detail.sharpen_radius > 0 else (0.6 + sharpen_strength / 80.0)
-            threshold = int(round(detail.sharpen_threshold)) if detail.sharpen_threshold > 0 else int(round(sharpen_strength / 30.0))
-            percent = int(round(60 + sharpen_strength * 2.4))
-            result = result.filter(
-                ImageFilter.UnsharpMask(
-                    radius=_clamp(radius, 0.4, 2.2),
-                    percent=max(0, percent),
-                    threshold=max(0, threshold),
-                )
-            )
-        return result
+            sigma, threshold, percent = self._sharpen_settings()
+            rgb = buffer.rgb
+            difference = rgb - _gaussian_blur_array(rgb, sigma)
+            if threshold > 0:
+                difference *= np.abs(difference) >= np.float32(threshold / 255.0)
+            rgb += difference * np.float32(max(0, percent) / 100.0)
+            np.clip(rgb, 0.0, 1.0, out=rgb)
+        return buffer
+
+    def _sharpen_settings(self) -> tuple[float, int, int]:
+        """Return the unsharp mask ``(sigma, threshold, percent)`` for the detail params."""
+        detail = self.params.detail
+        sharpen_strength = _clamp(float(detail.sharpen_amount), 0.0, 100.0)
+        radius = float(detail.sharpen_radius) if detail.sharpen_radius > 0 else (0.6 + sharpen_strength / 80.0)
+        threshold = int(round(detail.sharpen_threshold)) if detail.sharpen_threshold > 0 else int(round(sharpen_strength / 30.0))
+        percent = int(round(60 + sharpen_strength * 2.4))
+        return _clamp(radius, 0.4, 2.2), threshold, percent
 
-    def _apply_geometry(self, image: Image.Image) -> Image.Image:
+    def _apply_geometry(self, buffer: RenderBuffer) -> RenderBuffer:
         geometry = self.params.geometry
-        result = image
-        if cv2 is not None and (geometry.horizontal or geometry.vertical):
-            width, height = result.size
-            max_x_shift = width * 0.35
-            max_y_shift = height * 0.35
-
-            horizontal = _clamp(float(geometry.horizontal) / 100.0, -1.0, 1.0)
-            vertical = _clamp(float(geometry.vertical) / 100.0, -1.0, 1.0)
-
-            top_left = [0.0, 0.0]
-            top_right = [float(width - 1), 0.0]
-            bottom_left = [0.0, float(height - 1)]
-            bottom_right = [float(width - 1), float(height - 1)]
-
-            if abs(vertical) > 1e-6:
-                shift_x = abs(vertical) * max_x_shift
-                if vertical > 0:
-                    top_left[0] += shift_x
-                    top_right[0] -= shift_x
-                else:
-                    bottom_left[0] += shift_x
-                    bottom_right[0] -= shift_x
-
-            if abs(horizontal) > 1e-6:
-                shift_y = abs(horizontal) * max_y_shift
-                if horizontal > 0:
-                    top_left[1] += shift_y
-                    bottom_left[1] -= shift_y
-                else:
-                    top_right[1] += shift_y
-                    bottom_right[1] -= shift_y
-
-            src = np.array(
-                [
-                    [0.0, 0.0],
-                    [float(width - 1), 0.0],
-                    [0.0, float(height - 1)],
-                    [float(width - 1), float(height - 1)],
-                ],
-                dtype=np.float32,
+        region = buffer.region
+        full_size = buffer.full_size
+        target = region.target if region is not None else TileBox.from_size(full_size)
+        warp = self._geometry_warp(full_size, target)
+        if warp is not None:
+            buffer = self._remap_geometry(buffer, warp)
+        elif buffer.box != target:
+            buffer = buffer.crop(target)
+        if region is not None:
+            buffer.region = RenderRegion(
+                full_size=region.full_size,
+                source=target,
+                target=target,
+                statistics=region.statistics,
             )
-            dst = np.array([top_left, top_right, bottom_left, bottom_right], dtype=np.float32)
-            matrix = cv2.getPerspectiveTransform(src, dst)
-            warped = cv2.warpPerspective(
-                np.asarray(_ensure_rgba(result), dtype=np.uint8),
-                matrix,
-                (width, height),
-                flags=cv2.INTER_CUBIC,
-                borderMode=cv2.BORDER_CONSTANT,
-                borderValue=(0, 0, 0, 0),
-            )
-            result = Image.fromarray(warped, mode="RGBA")
-        if cv2 is not None and geometry.distortion:
-            result = self._apply_lens_distortion(result, float(geometry.distortion))
-        if cv2 is not None and geometry.chromatic_aberration:
-            result = self._apply_chromatic_aberration(result, float(geometry.chromatic_aberration))
-        if geometry.rotation:
-            result = result.rotate(-geometry.rotation, resample=Image.Resampling.BICUBIC, expand=False)
-        if geometry.scale and geometry.scale != 100:
-            width, height = result.size
-            scaled_w = max(1, int(width * geometry.scale / 100.0))
-            scaled_h = max(1, int(height * geometry.scale / 100.0))
-            scaled = result.resize((scaled_w, scaled_h), Image.Resampling.LANCZOS)
-            canvas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-            offset_x = (width - scaled_w) // 2 + int(geometry.offset_x)
-            offset_y = (height - scaled_h) // 2 + int(geometry.offset_y)
-            canvas.alpha_composite(scaled, (offset_x, offset_y))
-            result = canvas
         if geometry.vignette:
-            result = self._apply_vignette(
-                result,
+            buffer = self._apply_vignette(
+                buffer,
                 amount=float(geometry.vignette),
                 midpoint=float(geometry.vignette_midpoint),
             )
-        return result
+        return buffer
+
+    def _perspective_matrix(self, full_size: tuple[int, int]) -> Optional[np.ndarray]:
+        """Homography of the vertical/horizontal keystone correction, or ``None`` when neutral."""
+        geometry = self.params.geometry
+        horizontal = _clamp(float(geometry.horizontal) / 100.0, -1.0, 1.0)
+        vertical = _clamp(float(geometry.vertical) / 100.0, -1.0, 1.0)
+        if abs(horizontal) <= 1e-6 and abs(vertical) <= 1e-6:
+            return None
+
+        width, height = full_size
+        top_left = [0.0, 0.0]
+        top_right = [float(width - 1), 0.0]
+        bottom_left = [0.0, float(height - 1)]
+        bottom_right = [float(width - 1), float(height - 1)]
+
+        if abs(vertical) > 1e-6:
+            shift_x = abs(vertical) * width * 0.35
+            if vertical > 0:
+                top_left[0] += shift_x
+                top_right[0] -= shift_x
+            else:
+                bottom_left[0] += shift_x
+                bottom_right[0] -= shift_x
+
+        if abs(horizontal) > 1e-6:
+            shift_y = abs(horizontal) * height * 0.35
+            if horizontal > 0:
+                top_left[1] += shift_y
+                bottom_left[1] -= shift_y
+            else:
+                top_right[1] += shift_y
+                bottom_right[1] -= shift_y
+
+        src = ((0.0, 0.0), (float(width - 1), 0.0), (0.0, float(height - 1)), (float(width - 1), float(height - 1)))
+        dst = (top_left, top_right, bottom_left, bottom_right)
+        system = np.zeros((8, 8), dtype=np.float64)
+        values = np.zeros(8, dtype=np.float64)
+        for index, ((x, y), (u, v)) in enumerate(zip(src, dst)):
+            system[index] = (x, y, 1.0, 0.0, 0.0, 0.0, -u * x, -u * y)
+            system[index + 4] = (0.0, 0.0, 0.0, x, y, 1.0, -v * x, -v * y)
+            values[index] = u
+            values[index + 4] = v
+        return np.append(np.linalg.solve(system, values), 1.0).reshape(3, 3)
+
+    def _geometry_warp(self, full_size: tuple[int, int], target: TileBox) -> Optional[_GeometryWarp]:
+        """Compiled sampling maps for ``target``, cached in :attr:`geometry_cache`.
+
+        The key covers the warp fields of :class:`GeometryParams`, the frame size
+        and the output box, so edits to other sections (or to the vignette) reuse
+        the maps, and :meth:`source_region` and :meth:`_apply_geometry` share one
+        build per tile. Returns ``None`` when the geometry is the identity.
+        """
+        geometry = self.params.geometry
+        key = fingerprint(
+            "geometry",
+            {name: getattr(geometry, name) for name in self._WARP_FIELDS},
+            tuple(full_size),
+            target.as_tuple(),
+        )
+        warp = self.geometry_cache.get(key)
+        if warp is not None:
+            return warp
+        maps = self._geometry_maps(full_size, target)
+        if maps is None:
+            return None
+        source = self._geometry_source_box(maps)
+        shrink = self._geometry_shrink()
+        if shrink < 1.0 and not source.is_empty():
+            source = source.expand(len(_lowpass_kernel(shrink)) // 2)
+        warp = _GeometryWarp(maps=maps, source=source, shrink=shrink)
+        self.geometry_cache.put(key, warp, warp.nbytes)
+        return warp
+
+    def _geometry_maps(
+        self,
+        full_size: tuple[int, int],
+        target: TileBox,
+    ) -> Optional[Dict[str, tuple[np.ndarray, np.ndarray]]]:
+        """Full-frame sampling coordinates for every pixel of ``target``.
+
+        Perspective, lens distortion, chromatic aberration, rotation and scale are
+        composed into one inverse mapping, walked backwards from the output, so the
+        image is resampled once and the source area of any output tile is known
+        up front. ``"base"`` drives green and alpha; ``"red"`` and ``"blue"`` are
+        present when chromatic aberration shifts those channels. Pixels that fall
+        outside the frame at any step map to ``-2``. Coordinates are composed in
+        float32, which keeps them within a thousandth of a pixel on frames of
+        several thousand pixels. Returns ``None`` when the geometry is the identity.
+        """
+        geometry = self.params.geometry
+        width, height = full_size
+        perspective = self._perspective_matrix(full_size)
+        distortion = _clamp(float(geometry.distortion) / 100.0, -1.0, 1.0) * 0.35
+        aberration = _clamp(float(geometry.chromatic_aberration) / 100.0, -1.0, 1.0) * 0.03
+        rotation = float(geometry.rotation)
+        scale = float(geometry.scale) if geometry.scale else 100.0
+        if perspective is None and not distortion and not aberration and not rotation and scale == 100.0:
+            return None
+
+        # Rows and columns stay separate 1-D arrays until rotation mixes them.
+        x = np.arange(target.left, target.right, dtype=np.float32)[None, :]
+        y = np.arange(target.top, target.bottom, dtype=np.float32)[:, None]
+        valid = np.ones((target.height, target.width), dtype=bool)
+        half_x = np.float32(max(width - 1, 1) / 2.0)
+        half_y = np.float32(max(height - 1, 1) / 2.0)
+
+        def inside(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+            return (x >= -0.5) & (x <= width - 0.5) & (y >= -0.5) & (y <= height - 0.5)
+
+        if scale != 100.0:
+            scaled_w = max(1, int(width * scale / 100.0))
+            scaled_h = max(1, int(height * scale / 100.0))
+            u = x - np.float32((width - scaled_w) // 2 + int(geometry.offset_x))
+            v = y - np.float32((height - scaled_h) // 2 + int(geometry.offset_y))
+            valid &= (u >= 0) & (u < scaled_w) & (v >= 0) & (v < scaled_h)
+            x = (u + np.float32(0.5)) * np.float32(width / scaled_w) - np.float32(0.5)
+            y = (v + np.float32(0.5)) * np.float32(height / scaled_h) - np.float32(0.5)
+
+        if rotation:
+            angle = np.deg2rad(-rotation)
+            cos, sin = np.float32(np.cos(angle)), np.float32(np.sin(angle))
+            dx = x - np.float32((width - 1) / 2.0)
+            dy = y - np.float32((height - 1) / 2.0)
+            x = cos * dx - sin * dy
+            x += np.float32((width - 1) / 2.0)
+            y = sin * dx + cos * dy
+            y += np.float32((height - 1) / 2.0)
+            valid &= inside(x, y)
+
+        channels = {"base": (x, y)}
+        if aberration:
+            x_norm = x / half_x - np.float32(1.0)
+            y_norm = y / half_y - np.float32(1.0)
+            radius_sq = x_norm * x_norm + y_norm * y_norm
+            radius_sq *= np.float32(aberration)
+            delta_x = x_norm * radius_sq
+            delta_y = y_norm * radius_sq
+            for key, sign in (("red", 1.0), ("blue", -1.0)):
+                channels[key] = (
+                    self._reflect_coordinates((x + np.float32(sign) * delta_x * half_x), width),
+                    self._reflect_coordinates((y + np.float32(sign) * delta_y * half_y), height),
+                )
+
+        if distortion:
+            for key, (channel_x, channel_y) in channels.items():
+                x_norm = channel_x / half_x - np.float32(1.0)
+                y_norm = channel_y / half_y - np.float32(1.0)
+                factor = x_norm * x_norm + y_norm * y_norm
+                factor *= np.float32(distortion)
+                factor += np.float32(1.0)
+                channels[key] = ((x_norm * factor + np.float32(1.0)) * half_x, (y_norm * factor + np.float32(1.0)) * half_y)
+            valid &= inside(*channels["base"])
+
+        if perspective is not None:
+            inverse = np.linalg.inv(perspective).astype(np.float32)
+            for key, (channel_x, channel_y) in channels.items():
+                denominator = inverse[2, 0] * channel_x + inverse[2, 1] * channel_y + inverse[2, 2]
+                denominator[np.abs(denominator) < 1e-12] = 1e-12
+                channels[key] = (
+                    (inverse[0, 0] * channel_x + inverse[0, 1] * channel_y + inverse[0, 2]) / denominator,
+                    (inverse[1, 0] * channel_x + inverse[1, 1] * channel_y + inverse[1, 2]) / denominator,
+                )
+            valid &= inside(*channels["base"])
+
+        return {
+            key: (
+                np.where(valid, channel_x, np.float32(-2.0)),
+                np.where(valid, channel_y, np.float32(-2.0)),
+            )
+            for key, (channel_x, channel_y) in channels.items()
+        }
+
+    def _geometry_shrink(self) -> float:
+        """Output pixels per input pixel when the scale is below 100%, else 1.
+
+        The maps then step through the input faster than one pixel per output
+        pixel, so detail finer than the output grid has to be filtered out first.
+        """
+        scale = float(self.params.geometry.scale) if self.params.geometry.scale else 100.0
+        return _clamp(scale / 100.0, 0.01, 1.0)
 
     @staticmethod
-    def _normalized_coordinate_grid(width: int, height: int) -> tuple[np.ndarray, np.ndarray]:
-        x_coords = np.linspace(-1.0, 1.0, num=max(1, width), dtype=np.float32)
-        y_coords = np.linspace(-1.0, 1.0, num=max(1, height), dtype=np.float32)
-        return np.meshgrid(x_coords, y_coords)
+    def _reflect_coordinates(values: np.ndarray, length: int) -> np.ndarray:
+        """Fold coordinates back into ``[0, length - 1]`` like ``BORDER_REFLECT_101``."""
+        last = max(length - 1, 1)
+        folded = np.abs(np.mod(values, 2 * last))
+        return np.where(folded > last, 2 * last - folded, folded)
 
     @staticmethod
-    def _normalized_to_pixel_map(x_norm: np.ndarray, y_norm: np.ndarray, width: int, height: int) -> tuple[np.ndarray, np.ndarray]:
-        map_x = ((x_norm + 1.0) * 0.5 * max(width - 1, 1)).astype(np.float32)
-        map_y = ((y_norm + 1.0) * 0.5 * max(height - 1, 1)).astype(np.float32)
-        return map_x, map_y
-
-    def _apply_lens_distortion(self, image: Image.Image, amount: float) -> Image.Image:
-        if cv2 is None:
-            return image
-        width, height = image.size
-        rgba = np.asarray(_ensure_rgba(image), dtype=np.uint8)
-        x_norm, y_norm = self._normalized_coordinate_grid(width, height)
-        radius_sq = x_norm * x_norm + y_norm * y_norm
-        strength = _clamp(amount / 100.0, -1.0, 1.0) * 0.35
-        scale = 1.0 + strength * radius_sq
-        map_x, map_y = self._normalized_to_pixel_map(x_norm * scale, y_norm * scale, width, height)
-        warped = cv2.remap(
-            rgba,
-            map_x,
-            map_y,
-            interpolation=cv2.INTER_CUBIC,
-            borderMode=cv2.BORDER_CONSTANT,
-            borderValue=(0, 0, 0, 0),
-        )
-        return Image.fromarray(warped, mode="RGBA")
-
-    def _apply_chromatic_aberration(self, image: Image.Image, amount: float) -> Image.Image:
-        if cv2 is None:
-            return image
-        width, height = image.size
-        rgba = np.asarray(_ensure_rgba(image), dtype=np.uint8)
-        x_norm, y_norm = self._normalized_coordinate_grid(width, height)
-        radius_sq = x_norm * x_norm + y_norm * y_norm
-        shift = _clamp(amount / 100.0, -1.0, 1.0) * 0.03
-        delta_x = x_norm * radius_sq * shift
-        delta_y = y_norm * radius_sq * shift
-
-        red_x, red_y = self._normalized_to_pixel_map(x_norm + delta_x, y_norm + delta_y, width, height)
-        green_x, green_y = self._normalized_to_pixel_map(x_norm, y_norm, width, height)
-        blue_x, blue_y = self._normalized_to_pixel_map(x_norm - delta_x, y_norm - delta_y, width, height)
-
-        remapped = np.empty_like(rgba)
-        remapped[..., 0] = cv2.remap(
-            rgba[..., 0],
-            red_x,
-            red_y,
-            interpolation=cv2.INTER_LINEAR,
-            borderMode=cv2.BORDER_REFLECT101,
-        )
-        remapped[..., 1] = cv2.remap(
-            rgba[..., 1],
-            green_x,
-            green_y,
-            interpolation=cv2.INTER_LINEAR,
-            borderMode=cv2.BORDER_REFLECT101,
-        )
-        remapped[..., 2] = cv2.remap(
-            rgba[..., 2],
-            blue_x,
-            blue_y,
-            interpolation=cv2.INTER_LINEAR,
-            borderMode=cv2.BORDER_REFLECT101,
+    def _geometry_source_box(maps: Dict[str, tuple[np.ndarray, np.ndarray]]) -> TileBox:
+        """Smallest box of input pixels the cubic resampling of ``maps`` reads."""
+        left = top = np.inf
+        right = bottom = -np.inf
+        for map_x, map_y in maps.values():
+            valid = map_x > -2.0
+            if not valid.any():
+                continue
+            left = min(left, float(map_x[valid].min()))
+            right = max(right, float(map_x[valid].max()))
+            top = min(top, float(map_y[valid].min()))
+            bottom = max(bottom, float(map_y[valid].max()))
+        if left > right:
+            return TileBox(0, 0, 0, 0)
+        return TileBox(
+            int(np.floor(left)) - 1,
+            int(np.floor(top)) - 1,
+            int(np.floor(right)) + 3,
+            int(np.floor(bottom)) + 3,
         )
-        remapped[..., 3] = rgba[..., 3]
-        return Image.fromarray(remapped, mode="RGBA")
 
-    def _apply_vignette(self, image: Image.Image, *, amount: float, midpoint: float) -> Image.Image:
-        rgba = _pil_to_float_array(image)
-        width, height = image.size
-        x_norm, y_norm = self._normalized_coordinate_grid(width, height)
+    @staticmethod
+    def _remap_geometry(buffer: RenderBuffer, warp: _GeometryWarp) -> RenderBuffer:
+        box = buffer.box
+        maps = warp.maps
+
+        def local(key: str) -> tuple[np.ndarray, np.ndarray]:
+            # The buffer box lies inside the frame, so shifting keeps the -2
+            # sentinel outside the buffer as well.
+            map_x, map_y = maps[key]
+            if box.left:
+                map_x = map_x - np.float32(box.left)
+            if box.top:
+                map_y = map_y - np.float32(box.top)
+            return map_x, map_y
+
+        source = buffer.rgba()
+        if warp.shrink < 1.0:
+            source = _lowpass_array(source, warp.shrink)
+        warped = _remap_array(source, *local("base"))
+        for channel, key in ((0, "red"), (2, "blue")):
+            if key in maps:
+                warped[..., channel] = _remap_array(np.ascontiguousarray(source[..., channel]), *local(key))
+        return RenderBuffer.from_rgba(np.clip(warped, 0.0, 1.0))
+
+    @staticmethod
+    def _normalized_coordinate_grid(box: TileBox, full_size: tuple[int, int]) -> tuple[np.ndarray, np.ndarray]:
+        width, height = full_size
+        x_coords = np.arange(box.left, box.right, dtype=np.float32) * np.float32(2.0 / max(width - 1, 1)) - 1.0
+        y_coords = np.arange(box.top, box.bottom, dtype=np.float32) * np.float32(2.0 / max(height - 1, 1)) - 1.0
+        return np.meshgrid(x_coords, y_coords)
+
+    def _apply_vignette(self, buffer: RenderBuffer, *, amount: float, midpoint: float) -> RenderBuffer:
+        x_norm, y_norm = self._normalized_coordinate_grid(buffer.box, buffer.full_size)
         radius = np.sqrt(x_norm * x_norm + y_norm * y_norm)
         radius = radius / max(float(np.sqrt(2.0)), 1e-6)
 
@@ -1322,16 +2403,30 @@ class AdjustmentMalayer(TabMalayer):
         strength = _clamp(amount / 100.0, -1.0, 1.0)
 
         if strength >= 0:
-            gain = 1.0 - falloff[..., None] * strength * 0.9
+            gain = 1.0 - falloff[..., None] * np.float32(strength * 0.9)
         else:
-            gain = 1.0 + falloff[..., None] * abs(strength) * 0.45
+            gain = 1.0 + falloff[..., None] * np.float32(abs(strength) * 0.45)
 
-        rgba[..., :3] = np.clip(rgba[..., :3] * gain, 0.0, 1.0)
-        return _float_array_to_pil(rgba)
+        buffer.rgb *= gain
+        np.clip(buffer.rgb, 0.0, 1.0, out=buffer.rgb)
+        return buffer
 
     def _serialize_payload(self) -> Dict[str, Any]:
         return asdict(self.params)
 
+    def _restore_payload(self, payload: Dict[str, Any], keys: Iterable[str]) -> None:
+        # Serialized params are already normalized, so they bypass update_section's UI mappings.
+        for section in keys:
+            values = payload.get(section)
+            if not isinstance(values, dict) or not hasattr(self.params, section):
+                continue
+            target = getattr(self.params, section)
+            if section == "curves":
+                for name, points in values.items():
+                    setattr(target, name, [CurvePoint(**item) for item in points])
+            else:
+                self._merge_param_mapping(target, values)
+
     @classmethod
     def _from_dict(cls, data: Dict[str, Any]) -> "AdjustmentMalayer":
         payload = data.get("payload", {})
@@ -1446,9 +2541,22 @@ class FilterMalayer(TabMalayer):
             return out
         return image.copy()
 
+    def tile_halo(self) -> int:
+        if self.filter_name == "blur":
+            return _gaussian_halo(max(0.1, max(0.0, self.intensity) * 3.0))
+        if self.filter_name == "sharpen":
+            return _gaussian_halo(2.0)
+        if self.filter_name in {"detail", "emboss"}:
+            return 1
+        return 0
+
     def _serialize_payload(self) -> Dict[str, Any]:
         return {"filter_name": self.filter_name, "intensity": self.intensity}
 
+    def _restore_payload(self, payload: Dict[str, Any], keys: Iterable[str]) -> None:
+        self.filter_name = payload.get("filter_name", self.filter_name)
+        self.intensity = payload.get("intensity", self.intensity)
+
     @classmethod
     def _from_dict(cls, data: Dict[str, Any]) -> "FilterMalayer":
         payload = data.get("payload", {})
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+import os
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+
+@dataclass(frozen=True)
+class SharedImageHandle:
+    """Picklable reference to a source published in a :class:`SharedPixelStore`.
+
+    ``block_name`` is the shared memory block holding the full-resolution
+    RGBA8 pixels, ``width`` by ``height``.
+    """
+
+    image_path: str
+    mtime_ns: int
+    block_name: str
+    width: int
+    height: int
+
+    @property
+    def key(self) -> Tuple[str, int]:
+        return (self.image_path, self.mtime_ns)
+
+
+def _shared_image(block: shared_memory.SharedMemory, width: int, height: int) -> Image.Image:
+    """Read-only RGBA image over ``block``; no pixels are copied.
+
+    The image holds an export of ``block.buf`` itself, so closing the block
+    fails with :class:`BufferError` while the image is alive instead of
+    unmapping pixels it still reads. (An ``np.ndarray(buffer=...)`` in between
+    would not hold one.)
+    """
+    return Image.frombuffer("RGBA", (width, height), block.buf, "raw", "RGBA", 0, 1)
+
+
+def _source_key(image_path: str) -> Tuple[str, int]:
+    path = os.path.abspath(image_path)
+    return (path, os.stat(path).st_mtime_ns)
+
+
+def _close_block(block: shared_memory.SharedMemory) -> bool:
+    try:
+        block.close()
+    except BufferError:
+        # An image over the block is still alive somewhere in this process.
+        return False
+    return True
+
+
+@dataclass
+class _Entry:
+    handle: SharedImageHandle
+    block: shared_memory.SharedMemory
+    refs: int = 0
+
+
+class SharedPixelView:
+    """A consumer's attachment to a published source: a zero-copy image over the shared block.
+
+    Raises :class:`FileNotFoundError` when the source was released before the
+    view attached; the caller then decodes from ``image_path`` itself. Drop
+    :attr:`image` and everything taken from it before calling :meth:`close`.
+    """
+
+    def __init__(self, handle: SharedImageHandle) -> None:
+        self.handle = handle
+        self._blocks: List[shared_memory.SharedMemory] = [shared_memory.SharedMemory(name=handle.block_name)]
+        self.image: Optional[Image.Image] = _shared_image(self._blocks[0], handle.width, handle.height)
+
+    def close(self) -> None:
+        self.image = None
+        self._blocks = [block for block in self._blocks if not _close_block(block)]
+
+
+class SharedPixelStore:
+    """Decoded sources in named shared memory, so the editor's worker processes share one copy.
+
+    The owning process writes a source's full-resolution RGBA pixels into a
+    shared memory block once with :meth:`publish` and gives the resulting
+    :class:`SharedImageHandle` to worker processes, which attach through
+    :class:`SharedPixelView`; each consumer's TLImage reduces the pyramid
+    levels it needs from that image on demand. The block is written outside
+    the store's lock, so :meth:`publish` can run on a background thread while
+    the GUI thread acquires and releases other handles. Each :meth:`publish`
+    or :meth:`acquire` counts a reference and each :meth:`release` drops
+    one; the block is unlinked when the last reference goes, or on
+    :meth:`close`.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, int], _Entry] = {}
+        # Blocks unlinked while an image over them was still alive; closed on a later release.
+        self._retired: List[shared_memory.SharedMemory] = []
+        self._lock = Lock()
+
+    def publish(self, image_path: str, source: Optional[Image.Image] = None) -> SharedImageHandle:
+        """Write ``image_path`` into shared memory, or reuse it if already published, and take a reference.
+
+        ``source`` is the already decoded RGBA image of ``image_path``;
+        without it the file is decoded here.
+        """
+        key = _source_key(image_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refs += 1
+                return entry.handle
+        created = self._create(*key, source)
+        with self._lock:
+            entry = self._entries.setdefault(key, created)
+            entry.refs += 1
+            if entry is not created:
+                # Published meanwhile from another thread.
+                self._destroy(created)
+            return entry.handle
+
+    def acquire(self, handle: SharedImageHandle) -> None:
+        with self._lock:
+            self._entries[handle.key].refs += 1
+
+    def release(self, handle: SharedImageHandle) -> None:
+        with self._lock:
+            entry = self._entries.get(handle.key)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs <= 0:
+                del self._entries[handle.key]
+                self._destroy(entry)
+
+    def refcount(self, handle: SharedImageHandle) -> int:
+        with self._lock:
+            entry = self._entries.get(handle.key)
+            return entry.refs if entry is not None else 0
+
+    def close(self) -> None:
+        """Unlink every block regardless of references; for shutdown."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            for entry in entries:
+                self._destroy(entry)
+
+    def _create(self, image_path: str, mtime_ns: int, source: Optional[Image.Image] = None) -> _Entry:
+        if source is None:
+            source = Image.open(image_path).convert("RGBA")
+        block = shared_memory.SharedMemory(create=True, size=max(1, source.width * source.height * 4))
+        try:
+            np.ndarray((source.height, source.width, 4), dtype=np.uint8, buffer=block.buf)[:] = np.asarray(source)
+        except BaseException:
+            block.close()
+            block.unlink()
+            raise
+        return _Entry(SharedImageHandle(image_path, mtime_ns, block.name, source.width, source.height), block)
+
+    def _destroy(self, entry: _Entry) -> None:
+        entry.block.unlink()
+        if not _close_block(entry.block):
+            self._retired.append(entry.block)
+        self._retired = [block for block in self._retired if not _close_block(block)]
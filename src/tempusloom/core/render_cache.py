@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Optional
+
+
+class RenderCache:
+    """Thread-safe LRU mapping bounded by the byte size of its values.
+
+    Callers pass the size of each value explicitly, so the cache can hold NumPy
+    buffers, PIL images or anything else the render pipeline wants to keep. A
+    value larger than the whole budget is never stored, and setting the budget to
+    ``0`` disables the cache.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._entries: "OrderedDict[Hashable, tuple[Any, int]]" = OrderedDict()
+        self._lock = Lock()
+        self._max_bytes = max(0, int(max_bytes))
+        self._total_bytes = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int) -> None:
+        with self._lock:
+            self._max_bytes = max(0, int(value))
+            self._evict_locked()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def fits(self, nbytes: int) -> bool:
+        return 0 < int(nbytes) <= self._max_bytes
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: int) -> bool:
+        nbytes = max(0, int(nbytes))
+        with self._lock:
+            if not 0 < nbytes <= self._max_bytes:
+                return False
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            self._entries[key] = (value, nbytes)
+            self._total_bytes += nbytes
+            self._evict_locked()
+            return True
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _evict_locked(self) -> None:
+        while self._entries and self._total_bytes > self._max_bytes:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._total_bytes -= nbytes
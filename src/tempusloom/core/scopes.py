@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Dict, Sequence
+
+import numpy as np
+from PIL import Image
+
+from .histogram import LUMA_WEIGHTS, sample_rgb
+
+SCOPE_KINDS = ("waveform", "parade", "vectorscope")
+_DENSITY_MAX = np.iinfo(np.uint16).max
+
+
+def _density(indices: np.ndarray, size: int) -> np.ndarray:
+    counts = np.bincount(indices.ravel(), minlength=size)
+    return np.minimum(counts, _DENSITY_MAX).astype(np.uint16)
+
+
+def _column_indices(width: int, columns: int) -> np.ndarray:
+    return np.arange(width, dtype=np.int32) * columns // max(width, 1)
+
+
+def _level_rows(values: np.ndarray, levels: int) -> np.ndarray:
+    """Row of each 8-bit value in a ``levels``-tall plot, 255 at the top."""
+    return (levels - 1) - (values.astype(np.int32) * levels >> 8)
+
+
+def waveform(rgb: np.ndarray, *, columns: int = 128, levels: int = 128) -> np.ndarray:
+    """Luma waveform of an ``HxWx3`` uint8 image: a ``levels x columns`` count of pixels per image column and luma level."""
+    red, green, blue = (rgb[:, :, index].astype(np.int32) for index in range(3))
+    luma = (red * LUMA_WEIGHTS[0] + green * LUMA_WEIGHTS[1] + blue * LUMA_WEIGHTS[2] + 128) >> 8
+    indices = _level_rows(luma, levels) * columns + _column_indices(rgb.shape[1], columns)[None, :]
+    return _density(indices, levels * columns).reshape(levels, columns)
+
+
+def parade(rgb: np.ndarray, *, columns: int = 128, levels: int = 128) -> np.ndarray:
+    """RGB parade: the red, green and blue waveforms side by side, ``levels x 3 * columns``."""
+    stride = 3 * columns
+    column_indices = _column_indices(rgb.shape[1], columns)[None, :]
+    # Channel by channel: each plane is contiguous, where the interleaved HxWx3 broadcast is not.
+    indices = np.stack(
+        [_level_rows(rgb[:, :, channel], levels) * stride + (column_indices + channel * columns) for channel in range(3)]
+    )
+    return _density(indices, levels * stride).reshape(levels, stride)
+
+
+def vectorscope(rgb: np.ndarray, *, size: int = 128) -> np.ndarray:
+    """Rec. 601 Cb (x, left to right) by Cr (y, bottom to top) density, ``size x size`` with neutral at the centre."""
+    red, green, blue = (rgb[:, :, index].astype(np.int32) for index in range(3))
+    # Integer Cb/Cr offset by 128, in 0..255.
+    cb = (-43 * red - 85 * green + 128 * blue + 32895) >> 8
+    cr = (128 * red - 107 * green - 21 * blue + 32895) >> 8
+    indices = _level_rows(cr, size) * size + (cb * size >> 8)
+    return _density(indices, size * size).reshape(size, size)
+
+
+def compute_scopes(
+    image: Image.Image | np.ndarray,
+    kinds: Sequence[str] = SCOPE_KINDS,
+    *,
+    sample_max_dimension: int = 480,
+    columns: int = 128,
+    levels: int = 128,
+) -> Dict[str, np.ndarray]:
+    """uint16 density images of ``image`` for each of ``kinds``, keyed by kind.
+
+    ``image`` is sampled with :func:`~tempusloom.core.histogram.sample_rgb`,
+    as :func:`~tempusloom.core.histogram.compute_histogram` samples it; each scope is then one ``np.bincount`` over flattened
+    (row, column) indices. Counts saturate at 65535. The vectorscope is
+    ``levels`` square.
+    """
+    unknown = [kind for kind in kinds if kind not in SCOPE_KINDS]
+    if unknown:
+        raise ValueError(f"Unknown scope kind(s): {', '.join(unknown)}")
+    rgb = sample_rgb(image, sample_max_dimension)
+    columns = max(1, int(columns))
+    levels = min(max(1, int(levels)), 256)
+    scopes: Dict[str, np.ndarray] = {}
+    if "waveform" in kinds:
+        scopes["waveform"] = waveform(rgb, columns=columns, levels=levels)
+    if "parade" in kinds:
+        scopes["parade"] = parade(rgb, columns=columns, levels=levels)
+    if "vectorscope" in kinds:
+        scopes["vectorscope"] = vectorscope(rgb, size=levels)
+    return scopes
@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import contextvars
+import os
+from pathlib import Path
+import struct
+import tempfile
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+import zlib
+
+import numpy as np
+from PIL import Image
+
+from .malayer import Malayer, RenderBuffer, RenderRegion, TileBox, raise_if_cancelled
+
+DEFAULT_TILE_SIZE = 512
+DEFAULT_PROXY_DIMENSION = 1024
+
+
+def default_worker_count() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def tile_grid(
+    size: tuple[int, int],
+    tile_size: int = DEFAULT_TILE_SIZE,
+    area: Optional[TileBox] = None,
+) -> List[List[TileBox]]:
+    """Split ``area`` (the whole of ``size`` by default) into rows (bands) of tiles of at most ``tile_size`` pixels."""
+    area = (area or TileBox.from_size(size)).clip(size)
+    step = max(16, int(tile_size))
+    return [
+        [
+            TileBox(left, top, min(area.right, left + step), min(area.bottom, top + step))
+            for left in range(area.left, area.right, step)
+        ]
+        for top in range(area.top, area.bottom, step)
+    ]
+
+
+class TiledRenderer:
+    """Render a malayer stack at full resolution one tile at a time.
+
+    For every output tile the stack is walked backwards once to find the area
+    each layer needs (``Malayer.source_region`` adds the halo of spatial filters
+    and follows geometry remaps), then forwards to render just those areas. Only
+    the 8-bit source and a few tile-sized float buffers are alive at any time,
+    so peak memory does not grow with the float working set of the image.
+
+    Statistics that must be image-wide (contrast pivots, for example) and mask
+    rasters are prepared once in :meth:`prepare` from a proxy of the frame.
+
+    Tiles are independent, so with ``workers > 1`` they are rendered on a thread
+    pool; NumPy, OpenCV and Pillow release the GIL inside their kernels. Bands
+    are still delivered in order and the number of tiles in flight is capped, so
+    memory stays bounded however far the pool could run ahead.
+    """
+
+    def __init__(
+        self,
+        source: Image.Image,
+        malayers: Sequence[Malayer],
+        *,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        proxy_dimension: int = DEFAULT_PROXY_DIMENSION,
+        workers: Optional[int] = None,
+    ) -> None:
+        self.source = source
+        self.size = source.size
+        self.malayers = list(malayers)
+        self.tile_size = max(16, int(tile_size))
+        self.proxy_dimension = max(1, int(proxy_dimension))
+        self.workers = max(1, int(workers)) if workers is not None else default_worker_count()
+        self._statistics: Dict[str, Dict[str, float]] = {}
+        self._masks: Dict[str, np.ndarray] = {}
+        self._prepared = False
+
+    def prepare(self) -> None:
+        if self._prepared:
+            return
+        factor = max(1, -(-max(self.size) // self.proxy_dimension))
+        proxy_image = self.source.reduce(factor) if factor > 1 else self.source
+        proxy = RenderBuffer.from_pil(proxy_image)
+        for layer in self.malayers:
+            if layer.mask is not None and layer.visible:
+                self._masks[layer.id] = layer.mask.to_array(self.size)
+            region = RenderRegion.full_frame(proxy.size)
+            proxy = layer.render_tile(proxy, region, mask_alpha=self._proxy_mask(layer, proxy.size))
+            self._statistics[layer.id] = region.statistics
+        self._prepared = True
+
+    def tiles(self, area: Optional[TileBox] = None) -> List[List[TileBox]]:
+        return tile_grid(self.size, self.tile_size, area)
+
+    def render_tile(self, box: TileBox) -> RenderBuffer:
+        self.prepare()
+        regions: List[RenderRegion] = []
+        target = box
+        for layer in reversed(self.malayers):
+            source = layer.source_region(target, self.size) if layer.visible else target
+            regions.append(
+                RenderRegion(
+                    full_size=self.size,
+                    source=source,
+                    target=target,
+                    statistics=self._statistics.setdefault(layer.id, {}),
+                )
+            )
+            target = source
+        regions.reverse()
+
+        buffer = RenderBuffer.from_pil(self.source.crop(target.as_tuple()))
+        for layer, region in zip(self.malayers, regions):
+            buffer = layer.render_tile(buffer, region, mask_alpha=self._mask_alpha(layer, region.target))
+        return buffer
+
+    def iter_bands(
+        self,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        *,
+        area: Optional[TileBox] = None,
+    ) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield ``(top, rgba8)`` for each band of tiles spanning ``area`` (the whole frame by default), top to bottom.
+
+        ``progress_callback(done, total)`` is called on the calling thread after
+        every finished tile. A cancelled render stops there and inside the tiles
+        already running, which see the caller's
+        :func:`~tempusloom.core.malayer.render_cancellation` check; tiles still queued on the pool are dropped.
+        """
+        self.prepare()
+        bands = self.tiles(area)
+        total = sum(len(band) for band in bands)
+        if self.workers <= 1:
+            done = 0
+            for band in bands:
+                pieces = []
+                for box in band:
+                    raise_if_cancelled()
+                    pieces.append(self.render_tile(box).to_rgba8())
+                    done += 1
+                    if progress_callback is not None:
+                        progress_callback(done, total)
+                yield band[0].top, np.concatenate(pieces, axis=1)
+            return
+
+        queue = [(band_index, column, box) for band_index, band in enumerate(bands) for column, box in enumerate(band)]
+        limit = max(2 * self.workers, 2 * max(len(band) for band in bands))
+        pending: Dict[Future, tuple[int, int]] = {}
+        finished: Dict[int, Dict[int, np.ndarray]] = {}
+        submitted = done = outstanding = next_band = 0
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tempusloom-tile")
+        try:
+            while next_band < len(bands):
+                while submitted < len(queue) and outstanding < limit:
+                    band_index, column, box = queue[submitted]
+                    # Run each tile in a copy of the caller's context so the
+                    # render_cancellation check reaches the workers; a context
+                    # cannot be entered by two threads at once, hence one per tile.
+                    task = pool.submit(contextvars.copy_context().run, self._render_tile_rgba8, box)
+                    pending[task] = (band_index, column)
+                    submitted += 1
+                    outstanding += 1
+                completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                raise_if_cancelled()
+                for future in completed:
+                    band_index, column = pending.pop(future)
+                    finished.setdefault(band_index, {})[column] = future.result()
+                    done += 1
+                    if progress_callback is not None:
+                        progress_callback(done, total)
+                while next_band < len(bands) and len(finished.get(next_band, ())) == len(bands[next_band]):
+                    pieces = finished.pop(next_band)
+                    outstanding -= len(pieces)
+                    yield bands[next_band][0].top, np.concatenate([pieces[column] for column in range(len(pieces))], axis=1)
+                    next_band += 1
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def render_frame(
+        self,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        *,
+        area: Optional[TileBox] = None,
+    ) -> np.ndarray:
+        """Render every tile of ``area`` (the whole frame by default) into one ``HxWx4`` 8-bit frame.
+
+        Spatial stages read their halo from outside ``area``, so a crop renders
+        exactly as the same pixels of a full-frame render.
+        """
+        area = (area or TileBox.from_size(self.size)).clip(self.size)
+        frame = np.empty((area.height, area.width, 4), dtype=np.uint8)
+        for top, band in self.iter_bands(progress_callback, area=area):
+            frame[top - area.top:top - area.top + band.shape[0]] = band
+        return frame
+
+    def _render_tile_rgba8(self, box: TileBox) -> np.ndarray:
+        return self.render_tile(box).to_rgba8()
+
+    def _mask_alpha(self, layer: Malayer, box: TileBox) -> Optional[np.ndarray]:
+        raster = self._masks.get(layer.id)
+        if raster is None:
+            return None
+        rows, columns = box.slices_within(TileBox.from_size(self.size))
+        return raster[rows, columns].astype(np.float32) * np.float32(1.0 / 255.0)
+
+    @staticmethod
+    def _proxy_mask(layer: Malayer, size: tuple[int, int]) -> Optional[np.ndarray]:
+        if layer.mask is None or not layer.visible:
+            return None
+        return layer.mask.to_array(size).astype(np.float32) / 255.0
+
+
+class _PngBandWriter:
+    """Stream 8-bit RGB(A) bands into a PNG file as they are rendered."""
+
+    _SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+    def __init__(self, path: Path, size: tuple[int, int], *, alpha: bool, compress_level: int = 6) -> None:
+        self.size = size
+        self.channels = 4 if alpha else 3
+        self._handle = open(path, "wb")
+        self._compressor = zlib.compressobj(compress_level)
+        self._previous_row = np.zeros(size[0] * self.channels, dtype=np.uint8)
+        self._handle.write(self._SIGNATURE)
+        width, height = size
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6 if alpha else 2, 0, 0, 0))
+
+    def write(self, band: np.ndarray, rows_per_chunk: int = 64) -> None:
+        band = band[..., : self.channels]
+        for start in range(0, band.shape[0], rows_per_chunk):
+            rows = np.ascontiguousarray(band[start:start + rows_per_chunk]).reshape(-1, self.size[0] * self.channels)
+            data = self._compressor.compress(self._filter_rows(rows))
+            if data:
+                self._write_chunk(b"IDAT", data)
+
+    def close(self) -> None:
+        self._write_chunk(b"IDAT", self._compressor.flush())
+        self._write_chunk(b"IEND", b"")
+        self._handle.close()
+
+    def abort(self) -> None:
+        self._handle.close()
+
+    def _filter_rows(self, rows: np.ndarray) -> bytes:
+        """Apply the per-row adaptive PNG filter (minimum sum of absolute differences)."""
+        bpp = self.channels
+        current = rows.astype(np.int16)
+        above = np.vstack((self._previous_row[None, :], rows[:-1])).astype(np.int16)
+        left = np.zeros_like(current)
+        left[:, bpp:] = current[:, :-bpp]
+        upper_left = np.zeros_like(current)
+        upper_left[:, bpp:] = above[:, :-bpp]
+
+        estimate = left + above - upper_left
+        distance_left = np.abs(estimate - left)
+        distance_above = np.abs(estimate - above)
+        distance_upper_left = np.abs(estimate - upper_left)
+        paeth = np.where(
+            (distance_left <= distance_above) & (distance_left <= distance_upper_left),
+            left,
+            np.where(distance_above <= distance_upper_left, above, upper_left),
+        )
+        candidates = np.stack(
+            (
+                current,
+                current - left,
+                current - above,
+                current - ((left + above) >> 1),
+                current - paeth,
+            )
+        ).astype(np.uint8)
+        signed = candidates.view(np.int8).astype(np.int16)
+        choice = np.abs(signed).sum(axis=2).argmin(axis=0)
+
+        out = np.empty((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+        out[:, 0] = choice
+        out[:, 1:] = candidates[choice, np.arange(rows.shape[0])]
+        self._previous_row = rows[-1].copy()
+        return out.tobytes()
+
+    def _write_chunk(self, kind: bytes, data: bytes) -> None:
+        self._handle.write(struct.pack(">I", len(data)))
+        self._handle.write(kind)
+        self._handle.write(data)
+        self._handle.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)) & 0xFFFFFFFF))
+
+
+class _MappedFrameWriter:
+    """Collect bands in a disk-backed frame and hand it to Pillow's encoder.
+
+    Pillow encoders need the whole image, so formats other than PNG go through a
+    memory-mapped temporary file instead of a heap allocation; the pages are
+    written once and can be reclaimed by the OS while the encoder reads them.
+    """
+
+    def __init__(self, size: tuple[int, int], *, alpha: bool) -> None:
+        self.size = size
+        self.alpha = alpha
+        self._file = tempfile.TemporaryFile(prefix="tempusloom-render-")
+        width, height = size
+        self._frame = np.memmap(self._file, dtype=np.uint8, mode="w+", shape=(height, width, 4))
+
+    def write(self, top: int, band: np.ndarray) -> None:
+        self._frame[top:top + band.shape[0]] = band
+        if not self.alpha:
+            self._frame[top:top + band.shape[0], :, 3] = 255
+
+    def save(self, path: Path, format: Optional[str]) -> None:
+        mode = "RGBA" if self.alpha else "RGBX"
+        Image.frombuffer(mode, self.size, self._frame, "raw", mode, 0, 1).save(path, format=format)
+
+    def close(self) -> None:
+        del self._frame
+        self._file.close()
+
+
+def render_tiled_to_path(
+    source: Image.Image,
+    malayers: Sequence[Malayer],
+    output_path: str | Path,
+    *,
+    format: Optional[str] = None,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Path:
+    """Render ``malayers`` over ``source`` tile by tile and encode the result to ``output_path``.
+
+    PNG output is streamed band by band; other formats are assembled in a
+    memory-mapped frame first. JPEG output drops the alpha channel.
+    """
+    output = Path(output_path)
+    resolved_format = (format or Image.registered_extensions().get(output.suffix.lower(), "")).upper()
+    alpha = resolved_format != "JPEG" and output.suffix.lower() not in {".jpg", ".jpeg"}
+    renderer = TiledRenderer(source, malayers, tile_size=tile_size, workers=workers)
+    renderer.prepare()
+
+    if resolved_format == "PNG":
+        writer = _PngBandWriter(output, renderer.size, alpha=alpha)
+        try:
+            for _, band in renderer.iter_bands(progress_callback):
+                writer.write(band)
+        except BaseException:
+            writer.abort()
+            output.unlink(missing_ok=True)
+            raise
+        writer.close()
+        return output
+
+    frame = _MappedFrameWriter(renderer.size, alpha=alpha)
+    try:
+        for top, band in renderer.iter_bands(progress_callback):
+            frame.write(top, band)
+        frame.save(output, format or None)
+    finally:
+        frame.close()
+    return output
+
+
+def render_tiled_image(
+    source: Image.Image,
+    malayers: Sequence[Malayer],
+    *,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Image.Image:
+    """Render ``malayers`` over ``source`` on the tile scheduler and return an RGBA image."""
+    renderer = TiledRenderer(source, malayers, tile_size=tile_size, workers=workers)
+    return Image.fromarray(renderer.render_frame(progress_callback), mode="RGBA")
@@ -1,23 +1,48 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 import json
+import math
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Set
 import uuid
 
 from PIL import Image
 from PIL.ExifTags import TAGS
 import numpy as np
 
-from .malayer import AdjustmentMalayer, BlendMode, EditorTab, Malayer, Mask, filter_malayers_by_tab
+from .fingerprint import fingerprint
+from .histogram import compute_histogram
+from .history import Change, EditHistory
+from .malayer import (
+    AdjustmentMalayer,
+    AdjustmentSection,
+    BlendMode,
+    EditorTab,
+    Malayer,
+    Mask,
+    TileBox,
+    filter_malayers_by_tab,
+    raise_if_cancelled,
+)
+from .render_cache import RenderCache
+from .tiled_render import DEFAULT_TILE_SIZE, TiledRenderer, render_tiled_image, render_tiled_to_path
 
 
 @dataclass
-class HistoryEntry:
-    description: str
-    snapshot: Dict[str, Any]
+class DirtySet:
+    """Adjustment sections and malayer ids whose render inputs changed since the last render."""
+
+    sections: Set[str] = field(default_factory=set)
+    layer_ids: Set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.sections or self.layer_ids)
+
+    def clear(self) -> None:
+        self.sections.clear()
+        self.layer_ids.clear()
 
 
 @dataclass
@@ -30,11 +55,18 @@ class TLImage:
     tags: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
     edit_state: Dict[str, Any] = field(default_factory=dict)
-    _history: List[HistoryEntry] = field(default_factory=list, init=False, repr=False)
-    _history_index: int = field(default=-1, init=False, repr=False)
+    _history: EditHistory = field(default_factory=EditHistory, init=False, repr=False)
     _full_image_cache: Optional[Image.Image] = field(default=None, init=False, repr=False)
-    _preview_image_cache: Optional[Image.Image] = field(default=None, init=False, repr=False)
-    _preview_image_max_dimension: Optional[int] = field(default=None, init=False, repr=False)
+    _pyramid_levels: List[Image.Image] = field(default_factory=list, init=False, repr=False)
+    _preview_cache: RenderCache = field(init=False, repr=False)
+    _layer_cache: RenderCache = field(init=False, repr=False)
+    _dirty: DirtySet = field(default_factory=DirtySet, init=False, repr=False)
+    _layer_fingerprints: Dict[str, tuple[Malayer, str]] = field(default_factory=dict, init=False, repr=False)
+    _synced_state_key: Optional[str] = field(default=None, init=False, repr=False)
+    _region_renderer: Optional[tuple[str, TiledRenderer]] = field(default=None, init=False, repr=False)
+
+    DEFAULT_LAYER_CACHE_BYTES: ClassVar[int] = 192 * 1024 * 1024
+    DEFAULT_PREVIEW_CACHE_BYTES: ClassVar[int] = 64 * 1024 * 1024
 
     _ROOT_KEY_ALIASES = {
         "imagePath": "image_path",
@@ -241,8 +273,16 @@ class TLImage:
         "geometry",
         "calibration",
     )
+    # Params fields an ``adjust`` section writes to, where they are not the same name.
+    _ADJUST_PARAM_FIELDS = {
+        "basic": ("basic", "tone", "hsl"),
+        "lens": ("geometry",),
+        "perspective": ("geometry",),
+    }
 
     def __post_init__(self) -> None:
+        self._layer_cache = RenderCache(self.DEFAULT_LAYER_CACHE_BYTES)
+        self._preview_cache = RenderCache(self.DEFAULT_PREVIEW_CACHE_BYTES)
         if self.name is None:
             self.name = Path(self.image_path).stem
         if not self.metadata:
@@ -281,8 +321,31 @@ class TLImage:
 
     def _invalidate_image_caches(self) -> None:
         self._full_image_cache = None
-        self._preview_image_cache = None
-        self._preview_image_max_dimension = None
+        self._pyramid_levels = []
+        self._preview_cache.clear()
+        self._region_renderer = None
+        self._layer_cache.clear()
+
+    def use_source_levels(self, levels: List[Image.Image]) -> None:
+        """Serve the source from already decoded RGBA ``levels`` instead of decoding ``image_path``.
+
+        ``levels`` is the full-resolution image, e.g. from
+        :class:`SharedPixelView` or :meth:`source_levels`, optionally followed
+        by successive ``reduce(2)`` levels; they are used as they are, without
+        copying, and the smaller levels still missing are reduced on demand.
+        """
+        self._invalidate_image_caches()
+        self._full_image_cache = levels[0]
+        self._pyramid_levels = list(levels)
+
+    def source_levels(self) -> List[Image.Image]:
+        """The decoded source and the ``reduce(2)`` levels built so far, for :meth:`use_source_levels`.
+
+        Empty until the source has been decoded; nothing is decoded here.
+        """
+        if not self._pyramid_levels and self._full_image_cache is not None:
+            self._pyramid_levels.append(self._full_image_cache)
+        return list(self._pyramid_levels)
 
     def _ensure_full_image(self) -> Image.Image:
         if self._full_image_cache is None:
@@ -290,25 +353,58 @@ class TLImage:
         return self._full_image_cache
 
     def _ensure_preview_image(self, max_dimension: Optional[int] = None) -> Image.Image:
+        """The source scaled to fit ``max_dimension``, served from the source pyramid.
+
+        Each size is resampled from the smallest power-of-two level that still
+        covers it, and the result is memoized in a small byte-bounded cache, so
+        consumers asking for different sizes (editor, histogram, thumbnails) do
+        not evict each other or go back to the full-resolution decode.
+        """
         source = self._ensure_full_image()
         if max_dimension is None:
             return source
 
         safe_dimension = max(1, int(max_dimension))
-        if self._preview_image_cache is None or self._preview_image_max_dimension != safe_dimension:
-            width, height = source.size
-            longest_edge = max(width, height)
-            if longest_edge <= safe_dimension:
-                preview = source.copy()
-            else:
-                scale = safe_dimension / float(longest_edge)
-                preview = source.resize(
-                    (max(1, int(round(width * scale))), max(1, int(round(height * scale)))),
-                    Image.Resampling.LANCZOS,
-                )
-            self._preview_image_cache = preview
-            self._preview_image_max_dimension = safe_dimension
-        return self._preview_image_cache
+        width, height = source.size
+        longest_edge = max(width, height)
+        if longest_edge <= safe_dimension:
+            return source
+        scale = safe_dimension / float(longest_edge)
+        size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+        preview = self._preview_cache.get(size)
+        if preview is None:
+            level = self._pyramid_level_for(size)
+            # A level asked for by its own dimension is used as is, whatever the rounding of its short edge.
+            if level.size != size and max(level.size) != safe_dimension:
+                level = level.resize(size, Image.Resampling.LANCZOS)
+            preview = level
+            self._preview_cache.put(size, preview, preview.width * preview.height * len(preview.getbands()))
+        return preview
+
+    def _pyramid_level_for(self, size: tuple[int, int]) -> Image.Image:
+        """Smallest power-of-two reduction of the source that is at least ``size``, built on demand."""
+        if not self._pyramid_levels:
+            self._pyramid_levels.append(self._ensure_full_image())
+        index = 0
+        while True:
+            level = self._pyramid_levels[index]
+            if level.width < 2 * size[0] or level.height < 2 * size[1]:
+                return level
+            if index + 1 == len(self._pyramid_levels):
+                self._pyramid_levels.append(level.reduce(2))
+            index += 1
+
+    def preview_dimension_for(self, display_dimension: float) -> int:
+        """Longest edge of the smallest pyramid level that is at least ``display_dimension``.
+
+        Previews rendered at that ``max_dimension`` come straight from a level,
+        without resampling, and stay valid while the display size moves within
+        the level. The full-resolution edge is the upper bound.
+        """
+        dimension = max(self.image_size())
+        while (dimension + 1) // 2 >= display_dimension and dimension > 1:
+            dimension = (dimension + 1) // 2
+        return dimension
 
     def load_image(self, *, preview: bool = False, max_dimension: Optional[int] = None) -> Image.Image:
         source = self._ensure_preview_image(max_dimension) if preview else self._ensure_full_image()
@@ -322,12 +418,16 @@ class TLImage:
             self.malayers.append(malayer)
         else:
             self.malayers.insert(index, malayer)
+        self._layer_cache.clear()
+        self._dirty.layer_ids.add(malayer.id)
         self._sync_state_from_malayers()
 
     def remove_malayer(self, layer_id: str) -> Malayer:
         for index, malayer in enumerate(self.malayers):
             if malayer.id == layer_id:
                 removed = self.malayers.pop(index)
+                self._layer_cache.clear()
+                self._dirty.layer_ids.add(layer_id)
                 self._sync_state_from_malayers()
                 return removed
         raise KeyError(f"Malayer not found: {layer_id}")
@@ -336,6 +436,8 @@ class TLImage:
         layer = self.remove_malayer(layer_id)
         safe_index = max(0, min(target_index, len(self.malayers)))
         self.malayers.insert(safe_index, layer)
+        self._layer_cache.clear()
+        self._dirty.layer_ids.add(layer_id)
         self._sync_state_from_malayers()
 
     def get_malayer(self, layer_id: str) -> Optional[Malayer]:
@@ -348,6 +450,20 @@ class TLImage:
         layers = self.get_malayers_for_tab(tab)
         return layers[0] if layers else None
 
+    @property
+    def dirty_set(self) -> DirtySet:
+        """What changed since the last :meth:`render_image`; edits add to it and rendering clears it.
+
+        Only edits made through this class are recorded, so malayers must not be
+        changed behind its back: a clean layer's fingerprint is reused.
+        """
+        return self._dirty
+
+    def _clear_dirty(self) -> None:
+        for layer_id in self._dirty.layer_ids:
+            self._layer_fingerprints.pop(layer_id, None)
+        self._dirty.clear()
+
     def render(self) -> Image.Image:
         return self.render_image(preview=False)
 
@@ -357,44 +473,200 @@ class TLImage:
         preview: bool = False,
         max_dimension: Optional[int] = None,
         progress_callback: Optional[Callable[[int, str], None]] = None,
+        workers: Optional[int] = None,
+        region: Optional[tuple[int, int, int, int]] = None,
+        scale: float = 1.0,
     ) -> Image.Image:
-        self._sync_malayers_from_edit_state()
+        """Render the malayer stack.
+
+        With ``region`` (``left, top, right, bottom`` in full-resolution pixels)
+        only that crop is rendered, at ``scale`` times full resolution (capped at
+        1), on the tile scheduler: each layer reads the halo its spatial stages
+        need from outside the crop, so the pixels match a full render. The crop
+        is snapped outwards to whole pixels of the scaled source; the area it
+        covers, in full-resolution coordinates, is stored in ``info["region"]``.
+
+        Previews are rendered as one frame so the per-stage caches of the layers
+        apply, and the output after each layer is kept in a prefix cache keyed on
+        the source and the chain of :meth:`Malayer.render_fingerprint` values up to
+        that layer; a render resumes after the deepest unchanged layer.
+        Full-resolution renders go through the tile scheduler, which uses
+        ``workers`` threads (all cores by default).
+
+        Edits reach the malayers as deltas when they are made, recording the
+        touched sections and layers in :attr:`dirty_set`, so ``edit_state`` is
+        only reapplied in full when it was changed some other way. Only the
+        layers in the dirty set are fingerprinted again for the prefix keys;
+        untouched layers and stages then hit the prefix and stage caches.
+
+        Inside :func:`~tempusloom.core.malayer.render_cancellation` the render
+        stops with ``RenderCancelled`` between layers, stages and tiles once the
+        check fires; the caches keep whatever finished before that.
+        """
+        self._ensure_malayers_synced()
         if progress_callback is not None:
             progress_callback(5, "加载原图…")
-        original = self.load_image(preview=preview, max_dimension=max_dimension)
-        composed = original.copy()
+        if region is not None:
+            return self._render_region(region, scale=scale, workers=workers, progress_callback=progress_callback)
+        if not preview:
+            composed = render_tiled_image(
+                self._ensure_full_image(),
+                self.malayers,
+                workers=workers,
+                progress_callback=self._tile_progress(progress_callback, 10, 75),
+            )
+            self._clear_dirty()
+            if progress_callback is not None:
+                progress_callback(85, "整理图像…")
+            return composed
+
+        # Layers copy their inputs, so the cached preview source can be passed as is.
+        original = self._ensure_preview_image(max_dimension)
+        keys = self._layer_prefix_keys(original, max_dimension)
+        start = 0
+        composed = original
+        for index in range(len(keys) - 1, -1, -1):
+            cached = self._layer_cache.get(keys[index])
+            if cached is not None:
+                start, composed = index + 1, cached
+                break
+
         total_layers = len(self.malayers)
-        for index, malayer in enumerate(self.malayers):
+        for index in range(start, total_layers):
+            raise_if_cancelled()
+            malayer = self.malayers[index]
             if progress_callback is not None:
                 progress = 10 + int((index / max(total_layers, 1)) * 70)
                 progress_callback(progress, f"应用图层：{malayer.name}")
             composed = malayer.render(composed, original_image=original)
+            self._layer_cache.put(keys[index], composed, composed.width * composed.height * len(composed.getbands()))
+        self._clear_dirty()
+        if progress_callback is not None:
+            progress_callback(85, "整理图像…")
+        return composed.copy()
+
+    def _render_region(
+        self,
+        region: tuple[int, int, int, int],
+        *,
+        scale: float,
+        workers: Optional[int],
+        progress_callback: Optional[Callable[[int, str], None]],
+    ) -> Image.Image:
+        full_width, full_height = self.image_size()
+        scale = min(1.0, max(float(scale), 1e-3))
+        source = self._ensure_full_image()
+        if scale < 1.0:
+            source = self._ensure_preview_image(max(1, int(round(max(full_width, full_height) * scale))))
+        factor_x = source.width / full_width
+        factor_y = source.height / full_height
+        left, top, right, bottom = region
+        box = TileBox(
+            int(math.floor(left * factor_x)),
+            int(math.floor(top * factor_y)),
+            int(math.ceil(right * factor_x)),
+            int(math.ceil(bottom * factor_y)),
+        ).clip(source.size)
+        if box.is_empty():
+            raise ValueError(f"Region {region} does not intersect the image")
+
+        key = self._layer_prefix_keys(source, None)
+        renderer_key = fingerprint(key[-1] if key else self.image_path, source.size)
+        if self._region_renderer is None or self._region_renderer[0] != renderer_key:
+            # Keeps the proxy statistics and mask rasters across crops of the same state.
+            self._region_renderer = (renderer_key, TiledRenderer(source, self.malayers, workers=workers))
+        renderer = self._region_renderer[1]
+        frame = renderer.render_frame(self._tile_progress(progress_callback, 10, 75), area=box)
+        self._clear_dirty()
         if progress_callback is not None:
             progress_callback(85, "整理图像…")
+        composed = Image.fromarray(frame, mode="RGBA")
+        composed.info["region"] = (
+            box.left / factor_x,
+            box.top / factor_y,
+            box.right / factor_x,
+            box.bottom / factor_y,
+        )
         return composed
 
+    def _layer_prefix_keys(self, source: Image.Image, max_dimension: Optional[int]) -> List[str]:
+        """Cache key of the composed image after each malayer, chained from the source."""
+        key = fingerprint(self.image_path, source.size, max_dimension)
+        keys: List[str] = []
+        for malayer in self.malayers:
+            key = fingerprint(key, self._layer_fingerprint(malayer))
+            keys.append(key)
+        return keys
+
+    def _layer_fingerprint(self, malayer: Malayer) -> str:
+        """``malayer.render_fingerprint()``, reused for layers that are not in the dirty set.
+
+        Masked layers are always fingerprinted, since their mask file can change
+        on disk without an edit.
+        """
+        if malayer.id in self._dirty.layer_ids or malayer.mask is not None:
+            return malayer.render_fingerprint()
+        memo = self._layer_fingerprints.get(malayer.id)
+        if memo is None or memo[0] is not malayer:
+            memo = self._layer_fingerprints[malayer.id] = (malayer, malayer.render_fingerprint())
+        return memo[1]
+
     def render_to_path(
         self,
         output_path: str,
         *,
         format: Optional[str] = None,
         progress_callback: Optional[Callable[[int, str], None]] = None,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        workers: Optional[int] = None,
     ) -> str:
+        """Render at full resolution tile by tile and encode straight to ``output_path``."""
         output = Path(output_path)
         output.parent.mkdir(parents=True, exist_ok=True)
         if progress_callback is not None:
             progress_callback(0, "准备导出…")
-        image = self.render_image(preview=False, progress_callback=progress_callback)
-        if progress_callback is not None:
-            progress_callback(90, "转换图像格式…")
-        save_image = image.convert("RGB") if output.suffix.lower() in {".jpg", ".jpeg"} else image
+        self._ensure_malayers_synced()
         if progress_callback is not None:
-            progress_callback(95, "写入导出文件…")
-        save_image.save(output, format=format)
+            progress_callback(5, "加载原图…")
+        opened: Optional[Image.Image] = None
+        source = self._full_image_cache
+        if source is None:
+            # Keep the decoded source at 8 bits without caching a full RGBA copy.
+            source = opened = Image.open(self.image_path)
+            if source.mode not in {"RGB", "RGBA"}:
+                source = source.convert("RGBA")
+        try:
+            render_tiled_to_path(
+                source,
+                self.malayers,
+                output,
+                format=format,
+                tile_size=tile_size,
+                workers=workers,
+                progress_callback=self._tile_progress(progress_callback, 10, 85),
+            )
+        finally:
+            if opened is not None:
+                opened.close()
         if progress_callback is not None:
             progress_callback(100, "导出完成")
         return str(output)
 
+    @staticmethod
+    def _tile_progress(
+        progress_callback: Optional[Callable[[int, str], None]],
+        start: int,
+        span: int,
+    ) -> Optional[Callable[[int, int], None]]:
+        """Map per-tile ``(done, total)`` reports onto the ``(percent, message)`` callback."""
+        if progress_callback is None:
+            return None
+
+        def report(done: int, total: int) -> None:
+            progress_callback(start + int(done / max(total, 1) * span), f"渲染分块 {done}/{total}…")
+
+        return report
+
     def apply_json_payload(
         self,
         payload: Dict[str, Any] | str,
@@ -442,38 +714,26 @@ class TLImage:
 
     @staticmethod
     def histogram_from_image(
-        image: Image.Image,
+        image: Image.Image | np.ndarray,
         *,
         bins: int = 128,
         sample_max_dimension: int = 512,
     ) -> Dict[str, List[float]]:
-        working = image.convert("RGB")
-        safe_dimension = max(1, int(sample_max_dimension))
-        width, height = working.size
-        longest_edge = max(width, height)
-        if longest_edge > safe_dimension:
-            scale = safe_dimension / float(longest_edge)
-            working = working.resize(
-                (max(1, int(round(width * scale))), max(1, int(round(height * scale)))),
-                Image.Resampling.BILINEAR,
-            )
-
-        arr = np.asarray(working, dtype=np.uint8)
-        histograms: Dict[str, List[float]] = {}
-        max_value = 0.0
-        bin_edges = np.linspace(0, 256, num=bins + 1, dtype=np.float32)
-
-        for index, channel_name in enumerate(("red", "green", "blue")):
-            counts, _ = np.histogram(arr[:, :, index], bins=bin_edges)
-            softened = np.sqrt(counts.astype(np.float32))
-            max_value = max(max_value, float(softened.max()) if softened.size else 0.0)
-            histograms[channel_name] = softened.tolist()
-
-        normalizer = max(max_value, 1.0)
-        return {
-            channel_name: [min(1.0, max(0.0, value / normalizer)) for value in values]
-            for channel_name, values in histograms.items()
-        }
+        """Square-root-softened R/G/B histograms as lists of floats, normalized to a peak of ``1.0``.
+
+        ``image`` may also be an 8-bit ``HxW``, ``HxWx3`` or ``HxWx4`` array,
+        such as a rendered preview frame. Images larger than
+        ``sample_max_dimension`` are subsampled by taking every n-th pixel
+        (nearest neighbour for PIL images) rather than by a bilinear resize,
+        so the counts of a large image differ slightly from earlier versions.
+        For the luma channel, clipping and percentiles, use
+        :func:`~tempusloom.core.histogram.compute_histogram`.
+        """
+        return compute_histogram(
+            image,
+            bins=bins,
+            sample_max_dimension=sample_max_dimension,
+        ).to_dict()
 
     def histogram_data(
         self,
@@ -567,6 +827,8 @@ class TLImage:
     def preview_adjustment(self, section: str, values: Dict[str, Any]) -> None:
         normalized = self._normalize_edit_state_payload({"adjust": {section: values}})
         self.edit_state = self._deep_merge_dict(self.edit_state, normalized)
+        self._apply_edit_state_delta(normalized)
+        self._synced_state_key = self._edit_state_key()
 
     def update_mask(
         self,
@@ -589,56 +851,50 @@ class TLImage:
         if index < 0 or index >= len(self.malayers):
             return
         layer = self.malayers[index]
-        if visible is not None:
+        if visible is not None and visible != layer.visible:
             layer.visible = visible
-        if opacity is not None:
+            self._dirty.layer_ids.add(layer.id)
+        if opacity is not None and opacity != layer.opacity:
             layer.opacity = opacity
+            self._dirty.layer_ids.add(layer.id)
         self._sync_state_from_malayers()
         if record_history:
             self.commit_history(description or f"图层 {layer.name}")
 
     def reset_history(self, description: str = "原始状态") -> None:
-        self._history = []
-        self._history_index = -1
-        self.commit_history(description)
+        self._history.reset(self.to_dict(), description)
 
     def commit_history(self, description: str) -> bool:
-        snapshot = self.to_dict()
-        if self._history_index >= 0 and self._history[self._history_index].snapshot == snapshot:
-            return False
-        if self._history_index < len(self._history) - 1:
-            self._history = self._history[: self._history_index + 1]
-        self._history.append(HistoryEntry(description=description, snapshot=snapshot))
-        self._history_index = len(self._history) - 1
-        return True
+        """Record the current state; entries keep only what changed since the previous one."""
+        return self._history.commit(self.to_dict(), description)
 
     def can_undo(self) -> bool:
-        return self._history_index > 0
+        return self._history.can_undo()
 
     def can_redo(self) -> bool:
-        return 0 <= self._history_index < len(self._history) - 1
+        return self._history.can_redo()
 
     def undo(self) -> bool:
-        if not self.can_undo():
+        changes = self._history.undo()
+        if changes is None:
             return False
-        self._history_index -= 1
-        self._restore_snapshot(self._history[self._history_index].snapshot)
+        self.apply_state_changes(self._history.state, changes)
         return True
 
     def redo(self) -> bool:
-        if not self.can_redo():
+        changes = self._history.redo()
+        if changes is None:
             return False
-        self._history_index += 1
-        self._restore_snapshot(self._history[self._history_index].snapshot)
+        self.apply_state_changes(self._history.state, changes)
         return True
 
     def history_entries(self) -> List[Dict[str, Any]]:
         return [
             {
                 "description": item.description,
-                "active": index == self._history_index,
+                "active": index == self._history.index,
             }
-            for index, item in enumerate(self._history)
+            for index, item in enumerate(self._history.entries)
         ]
 
     def to_json_dict(self) -> Dict[str, Any]:
@@ -672,6 +928,69 @@ class TLImage:
             edit_state=data.get("edit_state", {}),
         )
 
+    def apply_state_changes(self, state: Dict[str, Any], changes: List[Change]) -> None:
+        """Patch the document to ``state``, a :meth:`to_dict` that differs from the current one by ``changes``.
+
+        Only what ``changes`` name is touched: malayers are updated in place,
+        so they keep their stage caches, and only the layers and adjustment
+        sections that changed are marked dirty. Layers the state adds are the
+        only ones built from scratch. ``state`` is read, never kept.
+        """
+        layer_states = state.get("malayers", [])
+        # Layer index -> payload keys to restore, or None for the whole payload.
+        touched: Dict[int, Optional[Set[str]]] = {}
+        relayer = False
+        edit_state_changed = False
+        for change in changes:
+            root = change.path[0] if change.path else None
+            if root == "malayers":
+                if len(change.path) < 3 or change.path[2] in ("id", "type"):
+                    relayer = True
+                    continue
+                keys = touched.setdefault(change.path[1], set())
+                if change.path[2] == "payload":
+                    if len(change.path) == 3:
+                        touched[change.path[1]] = None
+                    elif keys is not None:
+                        keys.add(change.path[3])
+            elif root == "edit_state":
+                edit_state_changed = True
+            elif root == "image_path":
+                self.image_path = state["image_path"]
+                self._invalidate_image_caches()
+            elif root in ("id", "name", "rating", "tags", "metadata"):
+                setattr(self, root, deepcopy(state[root]))
+            else:
+                self._restore_snapshot(deepcopy(state))
+                return
+
+        if relayer:
+            existing = {layer.id: layer for layer in self.malayers}
+            malayers: List[Malayer] = []
+            for layer_state in layer_states:
+                layer = existing.get(layer_state.get("id"))
+                if layer is None or layer.type_name != layer_state.get("type"):
+                    layer = Malayer.from_dict(layer_state)
+                else:
+                    layer.restore_state(layer_state)
+                malayers.append(layer)
+            self.malayers = malayers
+            self._dirty.layer_ids.update(existing)
+            self._dirty.layer_ids.update(layer.id for layer in malayers)
+        else:
+            for index, keys in touched.items():
+                self.malayers[index].restore_state(layer_states[index], keys)
+                self._dirty.layer_ids.add(self.malayers[index].id)
+        for index, keys in touched.items():
+            if isinstance(self.malayers[index], AdjustmentMalayer):
+                self._dirty.sections.update(keys if keys is not None else layer_states[index].get("payload", {}))
+
+        if edit_state_changed:
+            normalized = self._normalize_edit_state_payload(state.get("edit_state", {}))
+            normalized["image_path"] = self.image_path
+            self.edit_state = normalized
+        self._synced_state_key = self._edit_state_key()
+
     def _restore_snapshot(self, snapshot: Dict[str, Any]) -> None:
         restored = self.from_dict(snapshot)
         self.image_path = restored.image_path
@@ -682,6 +1001,9 @@ class TLImage:
         self.tags = restored.tags
         self.metadata = restored.metadata
         self.edit_state = restored.edit_state
+        self._synced_state_key = self._edit_state_key()
+        self._dirty.sections.update(section.value for section in AdjustmentSection)
+        self._dirty.layer_ids.update(layer.id for layer in self.malayers)
 
     def _sync_state_from_malayers(self) -> None:
         primary_adjustment = self.get_primary_malayer_for_tab(EditorTab.ADJUST)
@@ -697,6 +1019,15 @@ class TLImage:
             "mask": self._build_mask_state(primary_adjustment.mask if primary_adjustment else None),
             "layers": [self._serialize_layer_state(layer) for layer in self.malayers],
         }
+        self._synced_state_key = self._edit_state_key()
+
+    def _edit_state_key(self) -> str:
+        return fingerprint(self.edit_state)
+
+    def _ensure_malayers_synced(self) -> None:
+        """Reapply ``edit_state`` to the malayers unless they already reflect it."""
+        if self._synced_state_key != self._edit_state_key():
+            self._sync_malayers_from_edit_state()
 
     def _sync_malayers_from_edit_state(self) -> None:
         primary_adjustment = self._ensure_primary_adjustment_layer()
@@ -704,11 +1035,12 @@ class TLImage:
         if isinstance(adjust_state, dict):
             self._apply_adjust_delta(primary_adjustment, adjust_state)
 
-        primary_adjustment.mask = Mask.from_dict(self.edit_state.get("mask"))
+        self._apply_primary_mask(primary_adjustment, self.edit_state.get("mask"))
 
         layers_state = self.edit_state.get("layers")
         if isinstance(layers_state, list):
             self._apply_layers_state(layers_state)
+        self._synced_state_key = self._edit_state_key()
 
     def _apply_edit_state_delta(self, normalized: Dict[str, Any]) -> None:
         primary_adjustment = self._ensure_primary_adjustment_layer()
@@ -718,12 +1050,35 @@ class TLImage:
             self._apply_adjust_delta(primary_adjustment, adjust_state)
 
         if "mask" in normalized:
-            primary_adjustment.mask = Mask.from_dict(self.edit_state.get("mask"))
+            self._apply_primary_mask(primary_adjustment, self.edit_state.get("mask"))
 
         if "layers" in normalized and isinstance(self.edit_state.get("layers"), list):
             self._apply_layers_state(self.edit_state.get("layers"))
 
+    def _apply_primary_mask(self, primary_adjustment: AdjustmentMalayer, mask_state: Optional[Dict[str, Any]]) -> None:
+        mask = Mask.from_dict(mask_state)
+        if mask != primary_adjustment.mask:
+            primary_adjustment.mask = mask
+            self._dirty.layer_ids.add(primary_adjustment.id)
+
     def _apply_adjust_delta(self, primary_adjustment: AdjustmentMalayer, adjust_state: Dict[str, Any]) -> None:
+        params = primary_adjustment.params
+        # Only the params sections the delta can write to are compared.
+        names = {
+            name
+            for section, values in adjust_state.items()
+            if isinstance(values, dict)
+            for name in self._ADJUST_PARAM_FIELDS.get(section, (section,))
+            if hasattr(params, name)
+        }
+        before = {name: asdict(getattr(params, name)) for name in names}
+        self._apply_adjust_sections(primary_adjustment, adjust_state)
+        changed = {name for name, values in before.items() if asdict(getattr(params, name)) != values}
+        if changed:
+            self._dirty.sections.update(changed)
+            self._dirty.layer_ids.add(primary_adjustment.id)
+
+    def _apply_adjust_sections(self, primary_adjustment: AdjustmentMalayer, adjust_state: Dict[str, Any]) -> None:
         for section in self._ADJUST_APPLY_ORDER:
             values = adjust_state.get(section)
             if isinstance(values, dict):
@@ -761,6 +1116,7 @@ class TLImage:
                 target = self.malayers[index]
             if target is None:
                 continue
+            before = (target.visible, target.opacity, target.blend_mode, target.mask)
             if "visible" in layer_state:
                 target.visible = bool(layer_state["visible"])
             if "opacity" in layer_state:
@@ -772,6 +1128,8 @@ class TLImage:
                     pass
             if "mask" in layer_state and layer_state["mask"] is not None:
                 target.mask = Mask.from_dict(layer_state["mask"])
+            if (target.visible, target.opacity, target.blend_mode, target.mask) != before:
+                self._dirty.layer_ids.add(target.id)
 
     def _serialize_layer_state(self, layer: Malayer) -> Dict[str, Any]:
         return {
@@ -7,6 +7,8 @@ Main editor window matching the pencil.pen design (1440 × 900).
 from __future__ import annotations
 
 import base64
+from concurrent.futures import Future, ThreadPoolExecutor
+from copy import deepcopy
 import io
 import json
 import os
@@ -14,10 +16,12 @@ import math
 import multiprocessing as mp
 from pathlib import Path
 from queue import Empty
+import threading
 from typing import Any, Callable, Optional
 
+import numpy as np
 from PyQt6.QtCore import (
-    Qt, QSize, QRectF, QPointF, QThread, QTimer, QObject, pyqtSignal,
+    Qt, QSize, QRectF, QPointF, QThread, QTimer, QObject, pyqtSignal, pyqtSlot,
 )
 from PyQt6.QtGui import (
     QColor, QPainter, QPainterPath, QBrush, QPen,
@@ -33,9 +37,10 @@ from PyQt6.QtWidgets import (
 )
 
 from .editor_icons import icon_pixmap
-from PIL.ImageQt import ImageQt
-from tempusloom.core import TLImage
+from .image_bridge import rgba8_array, rgba_pixmap
+from tempusloom.core import RenderCancelled, SharedImageHandle, SharedPixelStore, TLImage, render_cancellation
 from tempusloom.core.histogram_process import histogram_worker_main
+from tempusloom.core.history import Change, apply_changes, diff_states
 from tempusloom.agent import (
     AgentModelConfig,
     AgentRequestContext,
@@ -219,6 +224,131 @@ class ExportWorker(QObject):
         self.progress_changed.emit(value, message)
 
 
+class PreviewRenderWorker(QObject):
+    """Renders editor previews on its own thread, newest request first.
+
+    Jobs are dicts with a ``kind`` (``"preview"`` for the whole frame,
+    ``"detail"`` for the zoomed crop), a ``generation`` counter, the
+    ``render_image`` arguments and either a ``snapshot`` from
+    :meth:`TLImage.to_dict` or the :func:`~tempusloom.core.history.diff_states`
+    ``changes`` from the state of the previous job. Only the latest job of each
+    kind is kept, and a render in progress is cancelled at the next stage,
+    layer or tile once a newer job of its kind is submitted; snapshots and
+    changes are held apart from the jobs, so replacing a job never drops an
+    edit. The worker keeps one TLImage replica, rebuilt from a snapshot and
+    patched in place by changes, so its layer and stage caches carry over
+    between jobs. A snapshot job's optional ``source_levels`` are the editor's
+    decoded source levels, which the rebuilt replica reads instead of decoding
+    the file again. After a failure the replica is dropped and the next job
+    has to carry a snapshot.
+    Frames are emitted as ``HxWx4`` uint8 arrays for :func:`rgba_pixmap`.
+    When a preview job sets ``histogram`` to a sample dimension, the RGB
+    histogram of that frame follows it on :attr:`histogram_ready`.
+    """
+
+    frame_ready = pyqtSignal(str, int, object, object)
+    histogram_ready = pyqtSignal(int, object)
+    failed = pyqtSignal(str, int, str)
+    _job_posted = pyqtSignal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._latest: dict[str, Optional[int]] = {}
+        self._replica: Optional[TLImage] = None
+        # The replica's to_dict state, and what submitted jobs changed since the last render.
+        self._state: Optional[dict[str, Any]] = None
+        self._pending_snapshot: Optional[tuple[dict[str, Any], Optional[list[Any]]]] = None
+        self._pending_changes: list[Change] = []
+        self._job_posted.connect(self._process_pending)
+
+    def submit(self, job: dict[str, Any]) -> None:
+        """Queue ``job`` in place of any pending job of its kind; safe to call from any thread."""
+        job = dict(job)
+        with self._lock:
+            if "snapshot" in job:
+                self._pending_snapshot = (job.pop("snapshot"), job.pop("source_levels", None))
+                self._pending_changes = []
+            else:
+                self._pending_changes.extend(job.pop("changes", ()))
+            self._pending[job["kind"]] = job
+            self._latest[job["kind"]] = job["generation"]
+        self._job_posted.emit()
+
+    def cancel(self, kind: Optional[str] = None) -> None:
+        with self._lock:
+            for name in [kind] if kind is not None else list(self._latest):
+                self._pending.pop(name, None)
+                self._latest[name] = None
+
+    @pyqtSlot()
+    def _process_pending(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return
+                # The whole frame goes first; a crop is only refined on top of it.
+                kind = "preview" if "preview" in self._pending else next(iter(self._pending))
+                job = self._pending.pop(kind)
+            self._render(job)
+
+    def _render(self, job: dict[str, Any]) -> None:
+        kind = job["kind"]
+        generation = job["generation"]
+
+        def is_cancelled() -> bool:
+            return self._latest.get(kind) != generation
+
+        try:
+            replica = self._sync_replica()
+            with render_cancellation(is_cancelled):
+                image = replica.render_image(
+                    preview=True,
+                    max_dimension=job.get("max_dimension"),
+                    region=job.get("region"),
+                    scale=job.get("scale", 1.0),
+                )
+        except RenderCancelled:
+            return
+        except Exception as exc:
+            # The replica may be half patched; the editor sends a snapshot after a failure.
+            self._replica = None
+            self._state = None
+            self.failed.emit(kind, generation, str(exc))
+            return
+        if is_cancelled():
+            return
+        frame = rgba8_array(image)
+        self.frame_ready.emit(kind, generation, frame, image.info.get("region"))
+        if kind == "preview" and job.get("histogram") and not is_cancelled():
+            self.histogram_ready.emit(
+                generation,
+                TLImage.histogram_from_image(frame, sample_max_dimension=job["histogram"]),
+            )
+
+    def _sync_replica(self) -> TLImage:
+        """Bring the replica to the newest submitted state: rebuilt from a snapshot, otherwise patched."""
+        with self._lock:
+            pending_snapshot, self._pending_snapshot = self._pending_snapshot, None
+            changes, self._pending_changes = self._pending_changes, []
+        if pending_snapshot is not None:
+            snapshot, source_levels = pending_snapshot
+            self._replica = None
+            # The editor keeps the snapshot to diff against; the worker patches its own copy.
+            self._state = deepcopy(snapshot)
+            replica = TLImage.from_dict(deepcopy(snapshot))
+            if source_levels:
+                replica.use_source_levels(source_levels)
+            self._replica = replica
+        if self._replica is None:
+            raise RuntimeError("Preview worker received changes before any image was opened")
+        if changes:
+            self._state = apply_changes(self._state, changes)
+            self._replica.apply_state_changes(self._state, changes)
+        return self._replica
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # TOP NAV BAR
 # ══════════════════════════════════════════════════════════════════════════════
@@ -644,6 +774,7 @@ class CanvasArea(QWidget):
     """
 
     zoom_changed = pyqtSignal(int)   # zoom % (e.g. 75)
+    viewport_changed = pyqtSignal()  # pan / resize moved the visible area
     color_picked = pyqtSignal(QColor)
 
     _MIN_ZOOM = 5
@@ -657,6 +788,10 @@ class CanvasArea(QWidget):
 
         self._edited_pixmap: Optional[QPixmap] = None
         self._original_pixmap: Optional[QPixmap] = None
+        # Full-resolution crop drawn over the preview when zoomed past it.
+        self._detail_pixmap: Optional[QPixmap] = None
+        self._detail_rect: Optional[QRectF] = None   # normalized image coords
+        self._source_size: Optional[tuple[int, int]] = None
         self._compare_mode = False
         self._zoom    = 75        # percent
         self._offset  = QPointF(0, 0)
@@ -737,8 +872,9 @@ class CanvasArea(QWidget):
         px = self._display_pixmap()
         if px is None or px.isNull():
             return None
-        width = px.width() * self._zoom / 100
-        height = px.height() * self._zoom / 100
+        size = px.deviceIndependentSize()
+        width = size.width() * self._zoom / 100
+        height = size.height() * self._zoom / 100
         return QRectF(self._offset.x(), self._offset.y(), width, height)
 
     def _canvas_pos_to_image_pos(self, pos: QPointF) -> Optional[tuple[int, int]]:
@@ -795,6 +931,9 @@ class CanvasArea(QWidget):
     ) -> None:
         self._edited_pixmap = edited if not edited.isNull() else None
         self._original_pixmap = original if original and not original.isNull() else None
+        # A detail crop shows the previous edit state; the owner re-requests it.
+        self._detail_pixmap = None
+        self._detail_rect = None
         self._compare_mode = False
         if self._edited_pixmap:
             self._placeholder.hide()
@@ -811,6 +950,52 @@ class CanvasArea(QWidget):
     def set_pixmap(self, px: QPixmap, *, reset_view: bool = False) -> None:
         self.set_pixmaps(px, reset_view=reset_view)
 
+    def set_source_size(self, width: int, height: int) -> None:
+        """Full-resolution size of the image the (smaller) preview pixmaps show."""
+        self._source_size = (int(width), int(height))
+
+    def set_detail_pixmap(self, pixmap: QPixmap, region: tuple[float, float, float, float]) -> None:
+        """Overlay a sharper render of ``region`` (full-resolution pixels) on the preview."""
+        if self._source_size is None or pixmap.isNull():
+            return
+        width, height = self._source_size
+        left, top, right, bottom = region
+        self._detail_pixmap = pixmap
+        self._detail_rect = QRectF(left / width, top / height, (right - left) / width, (bottom - top) / height)
+        self.update()
+
+    def clear_detail(self) -> None:
+        if self._detail_pixmap is not None:
+            self._detail_pixmap = None
+            self._detail_rect = None
+            self.update()
+
+    def display_dimension(self) -> float:
+        """Physical pixels the longest image edge covers at the current zoom, at most the canvas size."""
+        canvas_edge = max(self.width(), self.height())
+        rect = self._image_rect()
+        drawn_edge = canvas_edge if rect is None else min(max(rect.width(), rect.height()), canvas_edge)
+        return drawn_edge * self.devicePixelRatioF()
+
+    def visible_source_region(self) -> Optional[tuple[tuple[int, int, int, int], float]]:
+        """Visible part of the image in full-resolution pixels, and physical screen pixels per source pixel."""
+        rect = self._image_rect()
+        if rect is None or self._source_size is None:
+            return None
+        visible = rect.intersected(QRectF(0, 0, self.width(), self.height()))
+        if visible.isEmpty():
+            return None
+        width, height = self._source_size
+        scale_x = width / rect.width()
+        scale_y = height / rect.height()
+        region = (
+            max(0, int(math.floor((visible.left() - rect.left()) * scale_x))),
+            max(0, int(math.floor((visible.top() - rect.top()) * scale_y))),
+            min(width, int(math.ceil((visible.right() - rect.left()) * scale_x))),
+            min(height, int(math.ceil((visible.bottom() - rect.top()) * scale_y))),
+        )
+        return region, rect.width() * self.devicePixelRatioF() / width
+
     def _fit_to_window(self) -> None:
         px = self._base_pixmap()
         if not px:
@@ -818,8 +1003,9 @@ class CanvasArea(QWidget):
         w, h = self.width(), self.height()
         if w < 10 or h < 10:
             return
-        scale_w = (w - 40) / px.width()
-        scale_h = (h - 40) / px.height()
+        size = px.deviceIndependentSize()
+        scale_w = (w - 40) / size.width()
+        scale_h = (h - 40) / size.height()
         scale = min(scale_w, scale_h, 1.0)
         self._zoom = max(self._MIN_ZOOM, min(self._MAX_ZOOM, int(scale * 100)))
         self._center_image()
@@ -830,8 +1016,9 @@ class CanvasArea(QWidget):
         px = self._base_pixmap()
         if not px:
             return
-        iw = px.width()  * self._zoom / 100
-        ih = px.height() * self._zoom / 100
+        size = px.deviceIndependentSize()
+        iw = size.width()  * self._zoom / 100
+        ih = size.height() * self._zoom / 100
         self._offset = QPointF(
             (self.width()  - iw) / 2,
             (self.height() - ih) / 2,
@@ -853,8 +1040,9 @@ class CanvasArea(QWidget):
 
         px = self._display_pixmap()
         if px and not px.isNull():
-            iw = px.width()  * self._zoom / 100
-            ih = px.height() * self._zoom / 100
+            size = px.deviceIndependentSize()
+            iw = size.width()  * self._zoom / 100
+            ih = size.height() * self._zoom / 100
             dest = QRectF(self._offset.x(), self._offset.y(), iw, ih)
 
             # drop shadow
@@ -867,6 +1055,15 @@ class CanvasArea(QWidget):
             clip.addRoundedRect(dest, 4, 4)
             p.setClipPath(clip)
             p.drawPixmap(dest.toRect(), px)
+            if self._detail_pixmap is not None and self._detail_rect is not None and not self._compare_mode:
+                detail = self._detail_rect
+                target = QRectF(
+                    dest.left() + detail.left() * dest.width(),
+                    dest.top() + detail.top() * dest.height(),
+                    detail.width() * dest.width(),
+                    detail.height() * dest.height(),
+                )
+                p.drawPixmap(target, self._detail_pixmap, QRectF(self._detail_pixmap.rect()))
             p.setClipping(False)
 
             # grid overlay
@@ -888,6 +1085,7 @@ class CanvasArea(QWidget):
         self._position_compare_button()
         if self._base_pixmap():
             self._fit_to_window()
+            self.viewport_changed.emit()
 
     def wheelEvent(self, event: QWheelEvent) -> None:  # noqa: N802
         if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
@@ -933,6 +1131,7 @@ class CanvasArea(QWidget):
         if self._panning:
             self._panning = False
             self._refresh_cursor()
+            self.viewport_changed.emit()
 
     def mouseDoubleClickEvent(self, _event) -> None:         # noqa: N802
         self._fit_to_window()
@@ -1616,19 +1815,20 @@ class _HistogramCanvas(QWidget):
         self._g = [0.0] * self._BINS
         self._b = [0.0] * self._BINS
 
-    def set_histogram_data(self, histogram: Optional[dict[str, list[float]]]) -> None:
+    def set_histogram_data(self, histogram: Optional[dict[str, Any]]) -> None:
         histogram = histogram or {}
-        self._r = list(histogram.get("red", self._r))[: self._BINS]
-        self._g = list(histogram.get("green", self._g))[: self._BINS]
-        self._b = list(histogram.get("blue", self._b))[: self._BINS]
-        if len(self._r) < self._BINS:
-            self._r.extend([0.0] * (self._BINS - len(self._r)))
-        if len(self._g) < self._BINS:
-            self._g.extend([0.0] * (self._BINS - len(self._g)))
-        if len(self._b) < self._BINS:
-            self._b.extend([0.0] * (self._BINS - len(self._b)))
+        self._r = self._curve(histogram.get("red", self._r))
+        self._g = self._curve(histogram.get("green", self._g))
+        self._b = self._curve(histogram.get("blue", self._b))
         self.update()
 
+    def _curve(self, values) -> list[float]:
+        """``values`` (a list or array) as exactly ``_BINS`` Python floats, zero-padded."""
+        curve = np.zeros(self._BINS, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64).ravel()[: self._BINS]
+        curve[: values.size] = values
+        return curve.tolist()
+
     def paintEvent(self, _event) -> None:  # noqa: N802
         p = QPainter(self)
         p.setRenderHint(QPainter.RenderHint.Antialiasing)
@@ -1659,6 +1859,62 @@ class _HistogramCanvas(QWidget):
         p.end()
 
 
+class _ScopeCanvas(QWidget):
+    """Blits a waveform, RGB parade or vectorscope density image from the histogram process."""
+    _H = 128
+    # Colour of each plot; the parade has one per channel, left to right.
+    _TINTS = {
+        "waveform": ((220, 235, 220),),
+        "parade": ((255, 80, 80), (60, 200, 80), (60, 130, 255)),
+        "vectorscope": ((220, 235, 220),),
+    }
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.setFixedHeight(self._H)
+        self.setStyleSheet(
+            f"background:{C_BG_ITEM}; border-radius:6px;"
+        )
+        self._kind = ""
+        self._pixmap: Optional[QPixmap] = None
+
+    def set_scope(self, kind: str, density: Optional[np.ndarray]) -> None:
+        self._kind = kind
+        self._pixmap = None if density is None else rgba_pixmap(self._density_rgba(kind, density))
+        self.update()
+
+    @classmethod
+    def _density_rgba(cls, kind: str, density: np.ndarray) -> np.ndarray:
+        """Tinted RGBA with square-root-softened density as alpha, like the histogram curves."""
+        values = density.astype(np.float32)
+        peak = max(float(values.max()), 1.0)
+        tints = np.asarray(cls._TINTS.get(kind, cls._TINTS["waveform"]), dtype=np.uint8)
+        rgba = np.empty(density.shape + (4,), dtype=np.uint8)
+        rgba[..., :3] = np.repeat(tints, -(-density.shape[1] // len(tints)), axis=0)[None, : density.shape[1]]
+        rgba[..., 3] = np.sqrt(values / peak) * 255.0
+        return rgba
+
+    def paintEvent(self, _event) -> None:  # noqa: N802
+        p = QPainter(self)
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        p.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        target = QRectF(self.rect().adjusted(4, 4, -4, -4))
+        if self._kind == "vectorscope":
+            side = min(target.width(), target.height())
+            target = QRectF(target.center().x() - side / 2, target.center().y() - side / 2, side, side)
+            p.setPen(QPen(QColor(C_BORDER), 1))
+            p.drawEllipse(target)
+            p.drawLine(QPointF(target.center().x(), target.top()), QPointF(target.center().x(), target.bottom()))
+            p.drawLine(QPointF(target.left(), target.center().y()), QPointF(target.right(), target.center().y()))
+        if self._pixmap is not None:
+            p.drawPixmap(target, self._pixmap, QRectF(self._pixmap.rect()))
+
+        p.setPen(QPen(QColor(C_BORDER), 1))
+        p.setBrush(Qt.BrushStyle.NoBrush)
+        p.drawRoundedRect(self.rect().adjusted(0, 0, -1, -1), 6, 6)
+        p.end()
+
+
 class GradientSlider(QWidget):
     """Horizontal slider with a colour-gradient track and a white circle handle."""
     value_changed = pyqtSignal(int)
@@ -2587,6 +2843,13 @@ class RightPanel(QWidget):
     adjust_section_changed = pyqtSignal(str, dict)
     adjust_section_change_finished = pyqtSignal(str, dict, str)
     tool_requested = pyqtSignal(str)
+    scope_changed = pyqtSignal(str)   # "" | "waveform" | "parade" | "vectorscope"
+
+    _SCOPE_DEFS = (
+        ("waveform", "波形"),
+        ("parade", "分量"),
+        ("vectorscope", "矢量"),
+    )
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
@@ -2616,6 +2879,9 @@ class RightPanel(QWidget):
         self._histogram_canvas: Optional[_HistogramCanvas] = None
         self._histogram_meta_labels: list[QLabel] = []
         self._histogram_format_badge: Optional[QLabel] = None
+        self._scope_canvas: Optional[_ScopeCanvas] = None
+        self._scope_buttons: dict[str, QPushButton] = {}
+        self._scope = ""
         self._build()
 
     def _build(self) -> None:
@@ -2925,10 +3191,28 @@ class RightPanel(QWidget):
             self._syncing_adjust_controls = False
         self._refresh_color_editor_labels()
 
-    def set_histogram_data(self, histogram: Optional[dict[str, list[float]]]) -> None:
+    def set_histogram_data(self, histogram: Optional[dict[str, Any]]) -> None:
         if self._histogram_canvas is not None:
             self._histogram_canvas.set_histogram_data(histogram)
 
+    def set_scope_data(self, scopes: Optional[dict[str, np.ndarray]]) -> None:
+        """Show the density image of the selected scope, if ``scopes`` has one."""
+        if self._scope_canvas is None or not self._scope:
+            return
+        density = (scopes or {}).get(self._scope)
+        if density is not None or scopes is None:
+            self._scope_canvas.set_scope(self._scope, density)
+
+    def _on_scope(self, scope: str) -> None:
+        # Clicking the selected scope again hides the scopes.
+        self._scope = "" if scope == self._scope else scope
+        for name, btn in self._scope_buttons.items():
+            btn.setChecked(name == self._scope)
+        if self._scope_canvas is not None:
+            self._scope_canvas.set_scope(self._scope, None)
+            self._scope_canvas.setVisible(bool(self._scope))
+        self.scope_changed.emit(self._scope)
+
     def set_histogram_metadata(self, metadata: Optional[dict[str, Any]]) -> None:
         values = metadata or {}
         labels = [
@@ -3434,7 +3718,7 @@ class RightPanel(QWidget):
         return scroll
 
     def _build_histogram_bar(self) -> QWidget:
-        """Histogram canvas with EXIF info row below it."""
+        """Histogram canvas with EXIF info row and scope switches below it, then the scope canvas."""
         w = QWidget()
         w.setStyleSheet("background:transparent;")
         lo = QVBoxLayout(w)
@@ -3461,7 +3745,28 @@ class RightPanel(QWidget):
         )
         exif_lo.addWidget(self._histogram_format_badge)
         exif_lo.addStretch()
+
+        self._scope_buttons = {}
+        for scope, label in self._SCOPE_DEFS:
+            btn = QPushButton(label)
+            btn.setCheckable(True)
+            btn.setFixedHeight(18)
+            btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+            btn.setStyleSheet(
+                f"QPushButton{{color:{C_TEXT_3}; background:transparent; border:none;"
+                "font-size:10px; padding:0 3px;}}"
+                f"QPushButton:checked{{color:{C_WHITE}; background:{C_BG_ACTIVE}; border-radius:3px;}}"
+                f"QPushButton:hover{{color:{C_TEXT_1};}}"
+            )
+            btn.clicked.connect(lambda _, s=scope: self._on_scope(s))
+            self._scope_buttons[scope] = btn
+            exif_lo.addWidget(btn)
         lo.addWidget(exif_row)
+
+        self._scope_canvas = _ScopeCanvas()
+        self._scope_canvas.setVisible(False)
+        lo.addWidget(self._scope_canvas)
         return w
 
     def _build_wb_content(self, lo: QVBoxLayout) -> None:
@@ -4357,9 +4662,20 @@ class MainEditorWindow(QWidget):
 
     title_changed = pyqtSignal(str)
     _PREVIEW_REFRESH_INTERVAL_MS = 24
+    _PREVIEW_REFINE_DELAY_MS = 160
+    _PROXY_PREVIEW_MAX_DIMENSION = 384
+    _DETAIL_REFRESH_INTERVAL_MS = 150
+    # Render a full-resolution crop once the preview is shown this much enlarged.
+    _DETAIL_MIN_UPSCALE = 1.25
+    _DETAIL_MARGIN = 32
     _HISTOGRAM_REFRESH_INTERVAL_MS = 160
-    _FIXED_PREVIEW_MAX_DIMENSION = 1024
+    # How often an "open" for the histogram worker checks whether the shared source is ready.
+    _PIXEL_PUBLISH_POLL_MS = 10
+    # Previews are laid out as if this long, whatever resolution they are rendered at.
+    _PREVIEW_LAYOUT_DIMENSION = 1024
     _HISTOGRAM_RENDER_MAX_DIMENSION = 480
+    # Histogram the preview frames themselves; the histogram process then only renders when a preview fails.
+    _HISTOGRAM_FROM_PREVIEW = True
     _EXPORT_FILTER_JPEG = "JPEG (*.jpg *.jpeg)"
     _EXPORT_FILTER_PNG = "PNG (*.png)"
     _EXPORT_FILTER_WEBP = "WebP (*.webp)"
@@ -4405,6 +4721,12 @@ class MainEditorWindow(QWidget):
         self._preview_refresh_timer = QTimer(self)
         self._preview_refresh_timer.setSingleShot(True)
         self._preview_refresh_timer.timeout.connect(self._flush_preview_refresh)
+        self._preview_refine_timer = QTimer(self)
+        self._preview_refine_timer.setSingleShot(True)
+        self._preview_refine_timer.timeout.connect(self._flush_preview_refine)
+        self._detail_refresh_timer = QTimer(self)
+        self._detail_refresh_timer.setSingleShot(True)
+        self._detail_refresh_timer.timeout.connect(self._flush_detail_refresh)
         self._histogram_refresh_timer = QTimer(self)
         self._histogram_refresh_timer.setSingleShot(True)
         self._histogram_refresh_timer.timeout.connect(self._flush_histogram_refresh)
@@ -4426,8 +4748,40 @@ class MainEditorWindow(QWidget):
         self._histogram_result_timer.start(40)
         self._histogram_job_id = 0
         self._latest_histogram_job_id = 0
+        # Results from before this job belong to a previously opened image.
+        self._histogram_open_job_id = 0
+        # The decoded source is copied into shared memory off the GUI thread, then the
+        # histogram worker attaches to it; the editor and the worker each hold a reference.
+        self._pixel_store = SharedPixelStore()
+        self._pixel_publisher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tempusloom-publish")
+        self._pixel_publish: Optional[Future] = None
+        self._histogram_pixel_handle: Optional[SharedImageHandle] = None
+        # What the histogram worker holds: later requests only carry the diff from this state.
+        self._histogram_sent_image: Optional[TLImage] = None
+        self._histogram_sent_state: Optional[dict[str, Any]] = None
+        # Scope shown under the histogram; "" when hidden. Only then does every change go to the histogram worker.
+        self._scope = ""
+        self._histogram_sent_scope = ""
         self._original_preview_cache_key: Optional[tuple[str, int]] = None
         self._original_preview_pixmap: Optional[QPixmap] = None
+        self._render_generations = {"preview": 0, "detail": 0}
+        # What the preview worker's replica holds: later jobs only carry the diff from this state.
+        self._render_sent_image: Optional[TLImage] = None
+        self._render_sent_state: Optional[dict[str, Any]] = None
+        self._pending_reset_view = False
+        self._preview_dimension = self._PREVIEW_LAYOUT_DIMENSION
+        self._pending_preview_dimension = self._PREVIEW_LAYOUT_DIMENSION
+        self._preview_frame_pending = False
+        self._preview_refresh_deferred = False
+        self._shown_preview_generation = 0
+        self._preview_thread = QThread(self)
+        self._preview_worker = PreviewRenderWorker()
+        self._preview_worker.moveToThread(self._preview_thread)
+        self._preview_worker.frame_ready.connect(self._on_render_frame_ready)
+        self._preview_worker.histogram_ready.connect(self._on_render_histogram_ready)
+        self._preview_worker.failed.connect(self._on_render_failed)
+        self._preview_thread.finished.connect(self._preview_worker.deleteLater)
+        self._preview_thread.start()
         self.setStyleSheet(f"background:{C_BG_APP};")
         self._build_ui()
         self._connect_signals()
@@ -4436,6 +4790,7 @@ class MainEditorWindow(QWidget):
         app = QApplication.instance()
         if app is not None:
             app.aboutToQuit.connect(self._shutdown_histogram_process)
+            app.aboutToQuit.connect(self._shutdown_preview_renderer)
 
     # ── build ─────────────────────────────────────────────────────────────────
     def _build_ui(self) -> None:
@@ -4484,6 +4839,8 @@ class MainEditorWindow(QWidget):
         self._right_panel.tool_requested.connect(self._tool_sidebar.set_active_tool)
 
         self._canvas.zoom_changed.connect(self._on_zoom_changed)
+        self._canvas.viewport_changed.connect(self._schedule_detail_refresh)
+        self._canvas.viewport_changed.connect(self._refresh_preview_level)
         self._canvas.color_picked.connect(self._on_canvas_color_picked)
         self._status_bar.zoom_in_requested.connect(self._zoom_in)
         self._status_bar.zoom_out_requested.connect(self._zoom_out)
@@ -4497,40 +4854,68 @@ class MainEditorWindow(QWidget):
         self._right_panel.layer_opacity_change_finished.connect(self._on_layer_opacity_change_finished)
         self._right_panel.adjust_section_changed.connect(self._on_adjust_section_changed)
         self._right_panel.adjust_section_change_finished.connect(self._on_adjust_section_change_finished)
+        self._right_panel.scope_changed.connect(self._on_scope_changed)
 
     def open_image(self, path: str) -> bool:
         try:
             tl_image = TLImage.open(path)
-            preview_max_dimension = self._preview_max_dimension()
-            edited_image = tl_image.render_image(preview=True, max_dimension=preview_max_dimension)
-            edited_pixmap = self._pil_to_pixmap(edited_image)
+            self._original_preview_cache_key = None
+            self._original_preview_pixmap = None
+            preview_dimension = self._preview_max_dimension(tl_image)
+            original_pixmap = self._get_original_preview_pixmap(tl_image, preview_dimension)
         except Exception:
             return False
 
+        self._release_pixel_publish()
+        self._pixel_publish = self._pixel_publisher.submit(self._pixel_store.publish, path, tl_image.source_levels()[0])
         self._current_tlimage = tl_image
-        self._original_preview_cache_key = None
-        self._original_preview_pixmap = None
-        original_pixmap = self._get_original_preview_pixmap(tl_image, preview_max_dimension)
-        self._canvas.set_pixmaps(edited_pixmap, original_pixmap, reset_view=True)
+        self._preview_dimension = preview_dimension
+        self._canvas.set_source_size(*tl_image.image_size())
+        # The original stands in until the edited frame arrives from the render thread.
+        self._canvas.set_pixmaps(original_pixmap, original_pixmap, reset_view=True)
+        self._apply_preview_to_canvas(reset_view=False)
         self._ai_chatbox.set_image_context(Path(path).name)
         self._sync_right_panel_from_tlimage()
         self._right_panel.set_histogram_data(None)
+        self._right_panel.set_scope_data(None)
         self._request_histogram_refresh(immediate=True)
         self.title_changed.emit(f"TempusLoom - {Path(path).name}")
         self._status_bar.set_image_info(*tl_image.image_size())
         return True
 
-    def _preview_max_dimension(self) -> int:
-        return self._FIXED_PREVIEW_MAX_DIMENSION
+    def _preview_max_dimension(self, tl_image: Optional[TLImage] = None) -> int:
+        """Preview size for the canvas: the image as drawn, in physical pixels, snapped to a pyramid level.
+
+        A level serves until it would be enlarged past ``_DETAIL_MIN_UPSCALE``,
+        which is also where the detail crop takes over when zoomed in.
+        """
+        tl_image = tl_image or self._current_tlimage
+        if tl_image is None:
+            return self._PREVIEW_LAYOUT_DIMENSION
+        return tl_image.preview_dimension_for(self._canvas.display_dimension() / self._DETAIL_MIN_UPSCALE)
+
+    def _refresh_preview_level(self) -> None:
+        if self._current_tlimage is not None and self._preview_max_dimension() != self._preview_dimension:
+            self._apply_preview_to_canvas()
+
+    def _layout_preview_pixmap(self, pixmap: QPixmap, tl_image: TLImage, dimension: int) -> QPixmap:
+        """Lay out a preview rendered at ``dimension`` at the layout size; Qt scales it when drawing."""
+        longest_edge = max(tl_image.image_size())
+        pixmap.setDevicePixelRatio(
+            min(dimension, longest_edge) / max(min(self._PREVIEW_LAYOUT_DIMENSION, longest_edge), 1)
+        )
+        return pixmap
 
     def _pil_to_pixmap(self, image) -> QPixmap:
-        return QPixmap.fromImage(ImageQt(image))
+        return rgba_pixmap(image)
 
     def _get_original_preview_pixmap(self, tl_image: TLImage, preview_max_dimension: int) -> QPixmap:
         cache_key = (tl_image.image_path, preview_max_dimension)
         if self._original_preview_cache_key != cache_key or self._original_preview_pixmap is None:
-            self._original_preview_pixmap = self._pil_to_pixmap(
-                tl_image.load_image(preview=True, max_dimension=preview_max_dimension)
+            self._original_preview_pixmap = self._layout_preview_pixmap(
+                self._pil_to_pixmap(tl_image.load_image(preview=True, max_dimension=preview_max_dimension)),
+                tl_image,
+                preview_max_dimension,
             )
             self._original_preview_cache_key = cache_key
         return self._original_preview_pixmap
@@ -4545,32 +4930,187 @@ class MainEditorWindow(QWidget):
             tl_image.render_image(preview=preview, max_dimension=self._preview_max_dimension() if preview else None)
         )
 
-    def _apply_preview_to_canvas(self, *, reset_view: bool = False) -> None:
+    def _apply_preview_to_canvas(self, *, reset_view: bool = False, proxy: bool = False) -> None:
         if self._current_tlimage is None:
             return
-        preview_max_dimension = self._preview_max_dimension()
-        edited_image = self._current_tlimage.render_image(preview=True, max_dimension=preview_max_dimension)
-        edited_pixmap = self._pil_to_pixmap(edited_image)
-        original_pixmap = self._get_original_preview_pixmap(self._current_tlimage, preview_max_dimension)
-        self._canvas.set_pixmaps(edited_pixmap, original_pixmap, reset_view=reset_view)
+        self._pending_reset_view = self._pending_reset_view or reset_view
+        # A crop of the previous state must not land on top of the new frame.
+        self._cancel_render("detail")
+        self._preview_dimension = self._preview_max_dimension()
+        self._pending_preview_dimension = self._preview_dimension
+        if proxy:
+            self._pending_preview_dimension = min(self._preview_dimension, self._PROXY_PREVIEW_MAX_DIMENSION)
+        self._preview_frame_pending = True
+        self._submit_render(
+            "preview",
+            max_dimension=self._pending_preview_dimension,
+            histogram=self._HISTOGRAM_RENDER_MAX_DIMENSION if self._HISTOGRAM_FROM_PREVIEW else None,
+        )
         self._status_bar.set_image_info(*self._current_tlimage.image_size())
         self._right_panel.set_histogram_metadata(self._current_tlimage.metadata)
 
+    def _submit_render(self, kind: str, **arguments: Any) -> None:
+        self._render_generations[kind] += 1
+        job: dict[str, Any] = {"kind": kind, "generation": self._render_generations[kind], **arguments}
+        snapshot = self._current_tlimage.to_dict()
+        sent_state = self._render_sent_state
+        if (
+            self._render_sent_image is not self._current_tlimage
+            or sent_state is None
+            or sent_state["image_path"] != snapshot["image_path"]
+        ):
+            job["snapshot"] = snapshot
+            job["source_levels"] = self._current_source_levels()
+        else:
+            job["changes"] = diff_states(sent_state, snapshot)
+        self._render_sent_image = self._current_tlimage
+        self._render_sent_state = snapshot
+        self._preview_worker.submit(job)
+
+    def _current_pixel_handle(self) -> Optional[SharedImageHandle]:
+        """The shared source of the current image, unless it is not published or an edit has pointed it at another file."""
+        publish = self._pixel_publish
+        if publish is None or not publish.done() or publish.exception() is not None or self._current_tlimage is None:
+            return None
+        handle = publish.result()
+        if os.path.abspath(self._current_tlimage.image_path) != handle.image_path:
+            return None
+        return handle
+
+    def _release_pixel_publish(self) -> None:
+        publish, self._pixel_publish = self._pixel_publish, None
+        if publish is not None:
+            # Runs at once if the publish has finished, otherwise on the publishing thread when it does.
+            publish.add_done_callback(self._release_published_pixels)
+
+    def _release_published_pixels(self, publish: Future) -> None:
+        if publish.exception() is None:
+            self._pixel_store.release(publish.result())
+
+    def _current_source_levels(self) -> Optional[list[Any]]:
+        """The current image's decoded levels, shared as they are with the in-process render thread."""
+        return self._current_tlimage.source_levels() if self._current_tlimage is not None else None
+
+    def _cancel_render(self, kind: str) -> None:
+        self._render_generations[kind] += 1
+        self._preview_worker.cancel(kind)
+
+    def _on_render_frame_ready(self, kind: str, generation: int, frame: np.ndarray, region: object) -> None:
+        if generation != self._render_generations.get(kind) or self._current_tlimage is None:
+            return
+        pixmap = rgba_pixmap(frame)
+        if kind == "detail":
+            self._canvas.set_detail_pixmap(pixmap, region)
+            return
+        self._preview_frame_pending = False
+        self._shown_preview_generation = generation
+        self._layout_preview_pixmap(pixmap, self._current_tlimage, self._pending_preview_dimension)
+        original_pixmap = self._get_original_preview_pixmap(self._current_tlimage, self._preview_dimension)
+        is_proxy = self._pending_preview_dimension < self._preview_dimension
+        reset_view, self._pending_reset_view = self._pending_reset_view, False
+        self._canvas.set_pixmaps(pixmap, original_pixmap, reset_view=reset_view)
+        if not is_proxy:
+            self._schedule_detail_refresh()
+        elif self._preview_refresh_deferred:
+            self._flush_preview_refresh()
+
+    def _on_render_histogram_ready(self, generation: int, histogram: dict[str, list[float]]) -> None:
+        # Follows the frame on screen, even once a newer frame has been requested.
+        if generation != self._shown_preview_generation or self._current_tlimage is None:
+            return
+        self._right_panel.set_histogram_data(histogram)
+
+    def _on_render_failed(self, kind: str, generation: int, message: str) -> None:
+        # The worker dropped its replica; the next job sends a snapshot.
+        self._render_sent_state = None
+        # A failed preview keeps the last good frame on screen; a failed crop falls back to it.
+        if generation != self._render_generations.get(kind):
+            return
+        if kind == "detail":
+            self._canvas.clear_detail()
+        else:
+            self._preview_frame_pending = False
+            if self._HISTOGRAM_FROM_PREVIEW:
+                # No frame to histogram, so the histogram process renders the state itself.
+                self._flush_histogram_refresh()
+
+    def _shutdown_preview_renderer(self) -> None:
+        thread = getattr(self, "_preview_thread", None)
+        if thread is None:
+            return
+        self._preview_worker.cancel()
+        thread.quit()
+        thread.wait()
+        self._preview_thread = None
+
     def _schedule_preview_refresh(self, *, immediate: bool = False) -> None:
+        """Show a change: small proxy frames while input keeps coming, the full preview once it pauses."""
         if immediate:
             if self._preview_refresh_timer.isActive():
                 self._preview_refresh_timer.stop()
-            self._flush_preview_refresh()
+            self._flush_preview_refine()
             return
         if not self._preview_refresh_timer.isActive():
             self._preview_refresh_timer.start(self._PREVIEW_REFRESH_INTERVAL_MS)
+        # Restarted on every change, so the full preview renders once the input is idle.
+        self._preview_refine_timer.start(self._PREVIEW_REFINE_DELAY_MS)
 
     def _flush_preview_refresh(self) -> None:
+        if self._preview_frame_pending:
+            # Restarting a proxy on every tick would never finish one; send the latest state once it lands.
+            self._preview_refresh_deferred = True
+            return
+        self._preview_refresh_deferred = False
+        self._apply_preview_to_canvas(reset_view=False, proxy=True)
+
+    def _flush_preview_refine(self) -> None:
+        self._preview_refine_timer.stop()
+        self._preview_refresh_deferred = False
         self._apply_preview_to_canvas(reset_view=False)
 
+    def _schedule_detail_refresh(self) -> None:
+        # Restarted on every change, so the crop renders once the view settles.
+        self._detail_refresh_timer.start(self._DETAIL_REFRESH_INTERVAL_MS)
+
+    def _flush_detail_refresh(self) -> None:
+        """Request the visible part of the image at the resolution it is displayed at, when zoomed past the preview."""
+        tl_image = self._current_tlimage
+        view = self._canvas.visible_source_region()
+        edited = self._canvas._edited_pixmap
+        if tl_image is None or view is None or edited is None:
+            self._cancel_render("detail")
+            self._canvas.clear_detail()
+            return
+        # Both scales are in physical pixels: the preview pixmap is rendered for the device pixel ratio.
+        region, display_scale = view
+        preview_scale = edited.width() / max(tl_image.image_size()[0], 1)
+        if display_scale < preview_scale * self._DETAIL_MIN_UPSCALE:
+            self._cancel_render("detail")
+            self._canvas.clear_detail()
+            return
+        width, height = tl_image.image_size()
+        margin = self._DETAIL_MARGIN
+        left, top, right, bottom = region
+        padded = (max(0, left - margin), max(0, top - margin), min(width, right + margin), min(height, bottom + margin))
+        self._submit_render("detail", region=padded, scale=min(1.0, display_scale))
+
+    def _on_scope_changed(self, scope: str) -> None:
+        self._scope = scope
+        if scope:
+            self._flush_histogram_refresh()
+
     def _request_histogram_refresh(self, *, immediate: bool = False) -> None:
         if self._current_tlimage is None:
             return
+        if self._scope:
+            # Scopes are only computed by the histogram worker, which renders just the newest of its queued requests.
+            self._histogram_refresh_timer.stop()
+            self._flush_histogram_refresh()
+            return
+        if self._HISTOGRAM_FROM_PREVIEW:
+            # Every caller also refreshes the preview, whose frame brings the histogram along.
+            self._histogram_refresh_timer.stop()
+            return
         if immediate:
             if self._histogram_refresh_timer.isActive():
                 self._histogram_refresh_timer.stop()
@@ -4581,15 +5121,37 @@ class MainEditorWindow(QWidget):
     def _flush_histogram_refresh(self) -> None:
         if self._current_tlimage is None:
             return
+        snapshot = self._current_tlimage.to_dict()
+        if self._histogram_sent_image is not self._current_tlimage or self._histogram_sent_state is None:
+            if self._pixel_publish is not None and not self._pixel_publish.done():
+                # Attaching to the shared copy is cheaper than having the worker decode the file again.
+                self._histogram_refresh_timer.start(self._PIXEL_PUBLISH_POLL_MS)
+                return
+            # The worker applies every queued delta, so the queue may only be dropped when a full state replaces it.
+            self._clear_histogram_request_queue()
+            pixel_handle = self._current_pixel_handle()
+            if pixel_handle is not None:
+                self._pixel_store.acquire(pixel_handle)
+            if self._histogram_pixel_handle is not None:
+                # The worker detaches from the old blocks when it opens the new image; unlinking first is safe.
+                self._pixel_store.release(self._histogram_pixel_handle)
+            self._histogram_pixel_handle = pixel_handle
+            request: dict[str, Any] = {"type": "open", "snapshot": snapshot, "pixels": pixel_handle}
+        else:
+            changes = diff_states(self._histogram_sent_state, snapshot)
+            if not changes and self._scope == self._histogram_sent_scope:
+                return
+            request = {"type": "update", "changes": changes}
+        if self._scope:
+            request["scopes"] = (self._scope,)
         self._histogram_job_id += 1
         self._latest_histogram_job_id = self._histogram_job_id
-        self._clear_histogram_request_queue()
-        self._histogram_request_queue.put(
-            {
-                "job_id": self._histogram_job_id,
-                "snapshot": self._current_tlimage.to_dict(),
-            }
-        )
+        if request["type"] == "open":
+            self._histogram_open_job_id = self._histogram_job_id
+        self._histogram_request_queue.put({**request, "job_id": self._histogram_job_id})
+        self._histogram_sent_image = self._current_tlimage
+        self._histogram_sent_state = snapshot
+        self._histogram_sent_scope = self._scope
 
     def _clear_histogram_request_queue(self) -> None:
         while True:
@@ -4604,11 +5166,20 @@ class MainEditorWindow(QWidget):
                 result = self._histogram_result_queue.get_nowait()
             except Empty:
                 break
-            if int(result.get("job_id", 0)) != self._latest_histogram_job_id:
+            if "error" in result:
+                # The worker dropped its image; the next refresh opens it again.
+                self._histogram_sent_state = None
+            job_id = int(result.get("job_id", 0))
+            # The worker answers in order and skips queued requests, so while scopes follow a drag
+            # every result is the newest yet; without scopes only the last request counts.
+            if job_id < self._histogram_open_job_id or (not self._scope and job_id != self._latest_histogram_job_id):
                 continue
             histogram = result.get("histogram")
             if histogram is not None:
                 self._right_panel.set_histogram_data(histogram)
+            scopes = result.get("scopes")
+            if scopes:
+                self._right_panel.set_scope_data(scopes)
             metadata = result.get("metadata")
             if isinstance(metadata, dict):
                 self._right_panel.set_histogram_metadata(metadata)
@@ -4628,6 +5199,12 @@ class MainEditorWindow(QWidget):
                 process.terminate()
                 process.join(timeout=0.5)
         self._histogram_process = None
+        self._histogram_pixel_handle = None
+        # A publish still running would otherwise create its block after the store is closed.
+        self._pixel_publisher.shutdown(wait=True)
+        self._pixel_publish = None
+        # Unlinks every shared source.
+        self._pixel_store.close()
 
     def _refresh_canvas_from_tlimage(self, *, sync_panel: bool = False) -> None:
         if self._current_tlimage is None:
@@ -4800,13 +5377,19 @@ class MainEditorWindow(QWidget):
         if self._current_tlimage is None:
             return
         if self._current_tlimage.undo():
-            self._refresh_canvas_from_tlimage(sync_panel=True)
+            self._show_history_step()
 
     def _redo(self) -> None:
         if self._current_tlimage is None:
             return
         if self._current_tlimage.redo():
-            self._refresh_canvas_from_tlimage(sync_panel=True)
+            self._show_history_step()
+
+    def _show_history_step(self) -> None:
+        # Undo is cheap now, so a held Ctrl+Z repeats faster than a full preview renders; show it like a drag.
+        self._schedule_preview_refresh()
+        self._request_histogram_refresh()
+        self._sync_right_panel_from_tlimage()
 
     def _on_layer_visibility_changed(self, idx: int, visible: bool) -> None:
         if self._current_tlimage is None or idx >= len(self._current_tlimage.malayers):
@@ -4975,7 +5558,7 @@ class MainEditorWindow(QWidget):
         }
 
     def _compress_current_preview_for_ai(self, tl_image: TLImage) -> dict[str, Any]:
-        preview_image = tl_image.render_image(preview=True, max_dimension=self._preview_max_dimension())
+        preview_image = tl_image.render_image(preview=True, max_dimension=self._PREVIEW_LAYOUT_DIMENSION)
         if preview_image.mode != "RGB":
             preview_image = preview_image.convert("RGB")
 
@@ -4998,11 +5581,14 @@ class MainEditorWindow(QWidget):
             event.ignore()
             return
         self._shutdown_histogram_process()
+        self._shutdown_preview_renderer()
         super().closeEvent(event)
 
     def _on_zoom_changed(self, pct: int) -> None:
         self._opts_bar.set_zoom(pct)
         self._status_bar.set_zoom(pct)
+        self._refresh_preview_level()
+        self._schedule_detail_refresh()
 
     def _zoom_in(self) -> None:
         self._canvas._zoom = min(CanvasArea._MAX_ZOOM,
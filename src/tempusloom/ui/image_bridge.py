@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Hand rendered frames to Qt without intermediate copies.
+Frames travel as 8-bit RGBA NumPy arrays and are wrapped, not converted,
+as Format_RGBA8888 QImages right before the single upload to a QPixmap.
+"""
+
+from __future__ import annotations
+
+from typing import Union
+
+import numpy as np
+from PIL import Image
+from PyQt6.QtGui import QImage, QPixmap
+
+Frame = Union[Image.Image, np.ndarray]
+
+
+def rgba8_array(frame: Frame) -> np.ndarray:
+    """Contiguous ``HxWx4`` uint8 view of ``frame``; arrays that already are one pass through."""
+    if isinstance(frame, Image.Image):
+        if frame.mode != "RGBA":
+            frame = frame.convert("RGBA")
+        return np.asarray(frame)
+    array = np.ascontiguousarray(frame, dtype=np.uint8)
+    if array.ndim != 3 or array.shape[2] != 4:
+        raise ValueError(f"Expected an HxWx4 RGBA frame, got shape {array.shape}")
+    return array
+
+
+def rgba_qimage(frame: Frame) -> QImage:
+    """Wrap ``frame`` as a Format_RGBA8888 QImage that reads the array's memory directly.
+
+    The QImage does not own the pixels: the array is kept on the wrapper, so
+    the image is only valid while that Python object is alive. Call ``copy()``
+    to detach it, or upload it with :func:`rgba_pixmap`.
+    """
+    array = rgba8_array(frame)
+    height, width = array.shape[:2]
+    image = QImage(array.data, width, height, array.strides[0], QImage.Format.Format_RGBA8888)
+    image._tl_buffer = array
+    return image
+
+
+def rgba_pixmap(frame: Frame) -> QPixmap:
+    """Upload ``frame`` to a QPixmap; the wrap is free, the upload is the only copy."""
+    return QPixmap.fromImage(rgba_qimage(frame))
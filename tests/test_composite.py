@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from tempusloom.core.malayer import BlendMode, composite_images
+
+
+@pytest.mark.parametrize("layer_mode", ["RGBA", "RGB"])
+def test_opaque_normal_layer_result_is_not_the_layer(layer_mode):
+    base = Image.new("RGBA", (8, 6), (10, 20, 30, 255))
+    layer = Image.new(layer_mode, (8, 6), (200, 100, 50))
+
+    result = composite_images(base, layer, BlendMode.NORMAL, 1.0, None)
+    result.putpixel((0, 0), (0, 0, 0, 0))
+
+    assert result is not layer
+    assert layer.getpixel((0, 0))[:3] == (200, 100, 50)
+    assert np.asarray(result)[1:, 1:, :3].tolist() == np.asarray(layer.convert("RGB"))[1:, 1:].tolist()
+
+
+def test_translucent_normal_layer_keeps_the_base_alpha():
+    base = Image.new("RGBA", (4, 4), (10, 20, 30, 255))
+    layer = Image.new("RGBA", (4, 4), (200, 100, 50, 40))
+
+    result = np.asarray(composite_images(base, layer, BlendMode.NORMAL, 1.0, None))
+
+    assert (result[..., 3] == 255).all()
+    assert (result[..., :3] == (200, 100, 50)).all()
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from tempusloom.core.malayer import FilterMalayer
+from tempusloom.core.tl_image import TLImage
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / "photo.png"
+    rng = np.random.default_rng(3)
+    Image.fromarray(rng.integers(0, 256, (90, 120, 3), dtype=np.uint8), mode="RGB").save(path)
+    return str(path)
+
+
+@pytest.fixture
+def photo(image_path):
+    image = TLImage.open(image_path)
+    image.add_malayer(FilterMalayer("Blur", filter_name="blur"))
+    image.update_adjustment("tone", {"clarity": 10})
+    image.render_image(preview=True)
+    return image
+
+
+def test_render_clears_the_dirty_set(photo):
+    assert not photo.dirty_set
+
+
+def test_unchanged_tick_leaves_it_empty(photo):
+    photo.preview_adjustment("tone", {"clarity": 10})
+    photo.preview_adjustment("detail", {"sharpen_amount": 0})
+
+    assert not photo.dirty_set
+
+
+def test_tone_tick_marks_tone_and_the_primary_layer(photo):
+    photo.preview_adjustment("tone", {"clarity": 35})
+
+    assert photo.dirty_set.sections == {"tone"}
+    assert photo.dirty_set.layer_ids == {photo.malayers[0].id}
+
+
+def test_layer_change_marks_only_that_layer(photo):
+    photo.update_layer_state(1, opacity=0.5)
+
+    assert photo.dirty_set.sections == set()
+    assert photo.dirty_set.layer_ids == {photo.malayers[1].id}
+
+
+@pytest.mark.parametrize(
+    "render",
+    [
+        lambda image: image.render_image(preview=False),
+        lambda image: image.render_image(region=(10, 10, 60, 50)),
+    ],
+    ids=["full", "region"],
+)
+def test_other_render_paths_clear_it(photo, render):
+    photo.preview_adjustment("tone", {"clarity": 35})
+
+    render(photo)
+
+    assert not photo.dirty_set
+
+
+def test_preview_sees_edits_rendered_at_full_resolution_first(photo, image_path):
+    # A clean render reuses the layer fingerprints from here on.
+    photo.render_image(preview=True)
+    photo.preview_adjustment("tone", {"clarity": 35})
+    photo.update_layer_state(1, opacity=0.5)
+    photo.render_image(preview=False)
+
+    expected = TLImage.open(image_path)
+    expected.add_malayer(FilterMalayer("Blur", filter_name="blur"))
+    expected.update_adjustment("tone", {"clarity": 35})
+    expected.update_layer_state(1, opacity=0.5)
+
+    np.testing.assert_array_equal(
+        np.asarray(photo.render_image(preview=True)),
+        np.asarray(expected.render_image(preview=True)),
+    )
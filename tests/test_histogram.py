@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from tempusloom.core.histogram import HISTOGRAM_CHANNELS, compute_histogram
+from tempusloom.core.tl_image import TLImage
+
+
+def _frame(height=48, width=64, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = np.full((height, width, 4), 255, dtype=np.uint8)
+    frame[..., :3] = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return frame
+
+
+def test_histogram_from_image_returns_json_serializable_rgb_curves():
+    histogram = TLImage.histogram_from_image(Image.fromarray(_frame(), mode="RGBA"), bins=64)
+
+    assert list(histogram) == ["red", "green", "blue"]
+    assert all(isinstance(value, float) for curve in histogram.values() for value in curve)
+    assert json.loads(json.dumps(histogram)) == histogram
+    assert max(max(curve) for curve in histogram.values()) == 1.0
+
+
+@pytest.mark.parametrize("bins", [1, 64, 100, 128, 256])
+def test_counts_match_np_histogram(bins):
+    frame = _frame()
+    stats = compute_histogram(frame, bins=bins, sample_max_dimension=max(frame.shape))
+    edges = np.linspace(0, 256, bins + 1)
+
+    for index in range(3):
+        expected, _ = np.histogram(frame[..., index], bins=edges)
+        assert np.array_equal(stats.counts[index], expected)
+    assert stats.samples == frame.shape[0] * frame.shape[1]
+
+
+def test_clipping_and_percentiles_per_channel():
+    frame = np.zeros((10, 10, 3), dtype=np.uint8)
+    frame[:2] = 255
+    frame[2:, :, 2] = 128
+    stats = compute_histogram(frame, percentile_ranks=(10.0, 50.0, 90.0))
+
+    assert stats.counts.shape == (len(HISTOGRAM_CHANNELS), 128)
+    assert np.allclose(stats.highlight_clipping, [20.0, 20.0, 20.0, 20.0])
+    assert np.allclose(stats.shadow_clipping, [80.0, 80.0, 0.0, 0.0])
+    assert stats.percentiles[2].tolist() == [128, 128, 255]
+
+
+def test_large_images_are_subsampled_by_stride():
+    frame = _frame(300, 400)
+    stats = compute_histogram(frame, sample_max_dimension=100)
+    image_stats = compute_histogram(Image.fromarray(frame, mode="RGBA"), sample_max_dimension=100)
+
+    assert stats.samples == image_stats.samples == 75 * 100
+    assert stats.levels.sum(axis=1).tolist() == image_stats.levels.sum(axis=1).tolist()
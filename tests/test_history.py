@@ -0,0 +1,187 @@
+from copy import deepcopy
+
+import pytest
+from PIL import Image
+
+from tempusloom.core.history import MISSING, EditHistory, apply_changes, diff_states
+from tempusloom.core.malayer import FilterMalayer
+from tempusloom.core.tl_image import TLImage
+
+
+def _state(**overrides):
+    state = {
+        "image_path": "a.png",
+        "rating": 0,
+        "tags": ["raw"],
+        "edit_state": {"adjust": {"basic": {"exposure": 0.0, "contrast": 0}}},
+        "malayers": [{"id": "base", "type": "adjustment", "payload": {"tone": {"exposure": 0.0}}}],
+    }
+    state.update(overrides)
+    return state
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        (_state(), _state(rating=3)),
+        (_state(), _state(edit_state={"adjust": {"basic": {"exposure": 0.5, "contrast": 0}}})),
+        # Added and removed keys.
+        (_state(), _state(edit_state={"adjust": {"basic": {"exposure": 0.0}, "hsl": {"saturation": 10}}})),
+        ({"a": 1, "b": {"c": 2}}, {"b": {"c": 2, "d": [1, 2]}}),
+        # Lists that grow and shrink.
+        (_state(tags=["raw"]), _state(tags=["raw", "best", "2024"])),
+        (_state(tags=["raw", "best"]), _state(tags=[])),
+        (
+            _state(),
+            _state(
+                malayers=[
+                    {"id": "base", "type": "adjustment", "payload": {"tone": {"exposure": 0.0}}},
+                    {"id": "blur", "type": "filter", "payload": {"filter_name": "blur"}},
+                ]
+            ),
+        ),
+        # A value that changes type.
+        ({"curve": [[0, 0], [255, 255]]}, {"curve": None}),
+        ({"value": 1}, {"value": "1"}),
+    ],
+)
+def test_apply_changes_round_trips_diff_states(old, new):
+    changes = diff_states(old, new)
+
+    assert apply_changes(deepcopy(old), changes) == new
+    assert apply_changes(deepcopy(new), changes, reverse=True) == old
+
+
+def test_diff_states_marks_added_and_removed_keys_missing():
+    changes = diff_states({"kept": 1, "removed": 2}, {"kept": 1, "added": 3})
+
+    assert {(change.path, change.old is MISSING, change.new is MISSING) for change in changes} == {
+        (("added",), True, False),
+        (("removed",), False, True),
+    }
+
+
+def test_diff_states_treats_equal_values_as_unchanged():
+    # As for comparing full snapshots with ==.
+    assert diff_states({"basic": {"exposure": 1}}, {"basic": {"exposure": 1.0}}) == []
+
+
+def test_commit_digests_follow_the_edits():
+    first, second = EditHistory(), EditHistory()
+    for history in (first, second):
+        history.reset(_state(), "open")
+        history.commit(_state(rating=2), "rate")
+        history.commit(_state(rating=2, tags=["raw", "best"]), "tag")
+
+    assert [entry.digest for entry in first.entries] == [entry.digest for entry in second.entries]
+    assert len({entry.digest for entry in first.entries}) == 3
+    assert not first.commit(_state(rating=2, tags=["raw", "best"]), "same")
+
+
+def test_diff_states_copies_values():
+    old = {"tags": ["raw"]}
+    new = {"tags": ["raw", "best"]}
+    changes = diff_states(old, new)
+    new["tags"].append("later")
+
+    assert apply_changes(deepcopy(old), changes) == {"tags": ["raw", "best"]}
+
+
+def test_state_at_rebuilds_entries_across_keyframes():
+    history = EditHistory(keyframe_interval=3)
+    states = [_state(rating=index, tags=["raw"] * (index % 4)) for index in range(10)]
+    for index, state in enumerate(states):
+        history.commit(deepcopy(state), f"edit {index}")
+
+    assert [entry.keyframe is not None for entry in history.entries] == [index % 3 == 0 for index in range(10)]
+    for index, state in enumerate(states):
+        assert history.state_at(index) == state
+    with pytest.raises(IndexError):
+        history.state_at(len(states))
+
+
+def test_undo_and_redo_walk_the_committed_states():
+    history = EditHistory(keyframe_interval=2)
+    states = [_state(rating=index) for index in range(5)]
+    for state in states:
+        history.commit(deepcopy(state), "edit")
+
+    for index in reversed(range(4)):
+        assert history.undo() is not None
+        assert history.state == states[index]
+    assert history.undo() is None
+    for index in range(1, 5):
+        assert history.redo() is not None
+        assert history.state == states[index]
+    assert history.redo() is None
+
+
+def test_commit_after_undo_drops_redo_entries():
+    history = EditHistory()
+    for rating in range(3):
+        history.commit(_state(rating=rating), "edit")
+    history.undo()
+
+    assert history.commit(_state(rating=5), "branch")
+    assert not history.can_redo()
+    assert [history.state_at(index)["rating"] for index in range(len(history))] == [0, 1, 5]
+
+
+def test_commit_of_an_unchanged_state_is_a_no_op():
+    history = EditHistory()
+    history.commit(_state(), "open")
+
+    assert not history.commit(_state(), "again")
+    assert len(history) == 1
+
+
+@pytest.fixture
+def tl_image(tmp_path):
+    path = tmp_path / "image.png"
+    Image.new("RGB", (16, 12), (120, 130, 140)).save(path)
+    return TLImage.open(str(path))
+
+
+def test_undo_and_redo_of_an_added_layer(tl_image):
+    before = tl_image.to_dict()
+    base_layer = tl_image.malayers[0]
+    tl_image.add_malayer(FilterMalayer("Sepia", filter_name="sepia"))
+    tl_image.commit_history("add layer")
+    after = tl_image.to_dict()
+
+    assert tl_image.undo()
+    assert tl_image.to_dict() == before
+    assert tl_image.malayers == [base_layer]
+
+    assert tl_image.redo()
+    assert tl_image.to_dict() == after
+    assert tl_image.malayers[0] is base_layer
+    assert isinstance(tl_image.malayers[1], FilterMalayer)
+
+
+def test_undo_and_redo_of_a_removed_layer(tl_image):
+    tl_image.add_malayer(FilterMalayer("Blur", filter_name="blur", intensity=0.5))
+    tl_image.commit_history("add layer")
+    before = tl_image.to_dict()
+    removed = tl_image.malayers[1]
+    tl_image.remove_malayer(removed.id)
+    tl_image.commit_history("remove layer")
+    after = tl_image.to_dict()
+
+    assert tl_image.undo()
+    assert tl_image.to_dict() == before
+    assert [layer.id for layer in tl_image.malayers] == [layer["id"] for layer in before["malayers"]]
+    assert tl_image.malayers[1].intensity == 0.5
+
+    assert tl_image.redo()
+    assert tl_image.to_dict() == after
+
+
+def test_undo_restores_an_adjustment_without_rebuilding_the_layer(tl_image):
+    layer = tl_image.malayers[0]
+    before = tl_image.to_dict()
+    tl_image.update_adjustment("basic", {"exposure": 0.8}, record_history=True)
+
+    assert tl_image.undo()
+    assert tl_image.to_dict() == before
+    assert tl_image.malayers[0] is layer
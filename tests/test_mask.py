@@ -0,0 +1,91 @@
+import os
+from dataclasses import replace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from tempusloom.core.malayer import Mask
+from tempusloom.core.render_cache import RenderCache
+
+SIZE = (1024, 768)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(Mask, "raster_cache", RenderCache(64 * 1024 * 1024))
+
+
+def _gradient(offset=0):
+    y, x = np.mgrid[0:SIZE[1], 0:SIZE[0]].astype(np.float32)
+    values = 127.5 + 100 * np.sin((x + offset) / 37.0) * np.cos(y / 29.0) + x / SIZE[0] * 20
+    return Image.fromarray(np.clip(values, 0, 255).astype(np.uint8), mode="L")
+
+
+@pytest.fixture
+def mask_path(tmp_path):
+    path = tmp_path / "mask.png"
+    _gradient().save(path)
+    return path
+
+
+def test_repeated_raster_is_cached(mask_path):
+    mask = Mask(image_path=str(mask_path), feather_radius=2.0)
+
+    first = mask.to_array((300, 200))
+
+    assert mask.to_array((300, 200)) is first
+    assert Mask(image_path=str(mask_path), feather_radius=2.0).to_array((300, 200)) is first
+    assert not first.flags.writeable
+
+
+@pytest.mark.parametrize(
+    "change",
+    [{"feather_radius": 4.0}, {"invert": True}, {"opacity": 0.5}],
+    ids=lambda change: next(iter(change)),
+)
+def test_changed_setting_builds_a_new_raster(mask_path, change):
+    mask = Mask(image_path=str(mask_path), feather_radius=2.0)
+    before = mask.to_array((300, 200))
+
+    after = replace(mask, **change).to_array((300, 200))
+
+    assert after is not before
+    assert not np.array_equal(after, before)
+    assert mask.to_array((300, 200)) is before
+
+
+def test_changed_size_builds_a_new_raster(mask_path):
+    mask = Mask(image_path=str(mask_path))
+    before = mask.to_array((300, 200))
+
+    after = mask.to_array((301, 200))
+
+    assert after is not before
+    assert after.shape == (200, 301)
+
+
+def test_changed_file_builds_a_new_raster(mask_path):
+    mask = Mask(image_path=str(mask_path))
+    before = mask.to_array((300, 200))
+    mtime = os.stat(mask_path).st_mtime_ns
+
+    _gradient(offset=50).save(mask_path)
+    os.utime(mask_path, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+    after = mask.to_array((300, 200))
+
+    assert after is not before
+    reference = np.asarray(_gradient(offset=50).resize((300, 200), Image.Resampling.LANCZOS))
+    assert np.abs(after.astype(np.int16) - reference).max() <= 2
+
+
+@pytest.mark.parametrize("size", [(512, 384), (300, 200), (100, 75), (1024, 768)])
+def test_pyramid_level_matches_direct_resize(mask_path, size):
+    raster = Mask(image_path=str(mask_path)).to_array(size).astype(np.int16)
+
+    with Image.open(mask_path) as source:
+        direct = np.asarray(source.convert("L").resize(size, Image.Resampling.LANCZOS)).astype(np.int16)
+
+    difference = np.abs(raster - direct)
+    assert difference.mean() < 1.0
+    assert difference.max() <= 4
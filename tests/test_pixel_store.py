@@ -0,0 +1,134 @@
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from tempusloom.core.pixel_store import SharedPixelStore, SharedPixelView
+
+
+@pytest.fixture
+def source_path(tmp_path):
+    path = tmp_path / "source.png"
+    rng = np.random.default_rng(5)
+    Image.fromarray(rng.integers(0, 256, (30, 40, 4), dtype=np.uint8), mode="RGBA").save(path)
+    return str(path)
+
+
+@pytest.fixture
+def store():
+    store = SharedPixelStore()
+    yield store
+    store.close()
+
+
+def _block_exists(name):
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    block.close()
+    return True
+
+
+def test_publish_shares_one_block_per_source(store, source_path):
+    handle = store.publish(source_path)
+
+    assert store.publish(source_path) == handle
+    assert store.refcount(handle) == 2
+    assert (handle.width, handle.height) == (40, 30)
+
+
+def test_view_reads_the_published_pixels(store, source_path):
+    with Image.open(source_path) as decoded:
+        expected = np.asarray(decoded.convert("RGBA"))
+    handle = store.publish(source_path)
+
+    view = SharedPixelView(handle)
+    np.testing.assert_array_equal(np.asarray(view.image), expected)
+    view.close()
+    assert view.image is None
+
+
+def test_publish_uses_the_given_source(store, source_path):
+    source = Image.new("RGBA", (40, 30), (1, 2, 3, 4))
+
+    view = SharedPixelView(store.publish(source_path, source))
+
+    assert view.image.getpixel((5, 5)) == (1, 2, 3, 4)
+    view.close()
+
+
+def test_image_outlives_an_early_close(store, source_path):
+    handle = store.publish(source_path)
+    view = SharedPixelView(handle)
+    image = view.image
+    expected = np.asarray(image).copy()
+
+    view.close()
+    store.release(handle)
+
+    # The mapping stays until the image is gone, so its pixels are still readable.
+    np.testing.assert_array_equal(np.asarray(image), expected)
+    del image
+    view.close()
+
+
+def test_last_release_unlinks_the_block(store, source_path):
+    handle = store.publish(source_path)
+    store.acquire(handle)
+
+    store.release(handle)
+    assert store.refcount(handle) == 1
+    assert _block_exists(handle.block_name)
+
+    store.release(handle)
+    assert store.refcount(handle) == 0
+    assert not _block_exists(handle.block_name)
+    with pytest.raises(FileNotFoundError):
+        SharedPixelView(handle)
+
+
+def test_rewritten_file_is_a_new_source(store, source_path):
+    handle = store.publish(source_path)
+    mtime = os.stat(source_path).st_mtime_ns
+    os.utime(source_path, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+
+    updated = store.publish(source_path)
+
+    assert updated.key != handle.key
+    assert updated.block_name != handle.block_name
+    assert store.refcount(handle) == store.refcount(updated) == 1
+
+
+def test_close_unlinks_everything_and_later_releases_are_ignored(source_path):
+    store = SharedPixelStore()
+    handle = store.publish(source_path)
+    view = SharedPixelView(handle)
+
+    store.close()
+
+    assert not _block_exists(handle.block_name)
+    # Attached views keep their mapping until they close.
+    assert view.image.size == (40, 30)
+    view.close()
+    store.release(handle)
+    assert store.refcount(handle) == 0
+
+
+def test_block_pinned_by_a_live_buffer_is_closed_on_a_later_release(store, source_path, tmp_path):
+    handle = store.publish(source_path)
+    block = store._entries[handle.key].block
+    pinned = memoryview(block.buf)
+
+    store.release(handle)
+
+    assert not _block_exists(handle.block_name)
+    assert store._retired == [block]
+    pinned.release()
+
+    other_path = tmp_path / "other.png"
+    Image.new("RGBA", (8, 8)).save(other_path)
+    store.release(store.publish(str(other_path)))
+    assert store._retired == []
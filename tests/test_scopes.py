@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from tempusloom.core.scopes import SCOPE_KINDS, compute_scopes
+
+
+def _frame(width=200, height=150, seed=0):
+    rng = np.random.default_rng(seed)
+    ramp = np.linspace(0.0, 255.0, width, dtype=np.float32)[None, :, None]
+    noisy = ramp + rng.normal(0.0, 40.0, (height, width, 3))
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+
+def _plot(level, column, level_count, column_edges):
+    """Counts per (level, column) cell, highest level on the first row."""
+    level_edges = np.linspace(0, 256, level_count + 1)
+    counts, _, _ = np.histogram2d(level.ravel(), column.ravel(), bins=(level_edges, column_edges))
+    return counts[::-1]
+
+
+def _reference(rgb, kind, columns, levels):
+    values = rgb.astype(np.float64)
+    x = np.broadcast_to(np.arange(rgb.shape[1], dtype=np.float64)[None, :], rgb.shape[:2])
+    x_edges = np.linspace(0, rgb.shape[1], columns + 1)
+    if kind == "waveform":
+        luma = np.floor(values @ np.array([77.0, 150.0, 29.0]) / 256.0 + 0.5)
+        return _plot(luma, x, levels, x_edges)
+    if kind == "parade":
+        return np.concatenate([_plot(values[..., channel], x, levels, x_edges) for channel in range(3)], axis=1)
+    cb = np.floor((values @ np.array([-43.0, -85.0, 128.0]) + 32895.0) / 256.0)
+    cr = np.floor((values @ np.array([128.0, -107.0, -21.0]) + 32895.0) / 256.0)
+    return _plot(cr, cb, levels, np.linspace(0, 256, levels + 1))
+
+
+@pytest.mark.parametrize("kind", SCOPE_KINDS)
+@pytest.mark.parametrize("columns, levels", [(128, 128), (50, 64), (200, 256)])
+def test_scopes_match_histogram2d(kind, columns, levels):
+    rgb = _frame()
+
+    scope = compute_scopes(rgb, (kind,), sample_max_dimension=200, columns=columns, levels=levels)[kind]
+
+    assert scope.dtype == np.uint16
+    np.testing.assert_array_equal(scope, _reference(rgb, kind, columns, levels))
+
+
+def test_image_input_is_sampled_like_an_array():
+    rgb = _frame(width=400, height=300)
+
+    from_image = compute_scopes(Image.fromarray(rgb, mode="RGB"), sample_max_dimension=200)
+    from_array = compute_scopes(rgb, sample_max_dimension=200)
+
+    assert set(from_image) == set(SCOPE_KINDS)
+    for kind in SCOPE_KINDS:
+        assert from_image[kind].sum() == from_array[kind].sum() == 200 * 150 * (3 if kind == "parade" else 1)
+
+
+def test_neutral_grays_land_at_the_vectorscope_centre():
+    grays = np.repeat(np.arange(256, dtype=np.uint8)[None, :, None], 3, axis=2)
+    size = 128
+
+    scope = compute_scopes(grays, ("vectorscope",), levels=size)["vectorscope"]
+
+    # Cb and Cr are both 128: the column right of the centre line, the row above it.
+    assert scope[size // 2 - 1, size // 2] == 256
+    assert scope.sum() == 256
+
+
+def test_counts_saturate():
+    flat = np.full((300, 300, 3), 90, dtype=np.uint8)
+
+    scope = compute_scopes(flat, ("vectorscope",), sample_max_dimension=300)["vectorscope"]
+
+    assert scope.max() == np.iinfo(np.uint16).max
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError, match="histogram"):
+        compute_scopes(_frame(), ("waveform", "histogram"))
@@ -0,0 +1,131 @@
+import threading
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from tempusloom.core.malayer import FilterMalayer, Mask, RenderCancelled, render_cancellation
+from tempusloom.core.tiled_render import render_tiled_image
+from tempusloom.core.tl_image import TLImage
+
+# Larger than one default 512px tile in both directions, so the full-resolution
+# render in TLImage is split into a 2x2 grid with interior seams.
+SIZE = (700, 540)
+
+
+def _source_array() -> np.ndarray:
+    rng = np.random.default_rng(7)
+    y, x = np.mgrid[0:SIZE[1], 0:SIZE[0]].astype(np.float32)
+    base = np.stack(
+        [
+            x / SIZE[0] * 200 + 20,
+            y / SIZE[1] * 180 + 40,
+            (np.sin(x / 23.0) * np.cos(y / 17.0) + 1) * 100 + 25,
+        ],
+        axis=-1,
+    )
+    noisy = base + rng.normal(0.0, 12.0, base.shape)
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+
+@pytest.fixture
+def photo(tmp_path):
+    path = tmp_path / "photo.png"
+    Image.fromarray(_source_array(), mode="RGB").save(path)
+    return TLImage.open(str(path))
+
+
+def _masked_blur(tmp_path):
+    mask_path = tmp_path / "mask.png"
+    mask = np.zeros((SIZE[1], SIZE[0]), dtype=np.uint8)
+    mask[100:440, 150:560] = 255
+    Image.fromarray(mask, mode="L").save(mask_path)
+    return FilterMalayer(
+        "Blur",
+        filter_name="blur",
+        intensity=0.8,
+        mask=Mask(image_path=str(mask_path), feather_radius=6.0),
+    )
+
+
+EDITS = {
+    "clarity": {"tone": {"clarity": 60}},
+    "dehaze": {"tone": {"dehaze": 45}},
+    "detail": {"detail": {"sharpen_amount": 80, "sharpen_radius": 1.5, "luminance_noise": 40, "color_noise": 30}},
+    "geometry": {"geometry": {"rotation": 7, "distortion": 20, "vertical": 15, "chromatic_aberration": 30, "vignette": -40}},
+    "geometry_shrink": {"geometry": {"rotation": -4, "scale": 70}},
+}
+
+
+def _single_tile(image: TLImage) -> np.ndarray:
+    source = image.load_image()
+    rendered = render_tiled_image(source, image.malayers, tile_size=max(SIZE), workers=1)
+    return np.asarray(rendered)
+
+
+@pytest.mark.parametrize("name", sorted(EDITS))
+def test_full_render_matches_single_tile(photo, name):
+    for section, values in EDITS[name].items():
+        photo.update_adjustment(section, values)
+
+    tiled = np.asarray(photo.render_image(preview=False).convert("RGBA"))
+
+    np.testing.assert_array_equal(tiled, _single_tile(photo))
+
+
+def test_full_render_matches_single_tile_with_masked_filter(photo, tmp_path):
+    photo.update_adjustment("tone", {"clarity": 30})
+    photo.add_malayer(_masked_blur(tmp_path))
+
+    tiled = np.asarray(photo.render_image(preview=False).convert("RGBA"))
+
+    np.testing.assert_array_equal(tiled, _single_tile(photo))
+
+
+def test_small_tiles_match_single_tile(photo, tmp_path):
+    photo.update_adjustment("tone", {"clarity": 40, "dehaze": 20})
+    photo.update_adjustment("detail", {"sharpen_amount": 60})
+    photo.add_malayer(_masked_blur(tmp_path))
+
+    source = photo.load_image()
+    small = render_tiled_image(source, photo.malayers, tile_size=96, workers=2)
+
+    np.testing.assert_array_equal(np.asarray(small), _single_tile(photo))
+
+
+@pytest.mark.parametrize("suffix", [".png", ".jpg"])
+def test_render_to_path_round_trip(photo, tmp_path, suffix):
+    photo.update_adjustment("tone", {"clarity": 50})
+    expected = np.asarray(photo.render_image(preview=False).convert("RGB")).astype(np.int16)
+
+    # A fresh image has not decoded its source yet, so the export opens the file itself.
+    fresh = TLImage.open(photo.image_path)
+    fresh.update_adjustment("tone", {"clarity": 50})
+    output = fresh.render_to_path(str(tmp_path / f"export{suffix}"), tile_size=256)
+
+    with Image.open(output) as written:
+        assert written.size == SIZE
+        assert written.format == ("PNG" if suffix == ".png" else "JPEG")
+        decoded = np.asarray(written.convert("RGB")).astype(np.int16)
+    if suffix == ".png":
+        np.testing.assert_array_equal(decoded, expected)
+    else:
+        # Lossy, and the noisy test image is hard on the encoder: compare 10px block means.
+        def blocks(pixels):
+            return pixels.reshape(SIZE[1] // 10, 10, SIZE[0] // 10, 10, 3).mean(axis=(1, 3))
+
+        assert np.abs(blocks(decoded) - blocks(expected)).max() < 8.0
+
+
+def test_cancellation_reaches_tile_workers(photo):
+    photo.update_adjustment("tone", {"clarity": 40})
+    checked_on = set()
+
+    def cancelled_on_workers():
+        name = threading.current_thread().name
+        checked_on.add(name)
+        return name.startswith("tempusloom-tile")
+
+    with render_cancellation(cancelled_on_workers), pytest.raises(RenderCancelled):
+        render_tiled_image(photo.load_image(), photo.malayers, tile_size=128, workers=2)
+    assert any(name.startswith("tempusloom-tile") for name in checked_on)